@@ -0,0 +1,34 @@
+# hyper_pets_backend/api/checks.py
+"""
+배포 설정 점검 (python manage.py check --deploy)
+
+여러 워커로 실행되는 운영 환경에서 프로세스별로만 동작하는 설정을 경고합니다.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from . import live, tile_cache
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if tile_cache.shared_cache():
+        return []
+    return [Warning(
+        '기본 캐시가 프로세스별 캐시라 지도 타일/클러스터 캐시를 사용하지 않고, '
+        '공간 인덱스 변경이 다른 워커에 SPATIAL_INDEX_TTL이 지나야 반영됩니다.',
+        hint='REDIS_URL을 설정해 모든 워커가 같은 캐시를 쓰도록 하세요.',
+        id='api.W001',
+    )]
+
+
+@register(deploy=True)
+def check_live_backend(app_configs, **kwargs):
+    if getattr(settings, 'LIVE_BACKEND', live.DEFAULT_BACKEND) != 'api.live.InProcessBackend':
+        return []
+    return [Warning(
+        '산책 실시간 중계가 같은 프로세스의 구독자에게만 전달되어, 포인트를 저장한 워커와 '
+        'SSE 연결을 가진 워커가 다르면 보호자에게 중계되지 않습니다.',
+        hint='REDIS_URL을 설정하고 LIVE_BACKEND를 api.live.RedisBackend로 지정하세요.',
+        id='api.W002',
+    )]
@@ -0,0 +1,42 @@
+# hyper_pets_backend/api/comment_counts.py
+"""
+게시글 댓글 수(CommunityPost.comment_count) 관리.
+
+댓글이 생성/삭제될 때(signals) 게시글 행을 읽지 않고 F() UPDATE 한 번으로 늘리거나 줄이므로
+동시에 댓글이 달려도 값을 덮어쓰지 않습니다. 피드 조회는 이 컬럼을 그대로 읽어 게시글마다 COUNT를 하지 않습니다.
+신호를 거치지 않은 변경(raw SQL, 일괄 삭제 등)으로 어긋난 값은 reconcile_comment_counts 명령으로 다시 맞춥니다.
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, CommunityPost
+
+
+def adjust(post_id, delta):
+    """게시글의 댓글 수를 delta만큼 바꿉니다. (0 아래로 내려가지 않음)"""
+    CommunityPost.objects.filter(pk=post_id).update(comment_count=Greatest(F('comment_count') + delta, 0))
+
+
+def actual_counts():
+    """게시글별 실제 댓글 수 서브쿼리"""
+    counts = Comment.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def mismatched():
+    """저장된 댓글 수가 실제와 다른 게시글: (id, 저장된 값, 실제 값) 목록"""
+    return list(
+        CommunityPost.objects.annotate(actual=actual_counts())
+        .exclude(comment_count=F('actual'))
+        .values_list('id', 'comment_count', 'actual')
+    )
+
+
+def reconcile(post_ids=None):
+    """댓글 수를 실제 댓글 수로 다시 계산합니다. 반환값: 바뀐 게시글 수"""
+    queryset = CommunityPost.objects.all()
+    if post_ids is not None:
+        queryset = queryset.filter(pk__in=post_ids)
+    return queryset.annotate(actual=actual_counts()).exclude(comment_count=F('actual')).update(
+        comment_count=actual_counts()
+    )
@@ -0,0 +1,35 @@
+# hyper_pets_backend/api/comment_tree.py
+"""
+게시글 댓글 트리.
+
+게시글의 댓글 전체를 작성자와 함께 한 번에 읽어(작성 시각 순) 평평한 목록으로 직렬화한 뒤,
+parent_comment를 따라 메모리에서 한 번 훑어 대댓글 트리를 만듭니다. (댓글 수 n에 대해 O(n))
+댓글마다 대댓글을 다시 조회하거나 게시글을 중첩하지 않으므로 쿼리 수는 댓글 수와 무관합니다.
+"""
+from .models import Comment
+
+
+def post_comments(post_id):
+    """게시글의 댓글 전체 (작성자 포함, 작성 시각 순)"""
+    return Comment.objects.filter(post_id=post_id).select_related('author').order_by('created_at', 'id')
+
+
+def build_tree(nodes):
+    """
+    작성 시각 순으로 직렬화된 댓글 목록(id, parent_comment 포함)을 트리로 묶습니다.
+    반환값: 최상위 댓글 목록, 각 댓글의 'replies'에 대댓글 목록
+    부모 댓글이 목록에 없는 댓글은 최상위 댓글로 둡니다.
+    """
+    by_id = {}
+    for node in nodes:
+        node['replies'] = []
+        by_id[node['id']] = node
+
+    roots = []
+    for node in nodes:
+        parent = by_id.get(node['parent_comment'])
+        if parent is None:
+            roots.append(node)
+        else:
+            parent['replies'].append(node)
+    return roots
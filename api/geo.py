@@ -0,0 +1,175 @@
+# hyper_pets_backend/api/geo.py
+"""
+위치 기반 조회(nearby)에서 공통으로 쓰는 거리 계산 도구.
+
+모든 거리는 하버사인 공식으로 계산한 미터 단위 값이며,
+후보 좌표 전체를 NumPy 배열로 한 번에 계산합니다.
+"""
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180  # 위도 1도 ≒ 111km
+
+DEFAULT_RADIUS_M = 5000
+DEFAULT_LIMIT = 30
+
+
+def haversine_m(lat, lng, lats, lngs):
+    """(lat, lng)에서 lats/lngs 배열의 각 좌표까지의 거리(m) 배열"""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    d_lat = lat2 - lat1
+    d_lng = np.radians(np.asarray(lngs, dtype=float)) - math.radians(lng)
+
+    a = np.sin(d_lat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(d_lng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def segment_lengths_m(lats, lngs):
+    """연속한 좌표 사이의 거리(m) 배열 (길이 = 좌표 수 - 1)"""
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lngs = np.radians(np.asarray(lngs, dtype=float))
+    d_lat = np.diff(lats)
+    d_lng = np.diff(lngs)
+
+    a = np.sin(d_lat / 2) ** 2 + np.cos(lats[:-1]) * np.cos(lats[1:]) * np.sin(d_lng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def rank_by_distance(lat, lng, points, limit=DEFAULT_LIMIT, radius_m=None):
+    """
+    (id, 위도, 경도) 목록을 (lat, lng)에서 가까운 순으로 정렬해 최대 limit개의 (id, 거리(m))를 반환합니다.
+    radius_m가 주어지면 그 거리 밖의 점은 제외합니다.
+    """
+    if not points or limit <= 0:
+        return []
+
+    coords = np.array([(point[1], point[2]) for point in points], dtype=float)
+    distances = haversine_m(lat, lng, coords[:, 0], coords[:, 1])
+
+    candidates = np.arange(len(points))
+    if radius_m is not None:
+        candidates = candidates[distances <= radius_m]
+
+    # 전체 정렬 대신 상위 limit개만 골라낸 뒤 그 안에서 정렬
+    if len(candidates) > limit:
+        candidates = candidates[np.argpartition(distances[candidates], limit - 1)[:limit]]
+    candidates = candidates[np.argsort(distances[candidates], kind='stable')]
+
+    return [(points[i][0], float(distances[i])) for i in candidates]
+
+
+def get_nearby_area(query_params):
+    """
+    nearby 요청 파라미터에서 거리 계산 기준점과 검색 영역을 구합니다.
+    반환값: (lat, lng, (min_lat, min_lng, max_lat, max_lng), radius_m)
+
+    바운딩 박스 방식에서는 radius 파라미터가 있을 때만 반경으로 결과를 자르고,
+    반경 방식에서는 박스 모서리 부분(반경 밖)을 항상 제외합니다.
+    """
+    # Check if bounding box parameters are provided
+    if all(param in query_params for param in ['startX', 'startY', 'endX', 'endY']):
+        # Bounding box approach (similar to Hogangnono)
+        start_x = float(query_params.get('startX'))
+        start_y = float(query_params.get('startY'))
+        end_x = float(query_params.get('endX'))
+        end_y = float(query_params.get('endY'))
+
+        bbox = (min(start_y, end_y), min(start_x, end_x), max(start_y, end_y), max(start_x, end_x))
+
+        # Get center point for distance calculation
+        lat = float(query_params.get('lat', (start_y + end_y) / 2))
+        lng = float(query_params.get('lng', (start_x + end_x) / 2))
+        radius_m = float(query_params['radius']) if 'radius' in query_params else None
+
+    else:
+        # Fallback to radius-based search
+        lat = float(query_params.get('lat', 0))
+        lng = float(query_params.get('lng', 0))
+        radius_m = float(query_params.get('radius', DEFAULT_RADIUS_M))
+        bbox = radius_bbox(lat, lng, radius_m)
+
+    return lat, lng, bbox, radius_m
+
+
+def radius_bbox(lat, lng, radius_m):
+    """(lat, lng) 중심 반경 radius_m 원을 감싸는 바운딩 박스"""
+    # 위도 1도 = 약 111km, 경도 1도는 위도에 따라 달라짐
+    lat_range = radius_m / METERS_PER_DEGREE
+    lng_range = radius_m / (METERS_PER_DEGREE * max(abs(math.cos(math.radians(lat))), 1e-6))
+    return (lat - lat_range, lng - lng_range, lat + lat_range, lng + lng_range)
+
+
+def bbox_filter(queryset, bbox, prefix='', lat_field='latitude', lng_field='longitude'):
+    """queryset을 바운딩 박스 안의 행으로 거릅니다. (위경도 복합 인덱스 사용)"""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    return queryset.filter(**{
+        f'{prefix}{lat_field}__range': (min_lat, max_lat),
+        f'{prefix}{lng_field}__range': (min_lng, max_lng),
+    })
+
+
+def nearest_in_queryset(queryset, lat, lng, limit=DEFAULT_LIMIT, radius_m=None,
+                        lat_field='latitude', lng_field='longitude'):
+    """
+    queryset에서 좌표만 읽어 거리 순위를 매긴 뒤, 선택된 행만 다시 조회합니다.
+    반환값: (거리 순으로 정렬된 객체 목록, {id: 거리(m)})
+    """
+    # 다대다 필터로 같은 행이 여러 번 나올 수 있으므로 id 기준으로 한 번만 사용
+    points = {
+        point[0]: point
+        for point in queryset.values_list('id', lat_field, lng_field)
+        if point[1] is not None and point[2] is not None
+    }
+    points = list(points.values())
+    ranked = rank_by_distance(lat, lng, points, limit, radius_m)
+
+    objects = queryset.in_bulk([pk for pk, _ in ranked])
+    return [objects[pk] for pk, _ in ranked if pk in objects], dict(ranked)
+
+
+def attach_distances(data, distances):
+    """직렬화된 결과 목록의 각 항목에 distance_m(미터)을 추가합니다."""
+    for item in data:
+        distance = distances.get(item['id'])
+        item['distance_m'] = round(distance, 1) if distance is not None else None
+    return data
+
+
+# 지도 타일 (슬리피 맵, 웹 메르카토르) 좌표 계산
+MAX_TILE_LATITUDE = 85.05112878
+
+
+def tile_position(lat, lng, zoom):
+    """좌표의 타일 내 위치를 실수 (x, y)로 반환합니다. 정수부가 타일 번호입니다."""
+    n = 2 ** zoom
+    lat = min(max(lat, -MAX_TILE_LATITUDE), MAX_TILE_LATITUDE)
+    x = (lng + 180.0) / 360.0 * n
+    y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+    return min(max(x, 0.0), n - 1e-9), min(max(y, 0.0), n - 1e-9)
+
+
+def tile_of(lat, lng, zoom):
+    """좌표가 속한 타일 번호 (x, y)"""
+    x, y = tile_position(lat, lng, zoom)
+    return int(x), int(y)
+
+
+def tile_bbox(x, y, zoom):
+    """타일이 덮는 영역 (min_lat, min_lng, max_lat, max_lng)"""
+    n = 2 ** zoom
+    min_lng = x / n * 360.0 - 180.0
+    max_lng = (x + 1) / n * 360.0 - 180.0
+    max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return (min_lat, min_lng, max_lat, max_lng)
+
+
+def tiles_in_bbox(bbox, zoom):
+    """바운딩 박스에 걸치는 타일 번호 (x, y) 목록"""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    x0, y0 = tile_of(max_lat, min_lng, zoom)
+    x1, y1 = tile_of(min_lat, max_lng, zoom)
+    return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
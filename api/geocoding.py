@@ -0,0 +1,180 @@
+# hyper_pets_backend/api/geocoding.py
+"""
+네이버 리버스 지오코딩 API 호출과 결과 캐시.
+
+좌표는 소수점 넷째 자리(약 10m)로 반올림해 같은 칸의 요청은 같은 결과를 사용합니다.
+캐시는 두 단계로, 프로세스 메모리의 LRU 캐시를 먼저 확인하고 없으면
+DB(ReverseGeocodeCache)를 확인합니다. 둘 다 없을 때만 네이버 API를 호출하며,
+같은 칸에 대한 동시 요청은 한 번만 호출하고 나머지는 그 결과를 기다려 사용합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ReverseGeocodeCache
+
+NAVER_REVERSE_GEOCODE_URL = 'https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc'
+COORDINATE_PRECISION = 4  # 소수점 넷째 자리 ≒ 11m
+DEFAULT_ORDERS = 'legalcode,admcode'
+ROAD_ORDERS = 'legalcode,admcode,addr,roadaddr'  # 지번/도로명 주소까지 포함
+
+
+class GeocodingError(Exception):
+    """네이버 API 호출 실패 (네트워크 오류, 시간 초과 등)"""
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    """연결을 재사용하는 HTTP 세션 (프로세스당 하나)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=getattr(settings, 'NAVER_HTTP_POOL_SIZE', 10))
+                session.mount('https://', adapter)
+                session.headers.update({
+                    'X-NCP-APIGW-API-KEY-ID': settings.NAVER_CLIENT_ID or '',
+                    'X-NCP-APIGW-API-KEY': settings.NAVER_CLIENT_SECRET or '',
+                })
+                _session = session
+    return _session
+
+
+class LRUCache:
+    """유지 시간이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+_memory_cache = LRUCache(getattr(settings, 'REVERSE_GEOCODE_MEMORY_CACHE_SIZE', 10000))
+
+# 진행 중인 조회: key -> (완료 이벤트, 결과를 담을 dict)
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def quantize(lat, lng):
+    """캐시 키로 쓰는 반올림 좌표"""
+    return round(float(lat), COORDINATE_PRECISION), round(float(lng), COORDINATE_PRECISION)
+
+
+def _cache_key(lat, lng, road=False):
+    key = f'{lat:.{COORDINATE_PRECISION}f},{lng:.{COORDINATE_PRECISION}f}'
+    return f'{key}:road' if road else key
+
+
+def _ttl():
+    return getattr(settings, 'REVERSE_GEOCODE_CACHE_TTL', 60 * 60 * 24 * 7)
+
+
+def _fetch(lat, lng, road=False):
+    """네이버 API 호출. 반환값: (응답 JSON, HTTP 상태 코드)"""
+    params = {
+        'coords': f'{lng},{lat}',
+        'output': 'json',
+        'orders': ROAD_ORDERS if road else DEFAULT_ORDERS,
+    }
+    timeout = (
+        getattr(settings, 'NAVER_API_CONNECT_TIMEOUT', 1.0),
+        getattr(settings, 'NAVER_API_READ_TIMEOUT', 3.0),
+    )
+    try:
+        res = _get_session().get(NAVER_REVERSE_GEOCODE_URL, params=params, timeout=timeout)
+        return res.json(), res.status_code
+    except (requests.RequestException, ValueError) as e:
+        raise GeocodingError(str(e)) from e
+
+
+def _lookup(key, lat, lng, road):
+    """DB 캐시를 확인하고, 없거나 만료되었으면 네이버 API를 호출해 저장합니다."""
+    ttl = _ttl()
+    entry = ReverseGeocodeCache.objects.filter(key=key).first()
+    if entry is not None and entry.updated_at >= timezone.now() - timedelta(seconds=ttl):
+        return entry.response, 200
+
+    data, status_code = _fetch(lat, lng, road)
+    # 정상 응답만 저장 (인증 실패나 호출 제한 응답은 캐시하지 않음)
+    if status_code == 200:
+        ReverseGeocodeCache.objects.update_or_create(
+            key=key, defaults={'latitude': lat, 'longitude': lng, 'response': data}
+        )
+    return data, status_code
+
+
+def reverse_geocode(lat, lng, road=False):
+    """
+    좌표의 네이버 리버스 지오코딩 결과를 반환합니다. road=True이면 지번/도로명 주소도 포함합니다.
+    반환값: (응답 JSON, HTTP 상태 코드). 네이버 API 호출에 실패하면 GeocodingError가 발생합니다.
+    """
+    lat, lng = quantize(lat, lng)
+    key = _cache_key(lat, lng, road)
+
+    cached = _memory_cache.get(key)
+    if cached is not None:
+        return cached, 200
+
+    with _in_flight_lock:
+        flight = _in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _in_flight[key] = (threading.Event(), {})
+
+    done, result = flight
+    if not leader:
+        # 같은 칸을 조회 중인 요청이 끝나길 기다렸다가 그 결과를 사용
+        done.wait(getattr(settings, 'NAVER_API_READ_TIMEOUT', 3.0) + 2)
+        if 'error' in result:
+            raise GeocodingError(result['error'])
+        if 'value' not in result:
+            raise GeocodingError('리버스 지오코딩 대기 시간이 초과되었습니다.')
+        return result['value']
+
+    try:
+        data, status_code = _lookup(key, lat, lng, road)
+        if status_code == 200:
+            _memory_cache.set(key, data, _ttl())
+        result['value'] = (data, status_code)
+        return data, status_code
+    except Exception as e:
+        result['error'] = str(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+        done.set()
@@ -0,0 +1,155 @@
+# hyper_pets_backend/api/geofence.py
+"""
+산책 안전 구역(SafeZone) 이탈 판정.
+
+예약에 지정된 구역(예약 단위 + 예약한 반려동물 단위)을 미리 컴파일해 프로세스 메모리에 두고,
+포인트가 저장될 때(track_ingest) 구역별 bbox로 먼저 거른 뒤 원은 거리, 다각형은 point-in-polygon으로 확인합니다.
+포인트가 어느 구역에도 속하지 않으면 구역 밖으로 보며,
+GEOFENCE_EXIT_DEBOUNCE_SECONDS 동안 계속 밖에 있을 때 한 번만 이탈 이벤트와 알림을 만듭니다.
+구역 안으로 돌아오면 다시 알릴 수 있는 상태가 됩니다.
+구역이 바뀌면 signals에서 캐시를 비우고, 다른 프로세스의 변경은 GEOFENCE_CACHE_TTL이 지나면 반영됩니다.
+캐시는 최근에 쓴 예약 GEOFENCE_CACHE_SIZE개까지만 보관합니다.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Q
+
+from . import geo
+from .geocoding import LRUCache
+from .models import SafeZone, Booking, WalkingEvent, Notification
+
+STATE_FIELDS = ('zone_exit_since', 'zone_alerted')
+
+
+def _point_in_polygon(lats, lngs, poly_lats, poly_lngs):
+    """ray casting: 각 점에서 경도 + 방향으로 그은 반직선이 변과 만나는 횟수가 홀수면 안쪽"""
+    inside = np.zeros(len(lats), dtype=bool)
+    j = len(poly_lats) - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(len(poly_lats)):
+            lat_i, lng_i, lat_j, lng_j = poly_lats[i], poly_lngs[i], poly_lats[j], poly_lngs[j]
+            crosses = (lat_i > lats) != (lat_j > lats)
+            lng_at = (lng_j - lng_i) * (lats - lat_i) / (lat_j - lat_i) + lng_i
+            inside ^= crosses & (lngs < lng_at)
+            j = i
+    return inside
+
+
+class Zone:
+    """컴파일된 안전 구역 하나 (bbox + 원 또는 다각형)"""
+
+    def __init__(self, zone):
+        self.id = zone.id
+        self.name = zone.name
+        self.zone_type = zone.zone_type
+        if zone.zone_type == 'circle':
+            self.center = (zone.center_latitude, zone.center_longitude)
+            self.radius_m = zone.radius
+            self.bbox = geo.radius_bbox(zone.center_latitude, zone.center_longitude, zone.radius)
+        else:
+            vertices = np.array(zone.polygon, dtype=float)
+            self.poly_lats, self.poly_lngs = vertices[:, 0], vertices[:, 1]
+            self.bbox = (self.poly_lats.min(), self.poly_lngs.min(), self.poly_lats.max(), self.poly_lngs.max())
+
+    def contains(self, lats, lngs):
+        """좌표 배열 각각이 구역 안에 있는지 (bool 배열)"""
+        min_lat, min_lng, max_lat, max_lng = self.bbox
+        result = np.zeros(len(lats), dtype=bool)
+        candidates = np.flatnonzero((lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng))
+        if not len(candidates):
+            return result
+
+        if self.zone_type == 'circle':
+            distances = geo.haversine_m(self.center[0], self.center[1], lats[candidates], lngs[candidates])
+            result[candidates] = distances <= self.radius_m
+        else:
+            result[candidates] = _point_in_polygon(lats[candidates], lngs[candidates], self.poly_lats, self.poly_lngs)
+        return result
+
+
+def inside_any(zones, lats, lngs):
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    inside = np.zeros(len(lats), dtype=bool)
+    for zone in zones:
+        inside |= zone.contains(lats, lngs)
+        if inside.all():
+            break
+    return inside
+
+
+_zones = LRUCache(getattr(settings, 'GEOFENCE_CACHE_SIZE', 1000))  # 예약 id -> 컴파일된 구역 목록
+
+
+def zones_for_booking(booking_id):
+    """예약에 적용되는 활성 안전 구역 목록. 프로세스 메모리에 GEOFENCE_CACHE_TTL(초) 동안 보관합니다."""
+    zones = _zones.get(booking_id)
+    if zones is not None:
+        return zones
+
+    queryset = SafeZone.objects.filter(is_active=True).filter(
+        Q(booking_id=booking_id) | Q(pet__bookings=booking_id)
+    ).distinct()
+    zones = [Zone(zone) for zone in queryset]
+    _zones.set(booking_id, zones, getattr(settings, 'GEOFENCE_CACHE_TTL', 60))
+    return zones
+
+
+def invalidate():
+    _zones.clear()
+
+
+def check(track, points):
+    """
+    시간순 (시각, 위도, 경도) 목록으로 트랙의 이탈 상태(zone_exit_since, zone_alerted)를 갱신하고
+    새로 알려야 할 이탈 포인트 목록을 반환합니다. (상태 저장은 호출하는 쪽에서)
+    """
+    if not points:
+        return []
+    zones = zones_for_booking(track.booking_id)
+    if not zones:
+        return []
+
+    inside = inside_any(zones, [p[1] for p in points], [p[2] for p in points])
+    if inside.all():
+        track.zone_exit_since = None
+        track.zone_alerted = False
+        return []
+
+    debounce = timedelta(seconds=getattr(settings, 'GEOFENCE_EXIT_DEBOUNCE_SECONDS', 30))
+    exits = []
+    for point, is_inside in zip(points, inside):
+        if is_inside:
+            track.zone_exit_since = None
+            track.zone_alerted = False
+            continue
+        if track.zone_exit_since is None:
+            track.zone_exit_since = point[0]
+        if not track.zone_alerted and point[0] - track.zone_exit_since >= debounce:
+            track.zone_alerted = True
+            exits.append(point)
+    return exits
+
+
+def record_exit(track, point, description='안전 구역을 벗어났습니다.'):
+    """이탈 이벤트와 보호자 알림을 만듭니다. point: (시각, 위도, 경도)"""
+    timestamp, lat, lng = point
+    event = WalkingEvent.objects.create(
+        walking_track=track,
+        event_type='zone_exit',
+        timestamp=timestamp,
+        latitude=lat,
+        longitude=lng,
+        description=description
+    )
+    pet_owner_id = Booking.objects.values_list('pet_owner_id', flat=True).get(pk=track.booking_id)
+    Notification.objects.create(
+        user_id=pet_owner_id,
+        type='safety',
+        title='안전 구역 이탈',
+        content='산책 중 반려동물이 안전 구역을 벗어났습니다.',
+        related_booking_id=track.booking_id
+    )
+    return event
@@ -0,0 +1,95 @@
+# hyper_pets_backend/api/inactivity.py
+"""
+진행 중인 산책의 장시간 비활동(위치 업데이트 없음) 점검.
+
+sweep_inactive_walks 명령이 주기적으로 sweep()을 호출합니다.
+한 번의 점검은 (status, last_point_at) 인덱스를 쓰는 조회 한 번으로 비활동 트랙만 가져오므로
+진행 중인 산책 수와 관계없이 새로 비활동 상태가 된 트랙 수만큼만 일합니다.
+알림은 공백 하나(마지막 활동 시각)당 한 번만 보내며, inactivity_alerted_at을 조건부 UPDATE로 먼저 기록해
+점검 프로세스가 여러 개이거나 API 호출과 겹쳐도 중복 알림이 생기지 않습니다.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import WalkingTrack, WalkingEvent, Notification
+
+DEFAULT_THRESHOLD_MINUTES = 15
+
+# 마지막 활동 시각: 마지막 포인트, 포인트가 없으면 산책 시작 시각
+LAST_ACTIVITY = Coalesce(F('last_point_at'), F('start_time'), F('created_at'))
+
+
+def threshold():
+    return timedelta(minutes=getattr(settings, 'WALK_INACTIVITY_MINUTES', DEFAULT_THRESHOLD_MINUTES))
+
+
+def _not_alerted():
+    return Q(inactivity_alerted_at__isnull=True) | Q(inactivity_alerted_at__lt=LAST_ACTIVITY)
+
+
+def inactive_tracks(now=None):
+    """비활동 기준 시간을 넘겼고 아직 이번 공백을 알리지 않은 진행 중 트랙"""
+    cutoff = (now or timezone.now()) - threshold()
+    return WalkingTrack.objects.filter(status='in_progress').filter(
+        Q(last_point_at__lt=cutoff) | Q(last_point_at__isnull=True, start_time__lt=cutoff)
+    ).filter(_not_alerted())
+
+
+def _claim(track_id):
+    """이번 공백의 알림 권한을 얻습니다. 다른 곳에서 먼저 알렸으면 False"""
+    return WalkingTrack.objects.filter(pk=track_id).filter(_not_alerted()).update(
+        inactivity_alerted_at=LAST_ACTIVITY
+    ) == 1
+
+
+def alert(track_id, pet_owner_id, booking_id, last_activity, latitude, longitude, now=None):
+    """비활동 이벤트와 보호자 알림을 만듭니다. 이미 알린 공백이면 None"""
+    now = now or timezone.now()
+    minutes = int((now - last_activity).total_seconds() // 60)
+    with transaction.atomic():
+        if not _claim(track_id):
+            return None
+        event = WalkingEvent.objects.create(
+            walking_track_id=track_id,
+            event_type='inactivity',
+            timestamp=now,
+            latitude=latitude,
+            longitude=longitude,
+            description=f'{minutes}분 동안 활동이 없습니다.'
+        )
+        Notification.objects.create(
+            user_id=pet_owner_id,
+            type='safety',
+            title='장시간 비활동',
+            content=f'{minutes}분 동안 펫시터의 위치 업데이트가 없습니다.',
+            related_booking_id=booking_id
+        )
+    return event
+
+
+def alert_track(track, now=None):
+    """트랙 하나를 점검해 알림 이벤트를 반환합니다. (기준 시간 미만이거나 이미 알린 공백이면 None)"""
+    now = now or timezone.now()
+    last_activity = track.last_point_at or track.start_time or track.created_at
+    if now - last_activity < threshold():
+        return None
+    return alert(track.id, track.booking.pet_owner_id, track.booking_id, last_activity,
+                 track.last_latitude, track.last_longitude, now)
+
+
+def sweep(now=None):
+    """모든 진행 중 산책을 점검합니다. 반환값: 새로 보낸 알림 수"""
+    now = now or timezone.now()
+    rows = inactive_tracks(now).annotate(last_activity=LAST_ACTIVITY).values_list(
+        'id', 'booking__pet_owner_id', 'booking_id', 'last_activity', 'last_latitude', 'last_longitude'
+    )
+    alerted = 0
+    for row in rows:
+        if alert(*row, now=now) is not None:
+            alerted += 1
+    return alerted
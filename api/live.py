@@ -0,0 +1,255 @@
+# hyper_pets_backend/api/live.py
+"""
+산책 실시간 중계용 발행/구독(pub/sub).
+
+트랙마다 채널(walking_track:<id>)이 하나씩 있고, 포인트 저장(track_ingest)과 산책 이벤트/상태 저장(signals)이
+트랜잭션 커밋 후 변경분(delta)을 발행하면 그 채널을 구독 중인 SSE 연결(live_views)로 전달됩니다.
+발행/구독 구현은 LIVE_BACKEND 설정(클래스 경로)으로 바꿀 수 있습니다.
+- InProcessBackend: 같은 프로세스 안의 구독자에게만 전달 (개발용, 워커가 하나일 때)
+- RedisBackend: Redis pub/sub으로 모든 워커의 구독자에게 전달 (REDIS_URL이 있으면 기본값)
+포인트 저장 요청과 SSE 연결은 서로 다른 워커가 받을 수 있으므로 워커가 여럿이면 RedisBackend를 써야 합니다.
+
+백엔드는 아래 두 메서드를 제공하면 됩니다.
+- publish(channel, message): 어느 스레드에서나 호출 가능, 구독자가 없으면 아무것도 하지 않음
+- subscribe(channel): 이벤트 루프 안에서 호출, ready()/get(timeout)/close()를 가진 구독 객체 반환
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = 'api.live.InProcessBackend'
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_REDIS_TIMEOUT = 1.0
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """구독자 한 명의 메시지 큐. 큐가 넘치면 overflowed가 켜지고 이후 메시지는 버려집니다."""
+
+    def __init__(self, backend, channel, maxsize):
+        self.backend = backend
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+        self.pending = None  # 구독이 실제로 시작되기 전까지 기다릴 작업 (프로세스 간 백엔드)
+
+    async def ready(self):
+        """구독이 시작되어 이후 발행되는 메시지를 받을 수 있을 때까지 기다립니다."""
+        if self.pending is not None:
+            await asyncio.shield(self.pending)
+
+    def deliver(self, message):
+        """다른 스레드에서도 호출할 수 있도록 구독자의 이벤트 루프에서 큐에 넣습니다."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힌 구독자
+            self.close()
+
+    def _put(self, message):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """다음 메시지. timeout(초) 안에 없으면 None"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.backend.unsubscribe(self)
+
+
+class InProcessBackend:
+    """같은 프로세스 안에서만 동작하는 기본 백엔드"""
+
+    def __init__(self):
+        self._channels = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, getattr(settings, 'LIVE_QUEUE_SIZE', DEFAULT_QUEUE_SIZE))
+        with self._lock:
+            self._channels[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            members = self._channels.get(subscription.channel)
+            if members is not None:
+                members.discard(subscription)
+                if not members:
+                    del self._channels[subscription.channel]
+
+    def publish(self, channel, message):
+        with self._lock:
+            members = list(self._channels.get(channel, ()))
+        for subscription in members:
+            subscription.deliver(message)
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._channels.get(channel, ()))
+
+
+class RedisBackend(InProcessBackend):
+    """
+    Redis pub/sub으로 여러 워커(프로세스)의 구독자에게 전달하는 백엔드 (REDIS_URL)
+    발행은 PUBLISH 한 번이고, 각 워커는 구독자가 있는 채널만 Redis 연결 하나로 구독해
+    받은 메시지를 같은 프로세스의 구독자들에게 나눠 줍니다.
+    중계는 부가 기능이므로 Redis가 응답하지 않으면(LIVE_REDIS_TIMEOUT) 발행을 건너뛰고 경고만 남깁니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        url = getattr(settings, 'REDIS_URL', None)
+        if not url:
+            raise ImproperlyConfigured('RedisBackend를 사용하려면 REDIS_URL을 설정해야 합니다.')
+        import redis
+        import redis.asyncio
+
+        self._redis = redis
+        self._url = url
+        timeout = getattr(settings, 'LIVE_REDIS_TIMEOUT', DEFAULT_REDIS_TIMEOUT)
+        self._client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self._loop = None
+        self._pubsub = None
+        self._subscribed = {}  # 채널 -> SUBSCRIBE 작업
+
+    def publish(self, channel, message):
+        # 커밋 후에 호출되므로 실패를 요청 오류로 올리지 않음 (구독자는 다시 연결할 때 스냅샷을 받음)
+        try:
+            self._client.publish(channel, json.dumps(message, cls=DjangoJSONEncoder))
+        except self._redis.RedisError:
+            logger.warning('실시간 중계 메시지를 발행하지 못했습니다: %s', channel, exc_info=True)
+
+    def subscribe(self, channel):
+        subscription = super().subscribe(channel)
+        loop = subscription.loop
+        if self._loop is not loop:
+            # 처음 구독할 때 (또는 이벤트 루프가 바뀐 경우) 이 루프에서 Redis 구독 연결과 수신 작업을 시작
+            self._loop = loop
+            self._pubsub = self._redis.asyncio.Redis.from_url(self._url).pubsub(ignore_subscribe_messages=True)
+            self._subscribed = {}
+            loop.create_task(self._listen(self._pubsub))
+
+        if channel not in self._subscribed:
+            self._subscribed[channel] = loop.create_task(self._pubsub.subscribe(channel))
+        subscription.pending = self._subscribed[channel]
+        return subscription
+
+    def unsubscribe(self, subscription):
+        super().unsubscribe(subscription)
+        if self.subscriber_count(subscription.channel) or self._loop is not subscription.loop:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._schedule_unsubscribe, subscription.channel)
+        except RuntimeError:
+            pass  # 이벤트 루프가 이미 닫힘
+
+    def _schedule_unsubscribe(self, channel):
+        # 그 사이 같은 채널을 다시 구독했다면 유지
+        if self.subscriber_count(channel) or channel not in self._subscribed:
+            return
+        del self._subscribed[channel]
+        self._loop.create_task(self._pubsub.unsubscribe(channel))
+
+    async def _listen(self, pubsub):
+        while pubsub is self._pubsub:
+            if not pubsub.subscribed:
+                await asyncio.sleep(0.1)
+                continue
+            try:
+                message = await pubsub.get_message(timeout=1.0)
+            except self._redis.ConnectionError:
+                # 연결이 끊기면 다음 조회 때 다시 연결하고 구독 중인 채널을 다시 구독함
+                logger.warning('실시간 중계 Redis 연결이 끊어졌습니다. 다시 연결합니다.')
+                await asyncio.sleep(1)
+                continue
+            if message is None or message['type'] != 'message':
+                continue
+            channel = message['channel'].decode()
+            try:
+                data = json.loads(message['data'])
+            except ValueError:
+                logger.warning('잘못된 실시간 중계 메시지를 무시합니다: %s', channel)
+                continue
+            super().publish(channel, data)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = import_string(getattr(settings, 'LIVE_BACKEND', DEFAULT_BACKEND))()
+    return _backend
+
+
+def track_channel(track_id):
+    return f'walking_track:{track_id}'
+
+
+def epoch_ms(value):
+    return round((value - _EPOCH).total_seconds() * 1000)
+
+
+def publish_track(track_id, event, data):
+    """트랙 채널에 메시지를 발행합니다. event는 SSE 이벤트 이름 (points, event, status)"""
+    get_backend().publish(track_channel(track_id), {'event': event, 'data': data})
+
+
+def publish_track_on_commit(track_id, event, data):
+    """현재 트랜잭션이 커밋된 뒤 발행합니다. (롤백되면 발행하지 않음, 발행 실패는 로그만 남김)"""
+    transaction.on_commit(lambda: publish_track(track_id, event, data), robust=True)
+
+
+def points_delta(points, track=None):
+    """새로 저장된 (시각, 위도, 경도) 목록을 points 메시지 본문으로 만듭니다. 시각은 epoch ms"""
+    data = {'points': [[epoch_ms(timestamp), lat, lng] for timestamp, lat, lng in points]}
+    if track is not None:
+        data.update({
+            'point_count': track.point_count,
+            'total_distance': track.total_distance,
+        })
+    return data
+
+
+def event_delta(event):
+    return {
+        'id': event.id,
+        'event_type': event.event_type,
+        'timestamp': event.timestamp.isoformat(),
+        'latitude': event.latitude,
+        'longitude': event.longitude,
+        'description': event.description,
+    }
+
+
+def status_delta(track):
+    return {
+        'status': track.status,
+        'end_time': track.end_time.isoformat() if track.end_time else None,
+    }
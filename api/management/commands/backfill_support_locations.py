@@ -0,0 +1,26 @@
+"""
+지원사업(Support)의 지도 표시 위치(map_* 컬럼)를 다시 계산해 채우는 명령어
+(저장/지역 변경 시에는 자동으로 계산되므로 기존 데이터나 일괄 수정 후에 실행)
+"""
+from django.core.management.base import BaseCommand
+
+from api import support_locations
+from api.models import Support
+
+
+class Command(BaseCommand):
+    help = '지원사업의 지도 표시 위치(map_latitude/map_longitude/map_region_name/map_region_code)를 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true', help='아직 계산되지 않은 행만 처리')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Support.objects.order_by('pk')
+        if options['missing_only']:
+            queryset = queryset.filter(map_latitude__isnull=True)
+
+        total = queryset.count()
+        updated = support_locations.refresh(queryset, batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(f'완료: {total}개 중 {updated}개 업데이트'))
@@ -0,0 +1,101 @@
+"""
+합성 데이터로 위치 기반 바운딩 박스 조회 방식별 속도를 비교하는 명령어
+(생성한 데이터는 트랜잭션을 롤백해 남기지 않습니다)
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+
+from api import geo
+from api.models import Shelter
+
+# 합성 데이터를 흩뿌릴 영역 (수도권)
+AREA = (37.2, 126.6, 37.8, 127.3)
+
+
+class Command(BaseCommand):
+    help = '합성 보호소 데이터로 nearby 바운딩 박스 조회(범위 조건 / 복합 인덱스) 속도를 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='생성할 합성 행 수')
+        parser.add_argument('--queries', type=int, default=200, help='방식별 조회 횟수')
+        parser.add_argument('--radius', type=float, default=geo.DEFAULT_RADIUS_M, help='조회 반경 (m)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        min_lat, min_lng, max_lat, max_lng = AREA
+
+        with transaction.atomic():
+            self.stdout.write(f"합성 데이터 {options['rows']}개 생성 중...")
+            batch = []
+            for i in range(options['rows']):
+                lat = rng.uniform(min_lat, max_lat)
+                lng = rng.uniform(min_lng, max_lng)
+                batch.append(Shelter(name=f'benchmark-{i}', address='benchmark', latitude=lat, longitude=lng))
+                if len(batch) >= 5000:
+                    Shelter.objects.bulk_create(batch)
+                    batch = []
+            if batch:
+                Shelter.objects.bulk_create(batch)
+
+            if connection.vendor in ('postgresql', 'sqlite'):
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+
+            centers = [
+                (rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng))
+                for _ in range(options['queries'])
+            ]
+            bboxes = [geo.radius_bbox(lat, lng, options['radius']) for lat, lng in centers]
+
+            def range_without_index(bbox):
+                # 컬럼에 연산을 씌워 인덱스를 쓰지 못하게 한 기존 방식 (전체 스캔)
+                return Shelter.objects.annotate(
+                    plain_latitude=F('latitude') + 0, plain_longitude=F('longitude') + 0
+                ).filter(
+                    plain_latitude__range=(bbox[0], bbox[2]),
+                    plain_longitude__range=(bbox[1], bbox[3])
+                )
+
+            def range_with_index(bbox):
+                return Shelter.objects.filter(
+                    latitude__range=(bbox[0], bbox[2]),
+                    longitude__range=(bbox[1], bbox[3])
+                )
+
+            strategies = [
+                ('인덱스 없는 범위 조건', range_without_index),
+                ('위경도 복합 인덱스', range_with_index),
+            ]
+
+            expected = None
+            for name, build in strategies:
+                timings = []
+                counts = []
+                for bbox in bboxes:
+                    started = time.perf_counter()
+                    rows = list(build(bbox).values_list('id', 'latitude', 'longitude'))
+                    timings.append((time.perf_counter() - started) * 1000)
+                    counts.append(len(rows))
+
+                if expected is None:
+                    expected = counts
+                elif counts != expected:
+                    self.stdout.write(self.style.ERROR(f'{name}: 결과 행 수가 기준과 다릅니다.'))
+
+                timings.sort()
+                self.stdout.write(
+                    f'{name}: 평균 {statistics.mean(timings):.2f}ms, '
+                    f'중앙값 {statistics.median(timings):.2f}ms, '
+                    f'p95 {timings[int(len(timings) * 0.95) - 1]:.2f}ms '
+                    f'(평균 {statistics.mean(counts):.0f}행)'
+                )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('벤치마크 완료 (합성 데이터는 롤백됨)'))
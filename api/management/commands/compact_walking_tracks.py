@@ -0,0 +1,58 @@
+"""
+완료된 산책 트랙의 위치 포인트(TrackPoint 행)를 WalkingTrack.packed_points 한 컬럼으로
+압축해 옮기고 원본 행을 삭제하는 명령어
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api import track_storage
+from api.models import WalkingTrack
+
+
+class Command(BaseCommand):
+    help = '완료된 산책 트랙의 위치 포인트를 압축 컬럼으로 옮기고 원본 행을 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-hours', type=int, default=24,
+                            help='종료 후 이 시간(시간)이 지난 트랙만 처리 (기본 24)')
+        parser.add_argument('--limit', type=int, default=None, help='한 번에 처리할 최대 트랙 수')
+        parser.add_argument('--dry-run', action='store_true', help='압축 결과만 출력하고 저장하지 않음')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['older_than_hours'])
+        track_ids = WalkingTrack.objects.filter(
+            status='completed', end_time__lt=cutoff, packed_points__isnull=True
+        ).order_by('pk').values_list('pk', flat=True)
+        if options['limit']:
+            track_ids = track_ids[:options['limit']]
+
+        compacted = 0
+        deleted_rows = 0
+        for track_id in list(track_ids):
+            with transaction.atomic():
+                track = WalkingTrack.objects.select_for_update().get(pk=track_id)
+                if track.packed_points is not None:
+                    continue
+
+                points = track_storage.load_points(track)
+                packed = track_storage.pack(points)
+
+                # 압축 결과를 되돌려 개수가 맞는지 확인한 뒤에만 원본 삭제
+                if len(track_storage.unpack(packed)) != len(points):
+                    self.stdout.write(self.style.ERROR(f'트랙 {track_id}: 압축 검증 실패, 건너뜀'))
+                    continue
+
+                self.stdout.write(f'트랙 {track_id}: {len(points)}개 포인트 -> {len(packed)} bytes')
+                if options['dry_run']:
+                    transaction.set_rollback(True)
+                    continue
+
+                track.packed_points = packed
+                track.save(update_fields=['packed_points', 'updated_at'])
+                deleted_rows += track.track_points.all().delete()[0]
+                compacted += 1
+
+        self.stdout.write(self.style.SUCCESS(f'완료: {compacted}개 트랙 압축, {deleted_rows}개 포인트 행 삭제'))
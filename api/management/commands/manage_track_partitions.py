@@ -0,0 +1,79 @@
+"""
+산책 위치 포인트/이벤트 테이블의 월 단위 파티션을 관리하는 명령어 (PostgreSQL 전용, 매일 실행 권장)
+- 이번 달부터 --months-ahead개월 뒤까지의 파티션을 미리 만듭니다.
+  그 달의 행이 이미 기본 파티션(<테이블>_default)에 들어와 있으면 새 파티션으로 옮깁니다.
+- --retention: 보관 기간(TRACK_POINT_RETENTION_MONTHS, WALKING_EVENT_RETENTION_MONTHS)이 지난 파티션을
+  분리해 삭제하거나 --archive-schema 스키마로 옮깁니다. (행 단위 DELETE 없이 파티션 단위로 처리)
+  위치 포인트는 아직 압축 보관(compact_walking_tracks)되지 않은 트랙의 포인트가 남아 있으면 --force 없이는 건너뜁니다.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api import partitions
+
+RETENTION_SETTINGS = {
+    'api_trackpoint': 'TRACK_POINT_RETENTION_MONTHS',
+    'api_walkingevent': 'WALKING_EVENT_RETENTION_MONTHS',
+}
+
+
+class Command(BaseCommand):
+    help = '산책 위치 포인트/이벤트 테이블의 월 단위 파티션을 만들고 보관 기간이 지난 파티션을 정리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int,
+                            default=getattr(settings, 'TRACK_PARTITION_MONTHS_AHEAD', 3),
+                            help='미리 만들 파티션 개월 수 (기본 TRACK_PARTITION_MONTHS_AHEAD)')
+        parser.add_argument('--retention', action='store_true', help='보관 기간이 지난 파티션 정리')
+        parser.add_argument('--archive-schema', default=None, help='삭제하지 않고 이 스키마로 옮겨 보관')
+        parser.add_argument('--force', action='store_true', help='압축 보관되지 않은 포인트가 있어도 정리')
+        parser.add_argument('--dry-run', action='store_true', help='실행할 작업만 출력하고 반영하지 않음')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING('파티션은 PostgreSQL에서만 사용합니다. 건너뜁니다.'))
+            return
+
+        now = timezone.now()
+        for table, _ in partitions.PARTITIONED_TABLES:
+            with transaction.atomic(), connection.cursor() as cursor:
+                if not partitions.is_partitioned(cursor, table):
+                    self.stdout.write(self.style.WARNING(f'{table}: 파티션 테이블이 아닙니다. migrate를 먼저 실행하세요.'))
+                    continue
+
+                for name, moved in partitions.ensure_partitions(cursor, table, now, options['months_ahead']):
+                    message = f'{table}: 파티션 {name} 생성'
+                    if moved:
+                        message += f' (기본 파티션에서 {moved}행 이동)'
+                    self.stdout.write(message)
+
+                if options['dry_run']:
+                    transaction.set_rollback(True)
+
+            if options['retention']:
+                self._apply_retention(table, now, options)
+
+    def _apply_retention(self, table, now, options):
+        months = getattr(settings, RETENTION_SETTINGS[table], 0)
+        if not months:
+            return
+
+        cutoff = partitions.add_months(partitions.month_start(now), -months)
+        with connection.cursor() as cursor:
+            expired = partitions.expired_partitions(cursor, table, cutoff)
+
+        for name in expired:
+            with transaction.atomic(), connection.cursor() as cursor:
+                if table == 'api_trackpoint' and not options['force'] and partitions.has_uncompacted_points(cursor, name):
+                    self.stdout.write(self.style.WARNING(
+                        f'{name}: 압축 보관되지 않은 트랙의 포인트가 있어 건너뜁니다. (compact_walking_tracks 실행 후 재시도)'
+                    ))
+                    continue
+
+                action = f'{options["archive_schema"]} 스키마로 이동' if options['archive_schema'] else '삭제'
+                self.stdout.write(f'{table}: 파티션 {name} {action}')
+                if options['dry_run']:
+                    continue
+                partitions.retire_partition(cursor, table, name, options['archive_schema'])
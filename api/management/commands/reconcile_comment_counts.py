@@ -0,0 +1,26 @@
+"""
+게시글 댓글 수(CommunityPost.comment_count)를 실제 댓글 수와 맞추는 명령어
+(신호를 거치지 않은 댓글 변경이나 fixture 로드 후, 또는 주기적으로 실행)
+"""
+from django.core.management.base import BaseCommand
+
+from api import comment_counts
+
+
+class Command(BaseCommand):
+    help = '게시글의 저장된 댓글 수를 실제 댓글 수로 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='어긋난 게시글만 출력하고 반영하지 않음')
+
+    def handle(self, *args, **options):
+        mismatched = comment_counts.mismatched()
+        for post_id, stored, actual in mismatched:
+            self.stdout.write(f'게시글 {post_id}: {stored} -> {actual}')
+
+        if options['dry_run'] or not mismatched:
+            self.stdout.write(f'댓글 수가 어긋난 게시글 {len(mismatched)}개')
+            return
+
+        updated = comment_counts.reconcile()
+        self.stdout.write(self.style.SUCCESS(f'게시글 {updated}개의 댓글 수를 다시 계산했습니다.'))
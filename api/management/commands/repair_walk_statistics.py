@@ -0,0 +1,36 @@
+"""
+산책 트랙(WalkingTrack)의 누적 통계(거리, 이동 시간, 최고 속도, 포인트 수, 마지막 위치)를
+저장된 위치 포인트로부터 다시 계산하는 명령어
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api import track_ingest
+from api.models import WalkingTrack
+
+
+class Command(BaseCommand):
+    help = '저장된 위치 포인트를 한 번씩 훑어 산책 트랙의 누적 통계를 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('track_ids', nargs='*', type=int, help='다시 계산할 트랙 id (생략하면 전체)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='한 번에 읽을 포인트 수')
+
+    def handle(self, *args, **options):
+        tracks = WalkingTrack.objects.order_by('pk')
+        if options['track_ids']:
+            tracks = tracks.filter(pk__in=options['track_ids'])
+
+        repaired = 0
+        for track_id in tracks.values_list('pk', flat=True).iterator():
+            with transaction.atomic():
+                # 계산하는 동안 포인트가 추가되지 않도록 트랙 행을 잠금
+                track = WalkingTrack.objects.select_for_update().get(pk=track_id)
+                before = [getattr(track, field) for field in track_ingest.STAT_FIELDS]
+                track_ingest.recompute_stats(track, chunk_size=options['chunk_size'])
+                if before != [getattr(track, field) for field in track_ingest.STAT_FIELDS]:
+                    track.save(update_fields=[*track_ingest.STAT_FIELDS, 'updated_at'])
+                    repaired += 1
+                    self.stdout.write(f'트랙 {track_id}: {track.point_count}개 포인트, {track.total_distance:.1f}m')
+
+        self.stdout.write(self.style.SUCCESS(f'완료: {repaired}개 트랙 통계 수정'))
@@ -0,0 +1,29 @@
+"""
+완료되었지만 아직 산책 히트맵 집계에 반영되지 않은 트랙을 반영하는 명령어
+(완료 시점에 자동 반영되므로 누락분 처리나 기존 데이터 초기 반영에 사용)
+"""
+from django.core.management.base import BaseCommand
+
+from api import walk_heatmap
+from api.models import WalkingTrack
+
+
+class Command(BaseCommand):
+    help = '완료된 산책 중 히트맵 집계에 반영되지 않은 트랙을 반영합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='한 번에 처리할 최대 트랙 수')
+
+    def handle(self, *args, **options):
+        track_ids = WalkingTrack.objects.filter(
+            status='completed', heatmap_aggregated=False
+        ).order_by('pk').values_list('pk', flat=True)
+        if options['limit']:
+            track_ids = track_ids[:options['limit']]
+
+        tracks = cells = 0
+        for track_id in list(track_ids):
+            cells += walk_heatmap.aggregate_track(track_id)
+            tracks += 1
+
+        self.stdout.write(self.style.SUCCESS(f'완료: {tracks}개 트랙, {cells}개 칸 반영'))
@@ -0,0 +1,35 @@
+"""
+진행 중인 산책을 주기적으로 점검해 장시간 위치 업데이트가 없는 산책에 비활동 알림을 보내는 명령어
+(기본은 계속 실행되는 루프, --once로 한 번만 점검해 cron 등에서 사용 가능)
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api import inactivity
+
+
+class Command(BaseCommand):
+    help = '진행 중인 산책 중 장시간 위치 업데이트가 없는 산책에 비활동 알림을 보냅니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=60, help='점검 간격 (초, 기본 60)')
+        parser.add_argument('--once', action='store_true', help='한 번만 점검하고 종료')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            started = time.monotonic()
+            alerted = inactivity.sweep()
+            elapsed_ms = (time.monotonic() - started) * 1000
+            if alerted or options['once']:
+                self.stdout.write(f'비활동 알림 {alerted}건 전송 ({elapsed_ms:.0f}ms)')
+            if options['once']:
+                return
+
+            try:
+                time.sleep(max(options['interval'] - elapsed_ms / 1000, 1))
+            except KeyboardInterrupt:
+                self.stdout.write('점검을 종료합니다.')
+                return
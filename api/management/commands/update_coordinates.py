@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from api import spatial_index
 from api.models import Hospital, Shelter
 import requests
 import time
@@ -78,6 +79,9 @@ class Command(BaseCommand):
             # 네이버 API 호출 제한을 고려한 딜레이
             time.sleep(0.1)
 
+        # 메모리 공간 인덱스와 지도 타일 캐시 무효화
+        spatial_index.invalidate(model)
+
         # 결과를 JSON 파일로 저장
         model_name = model.__name__.lower()
         with open(f'{model_name}_coordinate_updates.json', 'w', encoding='utf-8') as f:
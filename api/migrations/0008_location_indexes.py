@@ -0,0 +1,33 @@
+# Generated by Django 4.2.19 on 2026-10-17 18:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_region_latitude_region_longitude'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['latitude', 'longitude'], name='api_customu_latitud_2720f0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hospital',
+            index=models.Index(fields=['latitude', 'longitude'], name='api_hospita_latitud_3e44fb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salon',
+            index=models.Index(fields=['latitude', 'longitude'], name='salons_latitud_4c0655_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shelter',
+            index=models.Index(fields=['latitude', 'longitude'], name='api_shelter_latitud_b85ce1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='support',
+            index=models.Index(fields=['latitude', 'longitude'], name='api_support_latitud_df3b5a_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_reversegeocodecache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='support',
+            name='map_latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='support',
+            name='map_longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='support',
+            name='map_region_code',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='support',
+            name='map_region_name',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+    ]
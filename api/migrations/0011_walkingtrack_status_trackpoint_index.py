@@ -0,0 +1,29 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:04
+
+from django.db import migrations, models
+
+
+def mark_finished_tracks(apps, schema_editor):
+    """종료 시각이 있는 기존 트랙은 완료 상태로 설정"""
+    WalkingTrack = apps.get_model('api', 'WalkingTrack')
+    WalkingTrack.objects.filter(end_time__isnull=False).update(status='completed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_support_map_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='status',
+            field=models.CharField(choices=[('in_progress', '진행중'), ('paused', '일시정지'), ('completed', '완료')], default='in_progress', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='trackpoint',
+            index=models.Index(fields=['walking_track', 'timestamp'], name='api_trackpo_walking_3182f8_idx'),
+        ),
+        migrations.RunPython(mark_finished_tracks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_walkingtrack_status_trackpoint_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='last_latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='last_longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='last_point_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='max_speed',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='moving_time',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='point_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_walkingtrack_running_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='packed_points',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_walkingtrack_packed_points'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='zone_alerted',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='zone_exit_since',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('booking', '예약 관련'), ('message', '메시지'), ('review', '리뷰'), ('system', '시스템'), ('community', '커뮤니티'), ('safety', '안전')], max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='walkingevent',
+            name='event_type',
+            field=models.CharField(choices=[('pee', '소변'), ('poo', '대변'), ('eat', '간식'), ('drink', '물'), ('play', '놀이'), ('rest', '휴식'), ('zone_exit', '안전 구역 이탈'), ('other', '기타')], max_length=10),
+        ),
+        migrations.CreateModel(
+            name='SafeZone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('zone_type', models.CharField(choices=[('circle', '원형'), ('polygon', '다각형')], max_length=10)),
+                ('center_latitude', models.FloatField(blank=True, null=True)),
+                ('center_longitude', models.FloatField(blank=True, null=True)),
+                ('radius', models.FloatField(blank=True, null=True)),
+                ('polygon', models.JSONField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('booking', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='safe_zones', to='api.booking')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='safe_zones', to=settings.AUTH_USER_MODEL)),
+                ('pet', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='safe_zones', to='api.userpet')),
+            ],
+        ),
+    ]
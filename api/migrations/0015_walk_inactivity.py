@@ -0,0 +1,27 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_safezone_geofence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='inactivity_alerted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='walkingevent',
+            name='event_type',
+            field=models.CharField(choices=[('pee', '소변'), ('poo', '대변'), ('eat', '간식'), ('drink', '물'), ('play', '놀이'), ('rest', '휴식'), ('zone_exit', '안전 구역 이탈'), ('inactivity', '장시간 비활동'), ('other', '기타')], max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='walkingtrack',
+            index=models.Index(fields=['status', 'last_point_at'], name='api_walking_status_6ccc4b_idx'),
+        ),
+    ]
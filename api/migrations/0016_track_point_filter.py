@@ -0,0 +1,28 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_walk_inactivity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='dropped_point_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='filter_variance',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='last_received_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,43 @@
+"""
+TrackPoint/WalkingEvent 테이블을 timestamp 기준 월 단위 파티션 테이블로 전환합니다. (PostgreSQL 전용, api.partitions)
+
+잠금과 소요 시간:
+- 마이그레이션 전체가 한 트랜잭션이며, 처음의 RENAME부터 커밋까지 두 테이블에 ACCESS EXCLUSIVE 잠금을 잡습니다.
+  그동안 포인트 저장과 트랙/이벤트 조회가 모두 대기하므로 점검 시간이나 사용량이 적은 시간에 실행합니다.
+- 행은 복사하지 않지만 기존 행을 두 번 읽습니다.
+  1) 기본키를 (id, timestamp)로 바꾸며 인덱스를 새로 만듦 (전체 읽기 + 정렬, 가장 오래 걸림)
+  2) 범위 CHECK 제약조건 검증 (전체 읽기 한 번, 이 검증 덕분에 ATTACH PARTITION은 다시 읽지 않고 바로 끝남)
+- PostgreSQL 16에서 포인트 200만 행(283MB)으로 측정: 기본키 재생성 1.4초, 범위 검증 0.2초, ATTACH 50ms 미만.
+  소요 시간은 행 수에 거의 비례하므로 운영 테이블 크기로 미리 가늠해 둡니다.
+- 디스크는 새 기본키 인덱스 크기만큼 추가로 필요합니다. (기존 기본키 인덱스는 커밋 후 삭제됨)
+"""
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+from api import partitions
+
+
+def partition_track_tables(apps, schema_editor):
+    # PostgreSQL에서만 월 단위 파티션 테이블로 전환 (sqlite 등 개발 환경은 그대로 둠)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    now = timezone.now()
+    with schema_editor.connection.cursor() as cursor:
+        for table, column in partitions.PARTITIONED_TABLES:
+            if partitions.is_partitioned(cursor, table):
+                continue
+            partitions.convert_to_partitioned(cursor, table, column, now)
+            partitions.ensure_partitions(cursor, table, now, getattr(settings, 'TRACK_PARTITION_MONTHS_AHEAD', 3))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_track_point_filter'),
+    ]
+
+    operations = [
+        # 되돌려도 파티션 테이블은 일반 테이블과 같은 방식으로 조회되므로 그대로 둠
+        migrations.RunPython(partition_track_tables, migrations.RunPython.noop),
+    ]
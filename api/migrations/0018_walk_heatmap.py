@@ -0,0 +1,37 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_partition_track_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='heatmap_aggregated',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.CreateModel(
+            name='WalkHeatmapCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('row', models.IntegerField()),
+                ('col', models.IntegerField()),
+                ('point_count', models.PositiveIntegerField(default=0)),
+                ('track_count', models.PositiveIntegerField(default=0)),
+                ('duration', models.FloatField(default=0)),
+                ('pet_sitter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='walk_heatmap_cells', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'row', 'col'], name='api_walkhea_date_a6ecbb_idx')],
+                'unique_together': {('date', 'pet_sitter', 'row', 'col')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:28
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_existing_comments(apps, schema_editor):
+    """기존 게시글의 댓글 수 채우기"""
+    CommunityPost = apps.get_model('api', 'CommunityPost')
+    Comment = apps.get_model('api', 'Comment')
+    counts = Comment.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(total=Count('pk')).values('total')
+    CommunityPost.objects.update(comment_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_walk_heatmap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='communitypost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_community_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='filter_centroid_latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='filter_centroid_longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='filter_cluster_size',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='walkingtrack',
+            name='filter_pending',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
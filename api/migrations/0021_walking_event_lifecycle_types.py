@@ -0,0 +1,18 @@
+# Generated by Django 4.2.19 on 2026-10-17 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_walking_track_filter_cluster_state'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='walkingevent',
+            name='event_type',
+            field=models.CharField(choices=[('start', '산책 시작'), ('pause', '일시정지'), ('resume', '재개'), ('end', '산책 종료'), ('pee', '소변'), ('poo', '대변'), ('eat', '간식'), ('drink', '물'), ('play', '놀이'), ('rest', '휴식'), ('zone_exit', '안전 구역 이탈'), ('inactivity', '장시간 비활동'), ('other', '기타')], max_length=10),
+        ),
+    ]
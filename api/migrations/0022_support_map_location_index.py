@@ -0,0 +1,17 @@
+# Generated by Django 4.2.19 on 2026-10-17 20:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_walking_event_lifecycle_types'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='support',
+            index=models.Index(fields=['map_latitude', 'map_longitude'], name='api_support_map_lat_43dce0_idx'),
+        ),
+    ]
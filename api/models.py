@@ -69,6 +69,7 @@ class Shelter(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [models.Index(fields=['latitude', 'longitude'])]
 
     def __str__(self):
         return self.name
@@ -88,6 +89,7 @@ class Hospital(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [models.Index(fields=['latitude', 'longitude'])]
 
     def __str__(self):
         return self.name
@@ -107,6 +109,7 @@ class Salon(models.Model):
     class Meta:
         db_table = 'salons'
         ordering = ['name']
+        indexes = [models.Index(fields=['latitude', 'longitude'])]
 
     def __str__(self):
         return self.name
@@ -235,6 +238,11 @@ class Support(models.Model):
     # 위치 정보 추가
     latitude = models.FloatField(null=True, blank=True, help_text='위도')
     longitude = models.FloatField(null=True, blank=True, help_text='경도')
+    # 지도 표시 위치 (연결 지역 > 자체 좌표 > 기본값 순으로 저장/지역 변경 시 계산, api.support_locations)
+    map_latitude = models.FloatField(null=True, blank=True, editable=False)
+    map_longitude = models.FloatField(null=True, blank=True, editable=False)
+    map_region_name = models.CharField(max_length=100, blank=True, editable=False)
+    map_region_code = models.CharField(max_length=10, blank=True, editable=False)
     # WelloPolicy 연동을 위한 필드 추가
     external_id = models.CharField(max_length=100, blank=True, null=True)
     # 크롤링 기반 데이터 출처 (내부 식별용, 사용자 비노출)
@@ -255,6 +263,10 @@ class Support(models.Model):
         ordering = ['-expires_at']
         verbose_name = '지원사업'
         verbose_name_plural = '지원사업들'
+        indexes = [
+            models.Index(fields=['latitude', 'longitude']),
+            models.Index(fields=['map_latitude', 'map_longitude']),  # nearby 조회 (지도 표시 위치)
+        ]
 
     def __str__(self):
         return self.title
@@ -308,6 +320,9 @@ class CustomUser(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta(AbstractUser.Meta):
+        indexes = [models.Index(fields=['latitude', 'longitude'])]
+    
     def __str__(self):
         return self.username
 
@@ -498,13 +513,51 @@ class Payment(models.Model):
 
 
 class WalkingTrack(models.Model):
+    STATUS_CHOICES = (
+        ('in_progress', '진행중'),
+        ('paused', '일시정지'),
+        ('completed', '완료'),
+    )
+    
     booking = models.OneToOneField(Booking, on_delete=models.CASCADE, related_name='walking_track')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_progress')
     start_time = models.DateTimeField(null=True, blank=True)
     end_time = models.DateTimeField(null=True, blank=True)
     total_distance = models.FloatField(default=0)  # 미터 단위
+    # 포인트 저장 시 누적되는 통계 (api.track_ingest)
+    point_count = models.PositiveIntegerField(default=0)
+    moving_time = models.FloatField(default=0)  # 초 단위
+    max_speed = models.FloatField(default=0)  # 미터/초
+    last_latitude = models.FloatField(null=True, blank=True)
+    last_longitude = models.FloatField(null=True, blank=True)
+    last_point_at = models.DateTimeField(null=True, blank=True)
+    # 저장 전 GPS 필터 상태 (api.track_filter): 버린 포인트 수, 좌표 보정 분산, 받은 마지막 포인트 시각(버린 포인트 포함),
+    # 제자리 묶음의 평균 위치와 좌표 수, 이동 확인을 기다리는 묶음 밖 포인트가 있는지 여부
+    dropped_point_count = models.PositiveIntegerField(default=0)
+    filter_variance = models.FloatField(null=True, blank=True, editable=False)
+    last_received_at = models.DateTimeField(null=True, blank=True, editable=False)
+    filter_centroid_latitude = models.FloatField(null=True, blank=True, editable=False)
+    filter_centroid_longitude = models.FloatField(null=True, blank=True, editable=False)
+    filter_cluster_size = models.PositiveIntegerField(default=1, editable=False)
+    filter_pending = models.BooleanField(default=False, editable=False)
+    # 완료 후 압축 보관된 위치 포인트 (api.track_storage, 이 값이 있으면 TrackPoint 행은 삭제된 상태)
+    packed_points = models.BinaryField(null=True, blank=True, editable=False)
+    # 안전 구역 이탈 판정 상태 (api.geofence): 구역 밖으로 나간 시각, 이번 이탈을 이미 알렸는지 여부
+    zone_exit_since = models.DateTimeField(null=True, blank=True, editable=False)
+    zone_alerted = models.BooleanField(default=False, editable=False)
+    # 마지막으로 비활동 알림을 보낸 공백의 시작 시각 (api.inactivity, 공백 하나에 알림 한 번)
+    inactivity_alerted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # 산책 히트맵(WalkHeatmapCell) 집계에 반영되었는지 여부 (api.walk_heatmap, 완료 시 한 번만 반영)
+    heatmap_aggregated = models.BooleanField(default=False, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            # 진행 중인 산책의 마지막 포인트 시각 조회 (비활동 점검)
+            models.Index(fields=['status', 'last_point_at']),
+        ]
+    
     def __str__(self):
         return f"산책 기록 - {self.booking.booking_id}"
 
@@ -516,18 +569,27 @@ class TrackPoint(models.Model):
     timestamp = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [models.Index(fields=['walking_track', 'timestamp'])]
+    
     def __str__(self):
         return f"위치 포인트 - {self.walking_track.booking.booking_id} ({self.timestamp})"
 
 
 class WalkingEvent(models.Model):
     EVENT_TYPE_CHOICES = (
+        ('start', '산책 시작'),
+        ('pause', '일시정지'),
+        ('resume', '재개'),
+        ('end', '산책 종료'),
         ('pee', '소변'),
         ('poo', '대변'),
         ('eat', '간식'),
         ('drink', '물'),
         ('play', '놀이'),
         ('rest', '휴식'),
+        ('zone_exit', '안전 구역 이탈'),
+        ('inactivity', '장시간 비활동'),
         ('other', '기타'),
     )
     
@@ -544,6 +606,58 @@ class WalkingEvent(models.Model):
         return f"{self.get_event_type_display()} - {self.walking_track.booking.booking_id} ({self.timestamp})"
 
 
+class SafeZone(models.Model):
+    """
+    보호자가 지정한 산책 안전 구역. 예약 또는 반려동물 단위로 지정하며,
+    산책 포인트가 저장될 때 해당 예약의 구역들 중 어디에도 속하지 않으면 이탈로 봅니다. (api.geofence)
+    """
+    ZONE_TYPE_CHOICES = (
+        ('circle', '원형'),
+        ('polygon', '다각형'),
+    )
+    
+    owner = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='safe_zones')
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, null=True, blank=True, related_name='safe_zones')
+    pet = models.ForeignKey(UserPet, on_delete=models.CASCADE, null=True, blank=True, related_name='safe_zones')
+    name = models.CharField(max_length=100)
+    zone_type = models.CharField(max_length=10, choices=ZONE_TYPE_CHOICES)
+    # 원형 구역: 중심 좌표와 반경 (미터 단위)
+    center_latitude = models.FloatField(null=True, blank=True)
+    center_longitude = models.FloatField(null=True, blank=True)
+    radius = models.FloatField(null=True, blank=True)
+    # 다각형 구역: [[위도, 경도], ...] 꼭짓점 목록
+    polygon = models.JSONField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.owner.username}의 안전 구역: {self.name}"
+
+
+class WalkHeatmapCell(models.Model):
+    """
+    완료된 산책 경로를 날짜, 펫시터, 격자 칸별로 모은 집계 (api.walk_heatmap).
+    칸 번호는 위도/경도를 walk_heatmap.CELL_SIZE(0.001도, 약 100m)로 나눈 정수입니다.
+    """
+    date = models.DateField()
+    pet_sitter = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='walk_heatmap_cells')
+    row = models.IntegerField()
+    col = models.IntegerField()
+    point_count = models.PositiveIntegerField(default=0)
+    track_count = models.PositiveIntegerField(default=0)
+    duration = models.FloatField(default=0)  # 칸 안에서 보낸 시간 (초)
+    
+    class Meta:
+        unique_together = ('date', 'pet_sitter', 'row', 'col')
+        indexes = [
+            models.Index(fields=['date', 'row', 'col']),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} ({self.row}, {self.col}) - {self.point_count}"
+
+
 class Review(models.Model):
     booking = models.OneToOneField(Booking, on_delete=models.CASCADE, related_name='review')
     rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
@@ -587,6 +701,8 @@ class CommunityPost(models.Model):
     images = models.ManyToManyField('PostImage', blank=True)
     view_count = models.PositiveIntegerField(default=0)
     like_count = models.PositiveIntegerField(default=0)
+    # 댓글(대댓글 포함) 수: 댓글 생성/삭제 시 F() 갱신 (api.comment_counts), reconcile_comment_counts로 재계산
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
     is_anonymous = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -641,6 +757,7 @@ class Notification(models.Model):
         ('review', '리뷰'),
         ('system', '시스템'),
         ('community', '커뮤니티'),
+        ('safety', '안전'),
     )
     
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='notifications')
@@ -677,6 +794,17 @@ class LegalCode(models.Model):
     def __str__(self):
         return self.name
 
+class ReverseGeocodeCache(models.Model):
+    """네이버 리버스 지오코딩 응답 캐시 (좌표는 약 10m 단위로 반올림)"""
+    key = models.CharField(max_length=32, unique=True, help_text='반올림한 "위도,경도"')
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    response = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.key
+
 class WelloPolicy(models.Model):
     policy_id = models.CharField(max_length=100, unique=True)
     meta_policy_id_idx = models.CharField(max_length=100, blank=True)
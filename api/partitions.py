@@ -0,0 +1,244 @@
+# hyper_pets_backend/api/partitions.py
+"""
+산책 위치 포인트(TrackPoint)와 산책 이벤트(WalkingEvent) 테이블의 월 단위 파티션 관리 (PostgreSQL 전용).
+
+두 테이블은 timestamp 기준 RANGE 파티션 테이블이며, 한 달에 파티션 하나(<테이블>_pYYYYMM)를 사용합니다.
+진행 중인 산책은 최근 파티션만 사용하므로 인덱스와 VACUUM 대상이 전체 기간이 아닌 해당 월 크기로 유지되고,
+보관 기간이 지난 달은 파티션을 분리(DETACH)한 뒤 삭제하거나 보관용 스키마로 옮기는 것만으로 정리됩니다.
+- 파티션 전환은 마이그레이션(0017)에서 한 번 실행되며, 기존 테이블은 복사 없이 첫 파티션(<테이블>_legacy)으로 붙습니다.
+- 앞으로 쓸 파티션 생성과 보관 기간 정리는 manage_track_partitions 명령을 주기적으로 실행해 처리합니다.
+- 범위에 맞는 파티션이 없을 때를 대비해 기본 파티션(<테이블>_default)을 둡니다.
+  기본 파티션에 어떤 달의 행이 들어와 있으면 PostgreSQL은 그 달의 파티션을 만들 수 없으므로,
+  ensure_partitions는 기본 파티션을 잠시 분리(DETACH)해 파티션을 만들고 그 달의 행을 옮긴 뒤 다시 붙입니다.
+  (포인트 시각은 저장 시 산책 시작~서버 시각 범위로 제한되므로 보통은 미리 만든 파티션에 들어갑니다)
+"""
+import re
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils.dateparse import parse_datetime
+
+# (테이블, 파티션 기준 컬럼)
+PARTITIONED_TABLES = (
+    ('api_trackpoint', 'timestamp'),
+    ('api_walkingevent', 'timestamp'),
+)
+
+_BOUND_RE = re.compile(r"TO \('([^']+)'\)")
+
+
+def _q(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+def month_start(value):
+    """value가 속한 달의 첫날 0시 (UTC)"""
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    years, index = divmod(month.month - 1 + count, 12)
+    return month.replace(year=month.year + years, month=index + 1)
+
+
+def _literal(value):
+    return f"'{value:%Y-%m-%d %H:%M:%S}+00'"
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y%m}'
+
+
+def is_partitioned(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = %s AND pg_table_is_visible(c.oid)", [table]
+    )
+    return cursor.fetchone() is not None
+
+
+def list_partitions(cursor, table):
+    """파티션 목록: (이름, 범위 상한 또는 None(기본 파티션))"""
+    cursor.execute(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = %s AND pg_table_is_visible(p.oid) ORDER BY c.relname", [table]
+    )
+    partitions = []
+    for name, bound in cursor.fetchall():
+        match = _BOUND_RE.search(bound)
+        partitions.append((name, parse_datetime(match.group(1)) if match else None))
+    return partitions
+
+
+def _has_rows(cursor, partition, column, lower, upper):
+    cursor.execute(
+        f'SELECT EXISTS (SELECT 1 FROM {_q(partition)} WHERE {_q(column)} >= {_literal(lower)} '
+        f'AND {_q(column)} < {_literal(upper)})'
+    )
+    return cursor.fetchone()[0]
+
+
+def _create_with_default_rows(cursor, table, column, default, create_sql, lower, upper):
+    """
+    기본 파티션을 분리한 상태에서 파티션을 만들고, 기본 파티션에 있던 그 달의 행을 새 파티션으로 옮깁니다.
+    (트랜잭션 안에서 실행하며, 끝날 때까지 테이블 쓰기는 잠금으로 대기합니다) 반환값: 옮긴 행 수
+    """
+    in_range = f'{_q(column)} >= {_literal(lower)} AND {_q(column)} < {_literal(upper)}'
+    cursor.execute(f'ALTER TABLE {_q(table)} DETACH PARTITION {_q(default)}')
+    cursor.execute(create_sql)
+    cursor.execute(f'INSERT INTO {_q(table)} SELECT * FROM {_q(default)} WHERE {in_range}')
+    moved = cursor.rowcount
+    cursor.execute(f'DELETE FROM {_q(default)} WHERE {in_range}')
+    cursor.execute(f'ALTER TABLE {_q(table)} ATTACH PARTITION {_q(default)} DEFAULT')
+    return moved
+
+
+def ensure_partitions(cursor, table, now, months_ahead):
+    """
+    이번 달부터 months_ahead개월 뒤까지 없는 파티션을 만듭니다.
+    반환값: 새로 만든 (파티션 이름, 기본 파티션에서 옮긴 행 수) 목록
+    """
+    column = dict(PARTITIONED_TABLES)[table]
+    existing = list_partitions(cursor, table)
+    names = {name for name, _ in existing}
+    bounds = [upper for _, upper in existing if upper is not None]
+    covered_until = max(bounds) if bounds else None
+    default = next((name for name, upper in existing if upper is None), None)
+
+    created = []
+    current = month_start(now)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(table, month)
+        # legacy 파티션 등 기존 파티션이 이미 덮는 달은 건너뜀
+        if name in names or (covered_until is not None and month < covered_until):
+            continue
+
+        upper = add_months(month, 1)
+        create_sql = (
+            f'CREATE TABLE {_q(name)} PARTITION OF {_q(table)} '
+            f'FOR VALUES FROM ({_literal(month)}) TO ({_literal(upper)})'
+        )
+        moved = 0
+        if default is not None and _has_rows(cursor, default, column, month, upper):
+            moved = _create_with_default_rows(cursor, table, column, default, create_sql, month, upper)
+        else:
+            cursor.execute(create_sql)
+        created.append((name, moved))
+    return created
+
+
+def expired_partitions(cursor, table, cutoff):
+    """범위 상한이 cutoff 이전인 (모든 행이 cutoff보다 오래된) 파티션 이름 목록"""
+    return [name for name, upper in list_partitions(cursor, table) if upper is not None and upper <= cutoff]
+
+
+def has_uncompacted_points(cursor, partition):
+    """파티션에 아직 압축 보관(packed_points)되지 않은 트랙의 포인트가 있는지"""
+    cursor.execute(
+        f'SELECT EXISTS (SELECT 1 FROM {_q(partition)} p JOIN api_walkingtrack t ON t.id = p.walking_track_id '
+        f'WHERE t.packed_points IS NULL)'
+    )
+    return cursor.fetchone()[0]
+
+
+def retire_partition(cursor, table, partition, archive_schema=None):
+    """파티션을 분리한 뒤 삭제하거나, archive_schema가 있으면 그 스키마로 옮겨 보관합니다."""
+    cursor.execute(f'ALTER TABLE {_q(table)} DETACH PARTITION {_q(partition)}')
+    if archive_schema:
+        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {_q(archive_schema)}')
+        cursor.execute(f'ALTER TABLE {_q(partition)} SET SCHEMA {_q(archive_schema)}')
+    else:
+        cursor.execute(f'DROP TABLE {_q(partition)}')
+
+
+def _legacy_name(name):
+    return f'{name[:55]}_legacy'
+
+
+def convert_to_partitioned(cursor, table, column, now):
+    """
+    일반 테이블을 같은 이름의 RANGE 파티션 테이블로 바꿉니다.
+    기존 테이블은 <테이블>_legacy로 이름을 바꿔 (MINVALUE ~ 다음 달 1일) 파티션으로 붙이므로 행을 복사하지 않습니다.
+    인덱스/외래키/기본키 이름은 부모 테이블이 그대로 이어받아 이후 Django 마이그레이션과 맞춥니다.
+    파티션 테이블의 기본키는 파티션 기준 컬럼을 포함해야 하므로 (id, column)이 되며, id는 시퀀스로 계속 발급됩니다.
+    기존 테이블의 기본키 인덱스를 (id, column)으로 새로 만들고 범위 검증으로 한 번 더 읽으므로
+    소요 시간은 행 수에 비례하며, 호출한 트랜잭션이 끝날 때까지 테이블에 ACCESS EXCLUSIVE 잠금이 유지됩니다.
+    """
+    legacy = f'{table}_legacy'
+    bound = add_months(month_start(now), 1)
+
+    cursor.execute(f'ALTER TABLE {_q(table)} RENAME TO {_q(legacy)}')
+
+    cursor.execute(
+        "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = %s::regclass AND NOT x.indisprimary AND NOT x.indisunique", [legacy]
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f'", [legacy]
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [legacy])
+    primary_key = cursor.fetchone()[0]
+
+    # 부모 테이블이 원래 이름을 쓰도록 기존 테이블 쪽 이름을 바꿈
+    for name, _ in indexes:
+        cursor.execute(f'ALTER INDEX {_q(name)} RENAME TO {_q(_legacy_name(name))}')
+    for name in [name for name, _ in foreign_keys] + [primary_key]:
+        cursor.execute(f'ALTER TABLE {_q(legacy)} RENAME CONSTRAINT {_q(name)} TO {_q(_legacy_name(name))}')
+
+    # 붙일 테이블의 기본키가 부모와 같은 (id, column)이어야 ATTACH 시 부모 기본키에 연결됨 (기존 행으로 인덱스를 새로 만듦)
+    cursor.execute(
+        f'ALTER TABLE {_q(legacy)} DROP CONSTRAINT {_q(_legacy_name(primary_key))}, '
+        f'ADD CONSTRAINT {_q(_legacy_name(primary_key))} PRIMARY KEY (id, {_q(column)})'
+    )
+
+    # id 발급: 기존 identity/serial 시퀀스를 떼어내고 부모 테이블 소유의 새 시퀀스로 이어서 발급
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [legacy])
+    sequence = cursor.fetchone()[0]
+    cursor.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {_q(legacy)}')
+    start = cursor.fetchone()[0]
+    if sequence:
+        cursor.execute(f'SELECT last_value + 1 FROM {sequence}')
+        start = max(start, cursor.fetchone()[0])
+    cursor.execute("SELECT attidentity FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'id'", [legacy])
+    if cursor.fetchone()[0]:
+        cursor.execute(f'ALTER TABLE {_q(legacy)} ALTER COLUMN id DROP IDENTITY')
+    else:
+        cursor.execute(f'ALTER TABLE {_q(legacy)} ALTER COLUMN id DROP DEFAULT')
+        if sequence:
+            cursor.execute(f'DROP SEQUENCE {sequence}')
+
+    sequence = f'{table}_id_seq'
+    cursor.execute(f'CREATE SEQUENCE {_q(sequence)} START WITH {int(start)}')
+    cursor.execute(
+        f'CREATE TABLE {_q(table)} (LIKE {_q(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) '
+        f'PARTITION BY RANGE ({_q(column)})'
+    )
+    cursor.execute(f"ALTER TABLE {_q(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+    cursor.execute(f'ALTER SEQUENCE {_q(sequence)} OWNED BY {_q(table)}.id')
+    cursor.execute(f'ALTER TABLE {_q(table)} ADD CONSTRAINT {_q(primary_key)} PRIMARY KEY (id, {_q(column)})')
+
+    # 파티션이 없는 부모 테이블에 만드는 인덱스/외래키는 즉시 끝나고,
+    # 기존 테이블을 붙일 때 같은 정의의 인덱스/외래키가 그대로 연결되어 다시 만들거나 검사하지 않음
+    for _, definition in indexes:
+        cursor.execute(re.sub(r' ON (ONLY )?\S+ USING ', f' ON {_q(table)} USING ', definition, count=1))
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {_q(table)} ADD CONSTRAINT {_q(name)} {definition}')
+
+    # 범위 검사 제약조건을 먼저 검증해 두면 ATTACH 시 PostgreSQL이 같은 범위 검사를 위해 테이블을 다시 읽지 않음
+    check = _legacy_name(f'{table}_bound')
+    cursor.execute(
+        f'ALTER TABLE {_q(legacy)} ADD CONSTRAINT {_q(check)} '
+        f'CHECK ({_q(column)} IS NOT NULL AND {_q(column)} < {_literal(bound)}) NOT VALID'
+    )
+    cursor.execute(f'ALTER TABLE {_q(legacy)} VALIDATE CONSTRAINT {_q(check)}')
+    cursor.execute(
+        f'ALTER TABLE {_q(table)} ATTACH PARTITION {_q(legacy)} FOR VALUES FROM (MINVALUE) TO ({_literal(bound)})'
+    )
+    cursor.execute(f'ALTER TABLE {_q(legacy)} DROP CONSTRAINT {_q(check)}')
+
+    cursor.execute(f'CREATE TABLE {_q(f"{table}_default")} PARTITION OF {_q(table)} DEFAULT')
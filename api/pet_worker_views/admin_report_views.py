@@ -6,6 +6,7 @@ from django.db.models import Count, Sum, F, Avg
 from django.db.models.functions import TruncMonth, TruncWeek, TruncDay
 from django.utils import timezone
 from datetime import datetime, timedelta
+from .. import walk_heatmap
 from ..models import Booking, CustomUser, Payment, PetSitterService, UserPet, PetType, ServiceType
 
 class AdminReportBaseView(APIView):
@@ -294,3 +295,37 @@ class SummaryStatsView(AdminReportBaseView):
         
         change = ((current - previous) / previous) * 100
         return round(change)
+
+
+def parse_heatmap_bbox(params):
+    """startX/startY/endX/endY(경도/위도) 파라미터를 (min_lat, min_lng, max_lat, max_lng)로 변환합니다."""
+    if not all(param in params for param in ['startX', 'startY', 'endX', 'endY']):
+        raise ValueError('startX, startY, endX, endY 파라미터는 필수 항목입니다.')
+    start_x, start_y = float(params['startX']), float(params['startY'])
+    end_x, end_y = float(params['endX']), float(params['endY'])
+    return (min(start_y, end_y), min(start_x, end_x), max(start_y, end_y), max(start_x, end_x))
+
+
+class WalkHeatmapView(AdminReportBaseView):
+    """
+    산책 히트맵: 지도 영역(startX/startY/endX/endY)과 기간(period, startDate, endDate)의 격자 칸별 산책 포인트 수.
+    pet_sitter 파라미터로 특정 펫시터만 볼 수 있습니다. 완료 시점에 집계된 WalkHeatmapCell만 읽습니다.
+    """
+    def get(self, request):
+        period = request.query_params.get('period', 'this-month')
+        start_date, end_date = self.get_date_range(
+            period, request.query_params.get('startDate'), request.query_params.get('endDate')
+        )
+        
+        try:
+            bbox = parse_heatmap_bbox(request.query_params)
+            pet_sitter_id = request.query_params.get('pet_sitter')
+            pet_sitter_id = int(pet_sitter_id) if pet_sitter_id else None
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'start_date': start_date,
+            'end_date': end_date,
+            **walk_heatmap.query(bbox, start_date, end_date, pet_sitter_id)
+        })
@@ -12,6 +12,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from ..models import (CustomUser, PetOwnerProfile, PetSitterProfile, UserPet, 
                      PetSitterService, ServiceType, PetType, Review)
 from ..serializers import PetSitterProfileSerializer
+from .. import geo, sitter_coverage
 
 
 class AIPetSitterMatchingView(views.APIView):
@@ -59,19 +60,11 @@ class AIPetSitterMatchingView(views.APIView):
             available_pet_types__id__in=pet_types
         ).distinct()
         
-        # 위치 기반 필터링 (반경 5km 이내)
+        # 위치 기반 필터링 (요청 위치를 서비스 지역으로 하는 펫시터만)
+        distances = {}
         if lat and lng:
-            radius = 5  # 5km 반경
-            lat_km = 111.0
-            lng_km = lat_km * abs(math.cos(math.radians(lat)))
-            
-            lat_range = radius / lat_km
-            lng_range = radius / lng_km
-            
-            pet_sitters = pet_sitters.filter(
-                user__latitude__range=(lat - lat_range, lat + lat_range),
-                user__longitude__range=(lng - lng_range, lng + lng_range)
-            )
+            distances = dict(sitter_coverage.sitters_serving(lat, lng))
+            pet_sitters = pet_sitters.filter(id__in=list(distances))
         
         # 점수 계산을 위한 어노테이션 추가
         pet_sitters = pet_sitters.annotate(
@@ -136,9 +129,7 @@ class AIPetSitterMatchingView(views.APIView):
                 pet_sitters,
                 key=lambda x: (
                     # 거리 가중치 (가까울수록 점수 높음)
-                    x.total_score - (
-                        ((x.user.latitude - lat) ** 2 + (x.user.longitude - lng) ** 2) ** 0.5 * 2
-                    )
+                    x.total_score - distances[x.id] / geo.METERS_PER_DEGREE * 2
                 ),
                 reverse=True
             )
@@ -12,13 +12,21 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from ..models import (Booking, Payment, WalkingTrack, TrackPoint, WalkingEvent, 
                      UserPet, PetSitterService, Notification)
+from ..query_plans import BOOKING_PLAN, QueryPlan, QueryPlanMixin, SparseFieldsMixin
 from ..serializers import (BookingSerializer, PaymentSerializer, WalkingTrackSerializer,
-                          TrackPointSerializer, WalkingEventSerializer)
+                          TrackPointSerializer, WalkingEventSerializer,
+                          BookingListSerializer, PaymentListSerializer)
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(SparseFieldsMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
+    list_serializer_class = BookingListSerializer
+    query_plan = QueryPlan(select_related=('pet_owner', 'pet_sitter', 'service__service_type'), prefetch_related=('pets',))
+    expand_plans = {
+        'service': QueryPlan(select_related=('service__pet_sitter',)),
+        'pets': QueryPlan(prefetch_related=('pets__owner', 'pets__pet_type')),
+    }
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'service', 'pet_sitter', 'pet_owner']
@@ -165,9 +173,12 @@ class BookingViewSet(viewsets.ModelViewSet):
         return Response({'status': '예약이 완료되었습니다.'})
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(SparseFieldsMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
+    list_serializer_class = PaymentListSerializer
+    query_plan = QueryPlan(select_related=('booking',))
+    expand_plans = {'booking': BOOKING_PLAN.under('booking')}
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['status', 'payment_method', 'booking']
@@ -8,14 +8,20 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
 
+from .. import comment_tree, view_counter
 from ..models import (Review, Message, CommunityPost, PostImage, Comment, PostLike, Notification)
+from ..query_plans import BOOKING_PLAN, QueryPlan, QueryPlanMixin, SparseFieldsMixin
 from ..serializers import (ReviewSerializer, MessageSerializer, CommunityPostSerializer,
-                          PostImageSerializer, CommentSerializer, PostLikeSerializer)
+                          PostImageSerializer, CommentSerializer, PostLikeSerializer, CommentTreeSerializer,
+                          ReviewListSerializer, MessageListSerializer)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(SparseFieldsMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    list_serializer_class = ReviewListSerializer
+    query_plan = QueryPlan(select_related=('booking__pet_owner', 'booking__pet_sitter'))
+    expand_plans = {'booking': BOOKING_PLAN.under('booking')}
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['booking__pet_sitter', 'booking__pet_owner', 'rating']
@@ -83,9 +89,12 @@ class ReviewViewSet(viewsets.ModelViewSet):
         )
 
 
-class MessageViewSet(viewsets.ModelViewSet):
+class MessageViewSet(SparseFieldsMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Message.objects.all()
     serializer_class = MessageSerializer
+    list_serializer_class = MessageListSerializer
+    query_plan = QueryPlan(select_related=('sender', 'receiver'))
+    expand_plans = {'booking': BOOKING_PLAN.under('booking')}
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['sender', 'receiver', 'booking', 'is_read']
@@ -167,8 +176,9 @@ class MessageViewSet(viewsets.ModelViewSet):
         return Response({'status': f'{messages.count()}개의 메시지를 읽음으로 표시했습니다.'})
 
 
-class CommunityPostViewSet(viewsets.ModelViewSet):
-    queryset = CommunityPost.objects.all()
+class CommunityPostViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
+    # 피드 한 페이지를 게시글 수와 무관한 쿼리 수로 조회 (댓글 수는 comment_count 컬럼)
+    queryset = CommunityPost.objects.select_related('author').prefetch_related('images')
     serializer_class = CommunityPostSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -210,16 +220,27 @@ class CommunityPostViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         
-        # 조회수 증가
-        instance.view_count = F('view_count') + 1
-        instance.save()
-        instance.refresh_from_db()
+        # 조회수 증가 (버퍼에 쌓아 두었다가 주기적으로 한 번에 반영)
+        view_counter.post_views.record(instance.pk)
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
+    
+    @action(detail=True, methods=['GET'])
+    def comments(self, request, pk=None):
+        """게시글의 댓글 트리 (최상위 댓글 단위로 페이지 나눔, 각 댓글의 replies에 대댓글)"""
+        post = get_object_or_404(CommunityPost.objects.only('id'), pk=pk)
+        
+        nodes = CommentTreeSerializer(comment_tree.post_comments(post.id), many=True).data
+        roots = comment_tree.build_tree(nodes)
+        
+        page = self.paginate_queryset(roots)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(roots)
 
 
-class PostImageViewSet(viewsets.ModelViewSet):
+class PostImageViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = PostImage.objects.all()
     serializer_class = PostImageSerializer
     permission_classes = [IsAuthenticated]
@@ -246,12 +267,12 @@ class PostImageViewSet(viewsets.ModelViewSet):
         serializer.save(post=post)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['post', 'author', 'parent']
+    filterset_fields = ['post', 'author', 'parent_comment']
     ordering_fields = ['created_at']
     
     def get_queryset(self):
@@ -264,7 +285,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         
         # 최상위 댓글만 필터링 (대댓글 제외)
         if self.request.query_params.get('top_level', False):
-            queryset = queryset.filter(parent__isnull=True)
+            queryset = queryset.filter(parent_comment__isnull=True)
         
         return queryset
     
@@ -277,12 +298,12 @@ class CommentViewSet(viewsets.ModelViewSet):
         parent_id = self.request.data.get('parent', None)
         parent = None
         if parent_id:
-            parent = get_object_or_404(Comment, id=parent_id)
+            parent = get_object_or_404(Comment, id=parent_id, post=post)
         
         comment = serializer.save(
             post=post,
             author=self.request.user,
-            parent=parent,
+            parent_comment=parent,
             created_at=timezone.now()
         )
         
@@ -307,7 +328,7 @@ class CommentViewSet(viewsets.ModelViewSet):
                 )
 
 
-class PostLikeViewSet(viewsets.ModelViewSet):
+class PostLikeViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = PostLike.objects.all()
     serializer_class = PostLikeSerializer
     permission_classes = [IsAuthenticated]
@@ -340,7 +361,7 @@ class PostLikeViewSet(viewsets.ModelViewSet):
         
         # 게시글 좋아요 수 증가
         post.like_count = F('like_count') + 1
-        post.save()
+        post.save(update_fields=['like_count'])
         
         # 알림 생성 (게시글 작성자에게)
         if post.author != request.user:
@@ -363,6 +384,6 @@ class PostLikeViewSet(viewsets.ModelViewSet):
         
         # 게시글 좋아요 수 감소
         post.like_count = F('like_count') - 1
-        post.save()
+        post.save(update_fields=['like_count'])
         
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,155 @@
+# hyper_pets_backend/api/pet_worker_views/live_views.py
+"""
+진행 중인 산책의 실시간 중계 (Server-Sent Events).
+
+GET /api/pet-worker/walking-tracks/<id>/live/?token=<access token>
+- 브라우저 EventSource는 헤더를 보낼 수 없으므로 JWT access 토큰을 token 쿼리 파라미터로도 받습니다.
+- 연결 직후 snapshot(현재 통계와 마지막 위치)을 보내고, 이후 새로 저장된 포인트(points), 산책 이벤트(event),
+  상태 변경(status)을 변경분만 보냅니다. 산책이 완료되면 status를 보낸 뒤 연결을 닫습니다.
+- points 메시지의 id는 마지막 포인트 시각(epoch ms)입니다. 재연결 시 EventSource가 Last-Event-ID로 보내거나
+  ?since=<epoch ms>를 주면 그 이후 포인트를 먼저 보내 빠진 구간을 채웁니다.
+
+연결을 유지한 채 기다리는 비동기 뷰이므로 ASGI 서버(uvicorn hyper_pets_backend.production.asgi:application)로
+실행해야 합니다. (WSGI에서는 스트림 전체를 모은 뒤에 응답하므로 중계되지 않음)
+워커가 여러 개이면 포인트를 저장한 워커와 연결을 가진 워커가 다를 수 있으므로 LIVE_BACKEND로 RedisBackend를 사용합니다.
+DRF 뷰는 비동기를 지원하지 않아 일반 Django 뷰로 작성했습니다.
+"""
+import asyncio
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .. import live
+from ..models import WalkingTrack, TrackPoint
+
+CATCH_UP_CHUNK_SIZE = 500
+RECONNECT_DELAY_MS = 3000
+
+
+def _sse(event, data, event_id=None):
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data, ensure_ascii=False, separators=(",", ":"))}')
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+async def _authenticate(request):
+    """?token= 또는 Authorization 헤더의 JWT로 사용자를 확인합니다. 실패하면 None"""
+    authenticator = JWTAuthentication()
+    raw_token = request.GET.get('token')
+    try:
+        if raw_token:
+            validated = authenticator.get_validated_token(raw_token)
+            return await sync_to_async(authenticator.get_user)(validated)
+        result = await sync_to_async(authenticator.authenticate)(request)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+def _parse_since(request):
+    value = request.headers.get('Last-Event-ID') or request.GET.get('since')
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _snapshot(track):
+    last_point = None
+    if track.last_point_at is not None:
+        last_point = [live.epoch_ms(track.last_point_at), track.last_latitude, track.last_longitude]
+    return {
+        'track_id': track.id,
+        **live.status_delta(track),
+        'point_count': track.point_count,
+        'total_distance': track.total_distance,
+        'last_point': last_point,
+    }
+
+
+async def _event_stream(track_id, since):
+    heartbeat = getattr(settings, 'LIVE_HEARTBEAT_SECONDS', 15)
+    max_seconds = getattr(settings, 'LIVE_STREAM_MAX_SECONDS', 60 * 60)
+
+    # 구독을 먼저 시작한 뒤 현재 상태를 읽어야 그 사이에 저장된 포인트를 놓치지 않음 (중복은 sent_until로 거름)
+    subscription = live.get_backend().subscribe(live.track_channel(track_id))
+    try:
+        await subscription.ready()
+        yield f'retry: {RECONNECT_DELAY_MS}\n\n'.encode()
+
+        track = await WalkingTrack.objects.defer('packed_points').aget(pk=track_id)
+        yield _sse('snapshot', _snapshot(track))
+        if track.status == 'completed':
+            return
+
+        sent_until = since
+        if since is not None:
+            # 재연결: 마지막으로 받은 포인트 이후에 저장된 포인트를 먼저 보냄
+            after = datetime.fromtimestamp(since / 1000.0, tz=dt_timezone.utc)
+            chunk = []
+            async for point in TrackPoint.objects.filter(walking_track_id=track_id, timestamp__gt=after).order_by(
+                    'timestamp', 'id').values_list('timestamp', 'latitude', 'longitude'):
+                chunk.append(point)
+                if len(chunk) >= CATCH_UP_CHUNK_SIZE:
+                    sent_until = live.epoch_ms(chunk[-1][0])
+                    yield _sse('points', live.points_delta(chunk), sent_until)
+                    chunk = []
+            if chunk:
+                sent_until = live.epoch_ms(chunk[-1][0])
+                yield _sse('points', live.points_delta(chunk), sent_until)
+        elif track.last_point_at is not None:
+            sent_until = live.epoch_ms(track.last_point_at)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_seconds
+        while loop.time() < deadline:
+            message = await subscription.get(heartbeat)
+            if message is None:
+                yield b': ping\n\n'
+                continue
+
+            event, data = message['event'], message['data']
+            if event == 'points':
+                points = [point for point in data['points'] if sent_until is None or point[0] > sent_until]
+                if points:
+                    sent_until = points[-1][0]
+                    yield _sse('points', {**data, 'points': points}, sent_until)
+            else:
+                yield _sse(event, data)
+                if event == 'status' and data['status'] == 'completed':
+                    return
+
+            if subscription.overflowed and subscription.queue.empty():
+                # 전달이 밀려 메시지를 버린 경우: 재연결(Last-Event-ID)로 빠진 구간을 다시 받도록 함
+                yield _sse('reset', {'reason': 'overflow'})
+                return
+    finally:
+        subscription.close()
+
+
+async def walking_track_live(request, pk):
+    """산책 트랙의 실시간 위치/이벤트 스트림 (예약의 보호자, 펫시터, 관리자만)"""
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({'error': '인증이 필요합니다.'}, status=401)
+
+    track = await WalkingTrack.objects.select_related('booking').defer('packed_points').filter(pk=pk).afirst()
+    if track is None:
+        return JsonResponse({'error': '트랙을 찾을 수 없습니다.'}, status=404)
+    if not (user.is_staff or user.id in (track.booking.pet_owner_id, track.booking.pet_sitter_id)):
+        return JsonResponse({'error': '권한이 없습니다.'}, status=403)
+
+    response = StreamingHttpResponse(_event_stream(track.id, _parse_since(request)), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx 프록시 버퍼링 비활성화
+    return response
@@ -6,11 +6,12 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 
 from ..models import (PetType, ServiceType, UserPet, PetSitterService, PetSitterAvailability)
+from ..query_plans import SparseFieldsMixin
 from ..serializers import (PetTypeSerializer, ServiceTypeSerializer, UserPetSerializer, 
                           PetSitterServiceSerializer, PetSitterAvailabilitySerializer)
 
 
-class PetTypeViewSet(viewsets.ModelViewSet):
+class PetTypeViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = PetType.objects.all()
     serializer_class = PetTypeSerializer
     filter_backends = [filters.SearchFilter]
@@ -26,7 +27,7 @@ class PetTypeViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
 
-class ServiceTypeViewSet(viewsets.ModelViewSet):
+class ServiceTypeViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = ServiceType.objects.all()
     serializer_class = ServiceTypeSerializer
     filter_backends = [filters.SearchFilter]
@@ -42,7 +43,7 @@ class ServiceTypeViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
 
-class UserPetViewSet(viewsets.ModelViewSet):
+class UserPetViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = UserPet.objects.all()
     serializer_class = UserPetSerializer
     permission_classes = [IsAuthenticated]
@@ -60,7 +61,7 @@ class UserPetViewSet(viewsets.ModelViewSet):
         serializer.save(owner=self.request.user)
 
 
-class PetSitterServiceViewSet(viewsets.ModelViewSet):
+class PetSitterServiceViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = PetSitterService.objects.all()
     serializer_class = PetSitterServiceSerializer
     
@@ -113,7 +114,7 @@ class PetSitterServiceViewSet(viewsets.ModelViewSet):
         serializer.save(pet_sitter=self.request.user)
 
 
-class PetSitterAvailabilityViewSet(viewsets.ModelViewSet):
+class PetSitterAvailabilityViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = PetSitterAvailability.objects.all()
     serializer_class = PetSitterAvailabilitySerializer
     permission_classes = [IsAuthenticated]
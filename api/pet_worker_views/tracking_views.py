@@ -5,16 +5,30 @@ from django.utils import timezone
 from rest_framework import viewsets, status, filters
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 
-from ..models import (Booking, WalkingTrack, TrackPoint, WalkingEvent, Notification)
-from ..serializers import (WalkingTrackSerializer, TrackPointSerializer, WalkingEventSerializer)
+from .. import geofence, inactivity, track_geometry, track_ingest, track_storage, walk_heatmap
+from .admin_report_views import AdminReportBaseView, parse_heatmap_bbox
+from ..models import (Booking, WalkingTrack, TrackPoint, WalkingEvent, Notification, SafeZone)
+from ..query_plans import BOOKING_PLAN, QueryPlan, QueryPlanMixin, SparseFieldsMixin
+from ..serializers import (WalkingTrackSerializer, TrackPointSerializer, WalkingEventSerializer,
+                           SafeZoneSerializer, WalkingTrackListSerializer)
 
 
-class WalkingTrackViewSet(viewsets.ModelViewSet):
-    queryset = WalkingTrack.objects.all()
+class WalkingTrackViewSet(SparseFieldsMixin, QueryPlanMixin, viewsets.ModelViewSet):
+    # 압축 보관된 포인트는 경로 조회 시에만 읽음
+    queryset = WalkingTrack.objects.defer('packed_points')
     serializer_class = WalkingTrackSerializer
+    list_serializer_class = WalkingTrackListSerializer
+    query_plan = QueryPlan(select_related=('booking',))
+    expand_plans = {
+        'booking': BOOKING_PLAN.under('booking'),
+        'track_points': QueryPlan(prefetch_related=('track_points',)),
+        'events': QueryPlan(prefetch_related=('events',)),
+    }
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['booking', 'status']
@@ -59,14 +73,15 @@ class WalkingTrackViewSet(viewsets.ModelViewSet):
         # 알림 생성 (펫 주인에게)
         Notification.objects.create(
             user=booking.pet_owner,
-            type='track_started',
+            type='booking',
+            title='산책 시작',
             content='산책이 시작되었습니다. 실시간으로 위치를 확인할 수 있습니다.',
-            related_id=track.id
+            related_booking=booking
         )
         
         # 이벤트 생성 (산책 시작)
         WalkingEvent.objects.create(
-            track=track,
+            walking_track=track,
             event_type='start',
             timestamp=timezone.now(),
             description='산책이 시작되었습니다.',
@@ -87,21 +102,23 @@ class WalkingTrackViewSet(viewsets.ModelViewSet):
             return Response({'error': '진행 중인 트랙만 완료할 수 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
         
         # 트랙 완료 처리
+        # 포인트 저장(track_ingest)이 갱신하는 통계/필터 상태를 덮어쓰지 않도록 바뀐 필드만 저장
         track.status = 'completed'
         track.end_time = timezone.now()
-        track.save()
+        track.save(update_fields=['status', 'end_time', 'updated_at'])
         
         # 알림 생성 (펫 주인에게)
         Notification.objects.create(
             user=track.booking.pet_owner,
-            type='track_completed',
+            type='booking',
+            title='산책 완료',
             content='산책이 완료되었습니다.',
-            related_id=track.id
+            related_booking=track.booking
         )
         
         # 이벤트 생성 (산책 종료)
         WalkingEvent.objects.create(
-            track=track,
+            walking_track=track,
             event_type='end',
             timestamp=timezone.now(),
             description='산책이 완료되었습니다.',
@@ -125,11 +142,11 @@ class WalkingTrackViewSet(viewsets.ModelViewSet):
         
         # 트랙 일시정지 처리
         track.status = 'paused'
-        track.save()
+        track.save(update_fields=['status', 'updated_at'])
         
         # 이벤트 생성 (산책 일시정지)
         WalkingEvent.objects.create(
-            track=track,
+            walking_track=track,
             event_type='pause',
             timestamp=timezone.now(),
             description='산책이 일시정지되었습니다.',
@@ -153,11 +170,11 @@ class WalkingTrackViewSet(viewsets.ModelViewSet):
         
         # 트랙 재개 처리
         track.status = 'in_progress'
-        track.save()
+        track.save(update_fields=['status', 'updated_at'])
         
         # 이벤트 생성 (산책 재개)
         WalkingEvent.objects.create(
-            track=track,
+            walking_track=track,
             event_type='resume',
             timestamp=timezone.now(),
             description='산책이 재개되었습니다.',
@@ -167,34 +184,59 @@ class WalkingTrackViewSet(viewsets.ModelViewSet):
         
         return Response({'status': '산책이 재개되었습니다.'})
     
+    @action(detail=True, methods=['POST'], url_path='points:batch')
+    def points_batch(self, request, pk=None):
+        """
+        여러 개의 위치 포인트를 한 번에 저장합니다.
+        요청: {"points": [{"latitude", "longitude", "timestamp"(ISO 8601 또는 epoch ms), "accuracy"(m, 선택)}, ...]}
+        dropped는 GPS 필터(정확도/속도/제자리 흔들림)로 저장하지 않은 포인트 수입니다.
+        """
+        track = self.get_object()
+        
+        # 펫시터만 트랙 포인트 추가 가능
+        if request.user.id != track.booking.pet_sitter_id:
+            return Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+        
+        # 진행 중인 트랙만 포인트 추가 가능
+        if track.status != 'in_progress':
+            return Response({'error': '진행 중인 트랙에만 포인트를 추가할 수 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            points = track_ingest.parse_points(request.data.get('points'), start_time=track.start_time)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = track_ingest.ingest_points(track, points)
+        
+        return Response({
+            'accepted': result.accepted,
+            'dropped': result.dropped,
+            'duplicates': len(points) - result.accepted - result.dropped,
+            'high_water_timestamp': result.high_water
+        }, status=status.HTTP_201_CREATED)
+    
     @action(detail=True, methods=['GET'])
-    def statistics(self, request, pk=None):
+    def geometry(self, request, pk=None):
+        """
+        산책 경로 다시보기용 경로 (줌 레벨에 맞춰 단순화한 구글 폴리라인).
+        ?zoom=16 (기본값). time_offsets는 남은 각 포인트의 시작 시각 기준 경과 시간(초)입니다.
+        """
         track = self.get_object()
         
-        # 트랙 포인트 가져오기
-        track_points = TrackPoint.objects.filter(track=track).order_by('timestamp')
-        
-        # 통계 계산
-        total_distance = 0
-        if track_points.count() >= 2:
-            for i in range(1, track_points.count()):
-                prev_point = track_points[i-1]
-                curr_point = track_points[i]
-                
-                # 두 지점 간의 거리 계산 (하버사인 공식)
-                lat1, lon1 = prev_point.latitude, prev_point.longitude
-                lat2, lon2 = curr_point.latitude, curr_point.longitude
-                
-                R = 6371  # 지구 반경 (km)
-                dLat = math.radians(lat2 - lat1)
-                dLon = math.radians(lon2 - lon1)
-                a = (math.sin(dLat/2) * math.sin(dLat/2) +
-                     math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-                     math.sin(dLon/2) * math.sin(dLon/2))
-                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-                distance = R * c * 1000  # 미터 단위로 변환
-                
-                total_distance += distance
+        try:
+            zoom = int(request.query_params.get('zoom', track_geometry.DEFAULT_ZOOM))
+        except ValueError:
+            return Response({'error': 'zoom은 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= zoom <= track_geometry.MAX_ZOOM:
+            return Response({'error': f'zoom은 0~{track_geometry.MAX_ZOOM} 사이여야 합니다.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({'track_id': track.id, 'status': track.status, **track_geometry.get_geometry(track, zoom)})
+    
+    @action(detail=True, methods=['GET'])
+    def statistics(self, request, pk=None):
+        # 거리/포인트 수 등은 포인트 저장 시 누적된 값을 그대로 사용
+        track = self.get_object()
         
         # 소요 시간 계산
         duration = 0
@@ -204,29 +246,37 @@ class WalkingTrackViewSet(viewsets.ModelViewSet):
             duration = (timezone.now() - track.start_time).total_seconds() / 60  # 분 단위
         
         # 이벤트 가져오기
-        events = WalkingEvent.objects.filter(track=track).order_by('timestamp')
+        events = list(track.events.order_by('timestamp'))
         
         return Response({
             'track_id': track.id,
-            'booking_id': track.booking.id,
+            'booking_id': track.booking_id,
             'status': track.status,
             'start_time': track.start_time,
             'end_time': track.end_time,
-            'total_distance': round(total_distance, 2),  # 미터
+            'total_distance': round(track.total_distance, 2),  # 미터
             'duration': round(duration, 2),  # 분
-            'average_speed': round(total_distance / (duration * 60), 2) if duration > 0 else 0,  # 미터/초
-            'points_count': track_points.count(),
-            'events_count': events.count(),
+            'average_speed': round(track.total_distance / (duration * 60), 2) if duration > 0 else 0,  # 미터/초
+            'moving_time': round(track.moving_time / 60, 2),  # 분
+            'max_speed': round(track.max_speed, 2),  # 미터/초
+            'last_point': {
+                'latitude': track.last_latitude,
+                'longitude': track.last_longitude,
+                'timestamp': track.last_point_at
+            } if track.last_point_at else None,
+            'points_count': track.point_count,
+            'dropped_points_count': track.dropped_point_count,
+            'events_count': len(events),
             'events': WalkingEventSerializer(events, many=True).data
         })
 
 
-class TrackPointViewSet(viewsets.ModelViewSet):
+class TrackPointViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = TrackPoint.objects.all()
     serializer_class = TrackPointSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['track']
+    filterset_fields = ['walking_track']
     ordering_fields = ['timestamp']
     
     def get_queryset(self):
@@ -235,38 +285,79 @@ class TrackPointViewSet(viewsets.ModelViewSet):
         
         # 사용자 타입에 따른 필터링
         if user.user_type == 'pet_owner':
-            queryset = queryset.filter(track__booking__pet_owner=user)
+            queryset = queryset.filter(walking_track__booking__pet_owner=user)
         elif user.user_type == 'pet_sitter':
-            queryset = queryset.filter(track__booking__pet_sitter=user)
+            queryset = queryset.filter(walking_track__booking__pet_sitter=user)
         
         # 트랙 ID로 필터링
         track_id = self.request.query_params.get('track', None)
         if track_id:
-            queryset = queryset.filter(track_id=track_id)
+            queryset = queryset.filter(walking_track_id=track_id)
         
         return queryset
     
-    def perform_create(self, serializer):
+    def list(self, request, *args, **kwargs):
+        # 압축 보관된 트랙은 TrackPoint 행이 없으므로 압축을 풀어 같은 형식으로 반환
+        track = self.get_packed_track()
+        if track is None:
+            return super().list(request, *args, **kwargs)
+        
+        points = track_storage.point_rows(track)
+        if request.query_params.get('ordering') == '-timestamp':
+            points.reverse()
+        page = self.paginate_queryset(points)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(points, many=True).data)
+    
+    def get_packed_track(self):
+        """?walking_track= 또는 ?track=으로 지정한 트랙이 압축 보관된 트랙이면 반환"""
+        track_id = self.request.query_params.get('walking_track') or self.request.query_params.get('track')
+        if not track_id or not str(track_id).isdigit():
+            return None
+        
+        user = self.request.user
+        tracks = WalkingTrack.objects.filter(pk=track_id, packed_points__isnull=False)
+        if user.user_type == 'pet_owner':
+            tracks = tracks.filter(booking__pet_owner=user)
+        elif user.user_type == 'pet_sitter':
+            tracks = tracks.filter(booking__pet_sitter=user)
+        return tracks.first()
+    
+    def create(self, request, *args, **kwargs):
         # 트랙 정보 가져오기
-        track_id = self.request.data.get('track')
-        track = get_object_or_404(WalkingTrack, id=track_id)
+        track_id = request.data.get('walking_track', request.data.get('track'))
+        track = get_object_or_404(WalkingTrack.objects.select_related('booking'), id=track_id)
         
         # 펫시터만 트랙 포인트 추가 가능
-        if self.request.user != track.booking.pet_sitter:
-            return Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+        if request.user.id != track.booking.pet_sitter_id:
+            raise PermissionDenied('권한이 없습니다.')
         
         # 진행 중인 트랙만 포인트 추가 가능
         if track.status != 'in_progress':
-            return Response({'error': '진행 중인 트랙에만 포인트를 추가할 수 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # 트랙 포인트 생성
-        serializer.save(
-            track=track,
-            timestamp=timezone.now()
-        )
+            raise ValidationError({'error': '진행 중인 트랙에만 포인트를 추가할 수 있습니다.'})
+        
+        # 시각이 없으면 서버 시각 사용, 일괄 저장과 같은 경로로 저장
+        point = dict(request.data.items())
+        point.setdefault('timestamp', timezone.now().isoformat())
+        try:
+            points = track_ingest.parse_points([point], start_time=track.start_time)
+        except ValueError as e:
+            raise ValidationError({'error': str(e)})
+        
+        result = track_ingest.ingest_points(track, points)
+        if result.dropped:
+            # GPS 필터로 걸러진 포인트 (정상 처리이므로 오류로 보지 않음)
+            return Response({'status': 'GPS 필터로 저장되지 않은 포인트입니다.', 'high_water_timestamp': result.high_water})
+        if not result.accepted:
+            return Response({'error': '이미 저장된 포인트보다 이전 시각입니다.', 'high_water_timestamp': result.high_water},
+                            status=status.HTTP_409_CONFLICT)
+        
+        track_point = track.track_points.filter(timestamp=result.high_water).latest('id')
+        return Response(self.get_serializer(track_point).data, status=status.HTTP_201_CREATED)
 
 
-class WalkingEventViewSet(viewsets.ModelViewSet):
+class WalkingEventViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = WalkingEvent.objects.all()
     serializer_class = WalkingEventSerializer
     permission_classes = [IsAuthenticated]
@@ -389,37 +480,27 @@ class SafetyAlertViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['POST'])
     def safe_zone_alert(self, request):
-        # 안전 구역 이탈 알림
+        # 안전 구역 이탈 수동 알림 (포인트 저장 시 서버에서 자동으로 판정하며, 이 API는 펫시터가 직접 알릴 때 사용)
         track_id = request.data.get('track')
-        latitude = request.data.get('latitude', 0)
-        longitude = request.data.get('longitude', 0)
         
         if not track_id:
             return Response({'error': '트랙 정보는 필수 항목입니다.'}, status=status.HTTP_400_BAD_REQUEST)
         
-        track = get_object_or_404(WalkingTrack, id=track_id)
+        track = get_object_or_404(WalkingTrack.objects.select_related('booking').defer('packed_points'), id=track_id)
         
         # 펫시터만 안전 구역 이탈 알림 생성 가능
         if request.user != track.booking.pet_sitter:
             return Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
         
-        # 이벤트 생성
-        event = WalkingEvent.objects.create(
-            track=track,
-            event_type='safe_zone_exit',
-            timestamp=timezone.now(),
-            description='안전 구역을 벗어났습니다.',
-            latitude=latitude,
-            longitude=longitude
-        )
+        try:
+            latitude = float(request.data.get('latitude', track.last_latitude))
+            longitude = float(request.data.get('longitude', track.last_longitude))
+        except (TypeError, ValueError):
+            return Response({'error': '위치 정보가 올바르지 않습니다.'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # 알림 생성 (펫 주인에게)
-        Notification.objects.create(
-            user=track.booking.pet_owner,
-            type='safe_zone',
-            content='펫시터가 지정된 안전 구역을 벗어났습니다.',
-            related_id=event.id
-        )
+        # 이벤트 및 알림 생성 (펫 주인에게)
+        event = geofence.record_exit(track, (timezone.now(), latitude, longitude),
+                                     description='펫시터가 안전 구역 이탈을 알렸습니다.')
         
         return Response({
             'status': '안전 구역 이탈 알림이 전송되었습니다.',
@@ -428,52 +509,83 @@ class SafetyAlertViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['POST'])
     def inactivity_alert(self, request):
-        # 장시간 비활동 알림
+        # 장시간 비활동 알림 (sweep_inactive_walks 명령이 주기적으로 자동 점검하며, 이 API는 즉시 점검할 때 사용)
         track_id = request.data.get('track')
         
         if not track_id:
             return Response({'error': '트랙 정보는 필수 항목입니다.'}, status=status.HTTP_400_BAD_REQUEST)
         
-        track = get_object_or_404(WalkingTrack, id=track_id)
-        
-        # 시스템 자동 알림이므로 권한 체크 없음
+        track = get_object_or_404(WalkingTrack.objects.select_related('booking').defer('packed_points'), id=track_id)
         
-        # 마지막 트랙 포인트 확인
-        last_point = TrackPoint.objects.filter(track=track).order_by('-timestamp').first()
+        # 펫시터, 펫 주인 또는 관리자만 점검 가능
+        if not (request.user.is_staff or request.user.id in (track.booking.pet_owner_id, track.booking.pet_sitter_id)):
+            return Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
         
-        if not last_point:
-            return Response({'error': '트랙 포인트가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        if track.status != 'in_progress':
+            return Response({'error': '진행 중인 트랙만 점검할 수 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # 현재 시간과 마지막 포인트 시간 차이 계산
-        time_diff = (timezone.now() - last_point.timestamp).total_seconds() / 60  # 분 단위
+        last_activity = track.last_point_at or track.start_time or track.created_at
+        inactivity_minutes = int((timezone.now() - last_activity).total_seconds() // 60)
         
-        # 15분 이상 비활동 시 알림
-        if time_diff >= 15:
-            # 이벤트 생성
-            event = WalkingEvent.objects.create(
-                track=track,
-                event_type='inactivity',
-                timestamp=timezone.now(),
-                description=f'{int(time_diff)}분 동안 활동이 없습니다.',
-                latitude=last_point.latitude,
-                longitude=last_point.longitude
-            )
-            
-            # 알림 생성 (펫 주인에게)
-            Notification.objects.create(
-                user=track.booking.pet_owner,
-                type='inactivity',
-                content=f'{int(time_diff)}분 동안 펫시터의 위치 업데이트가 없습니다.',
-                related_id=event.id
-            )
-            
+        # 기준 시간 이상 비활동 시 알림 (같은 공백에는 한 번만)
+        event = inactivity.alert_track(track)
+        if event is not None:
             return Response({
                 'status': '비활동 알림이 전송되었습니다.',
                 'event_id': event.id,
-                'inactivity_minutes': int(time_diff)
+                'inactivity_minutes': inactivity_minutes
+            })
+        
+        if track.inactivity_alerted_at is not None and track.inactivity_alerted_at >= last_activity:
+            return Response({
+                'status': '이미 비활동 알림이 전송되었습니다.',
+                'inactivity_minutes': inactivity_minutes
             })
         
         return Response({
             'status': '비활동 시간이 충분하지 않습니다.',
-            'inactivity_minutes': int(time_diff)
+            'inactivity_minutes': inactivity_minutes
+        })
+
+
+class SafeZoneViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
+    """보호자가 예약 또는 반려동물 단위로 지정하는 산책 안전 구역 (원형/다각형)"""
+    queryset = SafeZone.objects.all()
+    serializer_class = SafeZoneSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['booking', 'pet', 'zone_type', 'is_active']
+    
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_staff:
+            return self.queryset
+        return self.queryset.filter(owner=user)
+    
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+
+class MyWalkHeatmapView(APIView):
+    """펫시터 본인의 산책 히트맵 (파라미터는 관리자용 WalkHeatmapView와 같음)"""
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        if request.user.user_type != 'pet_sitter':
+            return Response({'error': '펫시터만 조회할 수 있습니다.'}, status=status.HTTP_403_FORBIDDEN)
+        
+        period = request.query_params.get('period', 'this-month')
+        start_date, end_date = AdminReportBaseView().get_date_range(
+            period, request.query_params.get('startDate'), request.query_params.get('endDate')
+        )
+        
+        try:
+            bbox = parse_heatmap_bbox(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'start_date': start_date,
+            'end_date': end_date,
+            **walk_heatmap.query(bbox, start_date, end_date, request.user.id)
         })
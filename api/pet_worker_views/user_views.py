@@ -1,5 +1,4 @@
 # hyper_pets_backend/api/pet_worker_views/user_views.py
-import math
 from django.db.models import Q, Avg, Count, F, Sum
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -9,13 +8,15 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 
+from .. import geo, sitter_coverage
 from ..models import (CustomUser, PetOwnerProfile, PetSitterProfile, CertificationImage, 
                      PetType, ServiceType, Notification)
+from ..query_plans import SparseFieldsMixin
 from ..serializers import (UserSerializer, PetOwnerProfileSerializer, PetSitterProfileSerializer,
                           CertificationImageSerializer)
 
 
-class CustomUserViewSet(viewsets.ModelViewSet):
+class CustomUserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -50,7 +51,7 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class PetOwnerProfileViewSet(viewsets.ModelViewSet):
+class PetOwnerProfileViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = PetOwnerProfile.objects.all()
     serializer_class = PetOwnerProfileSerializer
     permission_classes = [IsAuthenticated]
@@ -65,7 +66,7 @@ class PetOwnerProfileViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class CertificationImageViewSet(viewsets.ModelViewSet):
+class CertificationImageViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = CertificationImage.objects.all()
     serializer_class = CertificationImageSerializer
     permission_classes = [IsAuthenticated]
@@ -81,7 +82,7 @@ class CertificationImageViewSet(viewsets.ModelViewSet):
         serializer.save(pet_sitter_profile=pet_sitter_profile)
 
 
-class PetSitterProfileViewSet(viewsets.ModelViewSet):
+class PetSitterProfileViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = PetSitterProfile.objects.all()
     serializer_class = PetSitterProfileSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -177,32 +178,20 @@ class PetSitterProfileViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['GET'])
     def nearby(self, request):
-        # 위치 기반 검색
+        """해당 위치를 서비스 지역(service_area_radius)으로 하는 펫시터를 가까운 순으로 반환합니다."""
         lat = float(request.query_params.get('lat', 0))
         lng = float(request.query_params.get('lng', 0))
-        radius = float(request.query_params.get('radius', 5000)) / 1000  # 미터를 킬로미터로 변환
+        radius_m = float(request.query_params['radius']) if 'radius' in request.query_params else None
         
-        # 위도 1도 = 약 111km, 경도 1도는 위도에 따라 달라짐
-        lat_km = 111.0
-        lng_km = lat_km * abs(math.cos(math.radians(lat)))
+        # 서비스 지역 인덱스에서 후보를 찾고, radius가 주어지면 그 거리 안의 펫시터만 사용
+        serving = [
+            (pk, distance) for pk, distance in sitter_coverage.sitters_serving(lat, lng)
+            if radius_m is None or distance <= radius_m
+        ]
         
-        lat_range = radius / lat_km
-        lng_range = radius / lng_km
+        # 조회 권한 등 기존 필터를 적용한 뒤 가까운 30개만 반환
+        profiles = self.get_queryset().in_bulk([pk for pk, _ in serving])
+        ranked = [(pk, distance) for pk, distance in serving if pk in profiles][:geo.DEFAULT_LIMIT]
         
-        # 사용자 위치 기준으로 필터링
-        queryset = self.get_queryset().filter(
-            user__latitude__range=(lat - lat_range, lat + lat_range),
-            user__longitude__range=(lng - lng_range, lng + lng_range)
-        )
-        
-        # 실제 거리 계산 및 정렬
-        queryset = sorted(
-            queryset,
-            key=lambda x: (
-                (x.user.latitude - lat) ** 2 + 
-                (x.user.longitude - lng) ** 2
-            ) ** 0.5
-        )[:30]  # 가까운 30개만 반환
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        serializer = self.get_serializer([profiles[pk] for pk, _ in ranked], many=True)
+        return Response(geo.attach_distances(serializer.data, dict(ranked)))
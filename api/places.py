@@ -0,0 +1,183 @@
+# hyper_pets_backend/api/places.py
+"""
+지도에 표시되는 장소(보호소/병원/미용실/지원사업)를 종류에 상관없이 다루는 기능.
+
+여러 종류의 주변 장소는 한 번의 요청으로 거리순으로 합쳐 반환하고,
+낮은 줌 레벨에서는 마커를 하나씩 내려주는 대신, 메모리 공간 인덱스의 좌표를
+지도 타일마다 격자로 묶어 클러스터(중심 좌표, 개수, 종류별 개수)로 반환합니다.
+타일별 계산 결과는 공유 캐시(REDIS_URL)가 있으면 저장되며 좌표 데이터가 바뀌면 키가 달라져 자동으로 갱신됩니다.
+"""
+import heapq
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+
+import numpy as np
+
+from . import geo, spatial_index, tile_cache
+from .models import Shelter, Hospital, Salon, Support
+
+# 장소 종류 -> 모델 (시리얼라이저의 type 값과 동일)
+PLACE_MODELS = {
+    'shelter': Shelter,
+    'hospital': Hospital,
+    'salon': Salon,
+    'support': Support,
+}
+
+# 통합 nearby 응답에 포함할 컬럼 (목록 화면/마커에 필요한 최소한의 값)
+PLACE_FIELDS = {
+    'shelter': ('id', 'name', 'address', 'latitude', 'longitude', 'phone'),
+    'hospital': ('id', 'name', 'address', 'latitude', 'longitude', 'phone', 'is_24h'),
+    'salon': ('id', 'name', 'address', 'latitude', 'longitude', 'phone'),
+    'support': ('id', 'title', 'organization', 'latitude', 'longitude', 'support_type', 'status', 'deadline'),
+}
+
+MAX_NEARBY_LIMIT = 100
+
+CLUSTER_GRID = 4  # 타일 하나를 4x4 칸으로 나눠 묶음 (256px 타일 기준 64px)
+MAX_CLUSTER_TILES = 100  # 한 번에 계산할 수 있는 최대 타일 수
+MAX_ZOOM = 21
+
+
+def parse_place_types(value):
+    """'shelter,hospital' 형태의 types 파라미터를 검증해 목록으로 반환합니다."""
+    if not value:
+        return list(PLACE_MODELS)
+    types = list(dict.fromkeys(place_type.strip() for place_type in value.split(',') if place_type.strip()))
+    invalid = [place_type for place_type in types if place_type not in PLACE_MODELS]
+    if invalid:
+        raise ValueError(f'지원하지 않는 장소 종류입니다: {", ".join(invalid)}')
+    return types
+
+
+def parse_limit(value):
+    """limit 파라미터를 1 ~ MAX_NEARBY_LIMIT 사이의 정수로 반환합니다. (없으면 기본값)"""
+    if value in (None, ''):
+        return geo.DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit은 정수여야 합니다.')
+    return min(max(limit, 1), MAX_NEARBY_LIMIT)
+
+
+def get_nearby(lat, lng, bbox, radius_m, place_types, limit=geo.DEFAULT_LIMIT):
+    """
+    여러 종류의 장소를 거리순으로 합쳐 최대 limit개를 반환합니다.
+    각 항목은 PLACE_FIELDS의 컬럼과 type, distance_m을 가집니다.
+    """
+    # 종류별로 가까운 limit개씩 (이미 거리순) 구한 뒤 힙으로 병합해 상위 limit개만 남김
+    ranked = [
+        [(distance, place_type, pk) for pk, distance in
+         spatial_index.get_index(PLACE_MODELS[place_type]).nearest(lat, lng, limit, bbox=bbox, radius_m=radius_m)]
+        for place_type in place_types
+    ]
+    winners = list(islice(heapq.merge(*ranked), limit))
+
+    # 선택된 id만 종류별로 필요한 컬럼만 조회 (좌표는 인덱스와 같은 컬럼을 latitude/longitude로 반환)
+    rows = {}
+    for place_type in place_types:
+        ids = [pk for _, winner_type, pk in winners if winner_type == place_type]
+        if ids:
+            model = PLACE_MODELS[place_type]
+            columns = dict(zip(('latitude', 'longitude'), spatial_index.location_fields(model)))
+            fields = [columns.get(field, field) for field in PLACE_FIELDS[place_type]]
+            for values in model._default_manager.filter(id__in=ids).values_list(*fields):
+                row = dict(zip(PLACE_FIELDS[place_type], values))
+                rows[place_type, row['id']] = row
+
+    results = []
+    for distance, place_type, pk in winners:
+        row = rows.get((place_type, pk))
+        if row is not None:
+            results.append({'type': place_type, **row, 'distance_m': round(distance, 1)})
+    return results
+
+
+def _tile_cells(x, y, zoom):
+    """
+    타일 하나의 격자 칸별 집계를 계산합니다.
+    반환값: {(칸 x, 칸 y): {장소 종류: [개수, 위도 합, 경도 합, 마지막 id]}}
+    """
+    bbox = geo.tile_bbox(x, y, zoom)
+    cells = {}
+
+    for place_type, model in PLACE_MODELS.items():
+        points = spatial_index.get_index(model).within_bbox(bbox)
+        if not points:
+            continue
+
+        ids = np.array([point[0] for point in points])
+        lats = np.array([point[1] for point in points], dtype=float)
+        lngs = np.array([point[2] for point in points], dtype=float)
+
+        # 웹 메르카토르 좌표로 변환해 칸 번호 계산
+        n = 2 ** zoom * CLUSTER_GRID
+        clipped = np.radians(np.clip(lats, -geo.MAX_TILE_LATITUDE, geo.MAX_TILE_LATITUDE))
+        col = np.floor((lngs + 180.0) / 360.0 * n).astype(np.int64)
+        row = np.floor((1.0 - np.arcsinh(np.tan(clipped)) / np.pi) / 2.0 * n).astype(np.int64)
+
+        # 타일 경계 위의 점은 이웃 타일에서 한 번만 세도록 제외
+        inside = (col // CLUSTER_GRID == x) & (row // CLUSTER_GRID == y)
+        for cell_col, cell_row, pk, lat, lng in zip(
+                col[inside] % CLUSTER_GRID, row[inside] % CLUSTER_GRID,
+                ids[inside], lats[inside], lngs[inside]):
+            stats = cells.setdefault((int(cell_col), int(cell_row)), {}).setdefault(place_type, [0, 0.0, 0.0, None])
+            stats[0] += 1
+            stats[1] += float(lat)
+            stats[2] += float(lng)
+            stats[3] = int(pk)
+
+    return cells
+
+
+def _tile_cache_key(x, y, zoom, versions):
+    return f'place_clusters:{zoom}:{x}:{y}:{versions}'
+
+
+def get_clusters(bbox, zoom, place_types):
+    """
+    바운딩 박스에 걸치는 타일들의 클러스터 목록을 반환합니다.
+    각 클러스터: {'latitude', 'longitude', 'count', 'types': {종류: 개수}}
+    (한 곳만 들어 있는 클러스터는 'id'와 'type'도 포함)
+    """
+    tiles = geo.tiles_in_bbox(bbox, zoom)
+    if len(tiles) > MAX_CLUSTER_TILES:
+        raise ValueError('요청한 영역이 너무 넓습니다. 줌 레벨을 높여 주세요.')
+
+    versions = '-'.join(str(spatial_index.data_version(model)) for model in PLACE_MODELS.values())
+    keys = {_tile_cache_key(x, y, zoom, versions): (x, y) for x, y in tiles}
+
+    # 공유 캐시가 아니면 다른 워커의 무효화가 전달되지 않으므로 매번 계산
+    cached = cache.get_many(keys.keys()) if tile_cache.enabled() else {}
+    missing = {}
+    for key, (x, y) in keys.items():
+        if key not in cached:
+            cached[key] = missing[key] = _tile_cells(x, y, zoom)
+    if missing and tile_cache.enabled():
+        cache.set_many(missing, getattr(settings, 'PLACE_CLUSTER_CACHE_TIMEOUT', 3600))
+    tile_cache.record('clusters', len(keys) - len(missing), len(missing))
+
+    clusters = []
+    for cells in cached.values():
+        for groups in cells.values():
+            selected = {place_type: groups[place_type] for place_type in place_types if place_type in groups}
+            count = sum(stats[0] for stats in selected.values())
+            if not count:
+                continue
+
+            cluster = {
+                'latitude': sum(stats[1] for stats in selected.values()) / count,
+                'longitude': sum(stats[2] for stats in selected.values()) / count,
+                'count': count,
+                'types': {place_type: stats[0] for place_type, stats in selected.items()},
+            }
+            if count == 1:
+                (place_type, stats), = selected.items()
+                cluster['type'] = place_type
+                cluster['id'] = stats[3]
+            clusters.append(cluster)
+
+    return clusters
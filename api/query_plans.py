@@ -0,0 +1,170 @@
+# hyper_pets_backend/api/query_plans.py
+"""
+뷰셋별 조회 쿼리 계획.
+
+목록(list)은 관계를 id와 요약 값만 담는 목록용 시리얼라이저(list_serializer_class)로 내보내고,
+?expand=booking,pets 처럼 요청한 관계만 기존 중첩 객체로 펼칩니다.
+각 뷰셋은 목록에 필요한 조인/프리페치(query_plan)와 펼칠 관계별로 추가로 필요한 것(expand_plans)을 선언하며,
+조회 쿼리 수는 페이지 크기와 무관하게 계획에 적힌 프리페치 수만큼으로 고정됩니다.
+상세 조회/수정 응답은 기존 시리얼라이저(모든 관계 중첩)를 그대로 쓰므로 모든 계획을 함께 적용합니다.
+
+목록/상세 조회는 ?fields=a,b 또는 ?omit=a,b로 응답 필드를 줄일 수 있으며(SparseFieldsMixin),
+남은 필드가 읽는 컬럼만 조회(.only())해 쓰지 않는 긴 텍스트 컬럼은 DB에서 읽지도 직렬화하지도 않습니다.
+SerializerMethodField처럼 source로 컬럼을 알 수 없는 필드는 시리얼라이저 Meta.source_columns에
+필요한 컬럼을 적어 두며, 적혀 있지 않은 필드를 요청하면 컬럼은 줄이지 않고 응답 필드만 줄입니다.
+"""
+import re
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+# 모든 관계를 중첩해 내보내는 기존 시리얼라이저를 쓰는 동작
+DETAIL_ACTIONS = ('retrieve', 'update', 'partial_update')
+# ?fields=/?omit=를 적용하는 동작
+SPARSE_ACTIONS = ('list', 'retrieve')
+
+_DISPLAY_RE = re.compile(r'get_(\w+)_display')
+
+
+def _split_names(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+class QueryPlan(namedtuple('QueryPlan', ['select_related', 'prefetch_related'], defaults=((), ()))):
+    def under(self, prefix):
+        """prefix 관계를 거쳐 읽을 때의 계획 (예: 예약 계획을 결제의 booking 아래에 적용)"""
+        return QueryPlan(
+            tuple(f'{prefix}__{lookup}' for lookup in self.select_related),
+            tuple(f'{prefix}__{lookup}' for lookup in self.prefetch_related),
+        )
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+# BookingSerializer 전체(사용자, 서비스와 그 펫시터, 반려동물과 그 주인/종류)를 읽는 데 필요한 계획
+BOOKING_PLAN = QueryPlan(
+    select_related=('pet_owner', 'pet_sitter', 'service__pet_sitter', 'service__service_type'),
+    prefetch_related=('pets__owner', 'pets__pet_type'),
+)
+
+
+class QueryPlanMixin:
+    list_serializer_class = None
+    query_plan = QueryPlan()
+    expand_plans = {}
+
+    def get_expand(self):
+        """?expand=로 요청한 펼칠 관계 목록 (목록 조회에서만 사용)"""
+        if self.action != 'list' or self.list_serializer_class is None:
+            return ()
+
+        names = [name.strip() for name in self.request.query_params.get('expand', '').split(',') if name.strip()]
+        allowed = self.list_serializer_class.expandable_fields
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise ValidationError({
+                'error': f'펼칠 수 없는 필드입니다: {", ".join(unknown)} (가능한 값: {", ".join(allowed)})'
+            })
+        return tuple(dict.fromkeys(names))
+
+    def get_query_plans(self):
+        if self.action == 'list':
+            return [self.query_plan] + [self.expand_plans[name] for name in self.get_expand() if name in self.expand_plans]
+        if self.action in DETAIL_ACTIONS:
+            return [self.query_plan, *self.expand_plans.values()]
+        return []
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        for plan in self.get_query_plans():
+            queryset = plan.apply(queryset)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.list_serializer_class is not None:
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
+
+
+class SparseFieldsMixin:
+    def get_sparse_fields(self):
+        """응답에 남길 필드 이름 집합 (?fields=/?omit=가 없으면 None)"""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self._parse_sparse_fields()
+        return self._sparse_fields
+
+    def _parse_sparse_fields(self):
+        if self.action not in SPARSE_ACTIONS:
+            return None
+        fields = _split_names(self.request.query_params.get('fields'))
+        omit = _split_names(self.request.query_params.get('omit'))
+        if not fields and not omit:
+            return None
+
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        readable = [name for name, field in serializer.fields.items() if not field.write_only]
+        unknown = [name for name in fields + omit if name not in readable]
+        if unknown:
+            raise ValidationError({
+                'error': f'없는 필드입니다: {", ".join(unknown)} (가능한 값: {", ".join(readable)})'
+            })
+        return (set(fields) if fields else set(readable)) - set(omit)
+
+    def get_sparse_columns(self, queryset, serializer):
+        """남은 필드를 직렬화하는 데 필요한 모델 컬럼 집합 (알 수 없는 필드가 있으면 None)"""
+        if queryset.query.select_related is True:
+            return None
+
+        opts = queryset.model._meta
+        source_columns = getattr(getattr(serializer, 'Meta', None), 'source_columns', {})
+        columns = {opts.pk.name}
+        for name in self.get_sparse_fields():
+            if name in source_columns:
+                columns.update(source_columns[name])
+                continue
+            source_attrs = serializer.fields[name].source_attrs
+            if not source_attrs:
+                return None
+            attr = source_attrs[0]
+            match = _DISPLAY_RE.fullmatch(attr)
+            if match:
+                attr = match.group(1)
+            try:
+                model_field = opts.get_field(attr)
+            except FieldDoesNotExist:
+                return None
+            # 역참조/다대다 관계는 기본키만 있으면 됨
+            if model_field.concrete:
+                columns.add(model_field.name)
+
+        # select_related로 함께 읽는 관계는 지연 로딩할 수 없으므로 외래키 컬럼을 남김
+        columns.update(queryset.query.select_related or ())
+        return columns
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_sparse_fields() is None:
+            return queryset
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        columns = self.get_sparse_columns(queryset, serializer)
+        return queryset.only(*columns) if columns else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        kept = self.get_sparse_fields()
+        if kept is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in [name for name in fields if name not in kept]:
+                fields.pop(name)
+        return serializer
@@ -0,0 +1,150 @@
+# hyper_pets_backend/api/region_locator.py
+"""
+Region 중심 좌표로 "이 좌표가 어느 구/동인지"를 네이버 API 없이 찾는 로컬 리버스 지오코더.
+
+시/군/구(level 1) 중심점 중 가장 가까운 곳을 고르고 (중심점 기준 보로노이 영역),
+그 하위 동(level 2)에 좌표가 있으면 그 안에서 다시 가장 가까운 동을 고릅니다.
+지역 이름은 LegalCode의 전체 법정동명("서울특별시 종로구 청운동")을 사용하며,
+응답은 네이버 리버스 지오코딩(legalcode)과 같은 형태로 만들어 기존 클라이언트가 그대로 읽을 수 있습니다.
+"""
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from . import geo
+from .models import Region, LegalCode
+
+# 가장 가까운 중심점이 이보다 멀면 등록된 지역 밖으로 보고 None을 반환 (네이버로 넘김)
+DEFAULT_MAX_DISTANCE_M = 15000
+
+
+class RegionLocator:
+    """Region 중심 좌표로 만든 최근접 지역 인덱스"""
+
+    def __init__(self, regions, full_names):
+        self.regions = {region.id: region for region in regions}
+        self.full_names = full_names
+
+        districts = [region for region in regions if region.level == 1]
+        self.district_ids = np.array([region.id for region in districts], dtype=np.int64)
+        self.district_coords = np.array([(region.latitude, region.longitude) for region in districts], dtype=float)
+
+        # 구 id -> (동 id 배열, 동 좌표 배열)
+        children = {}
+        for region in regions:
+            if region.level == 2 and region.parent_id is not None:
+                children.setdefault(region.parent_id, []).append(region)
+        self.children = {
+            parent_id: (
+                np.array([region.id for region in items], dtype=np.int64),
+                np.array([(region.latitude, region.longitude) for region in items], dtype=float),
+            )
+            for parent_id, items in children.items()
+        }
+
+    @staticmethod
+    def _nearest(lat, lng, ids, coords):
+        distances = geo.haversine_m(lat, lng, coords[:, 0], coords[:, 1])
+        i = int(np.argmin(distances))
+        return int(ids[i]), float(distances[i])
+
+    def locate(self, lat, lng, max_distance_m=DEFAULT_MAX_DISTANCE_M):
+        """좌표가 속한 가장 세부적인 Region. 등록된 지역 밖이면 None"""
+        if not len(self.district_ids):
+            return None
+
+        district_id, distance = self._nearest(lat, lng, self.district_ids, self.district_coords)
+        if distance > max_distance_m:
+            return None
+
+        if district_id in self.children:
+            dong_id, _ = self._nearest(lat, lng, *self.children[district_id])
+            return self.regions[dong_id]
+        return self.regions[district_id]
+
+    def full_name(self, region):
+        return self.full_names.get(region.code) or region.get_full_name()
+
+
+_locator = None
+_built_at = 0.0
+_lock = threading.Lock()
+
+
+def get_locator():
+    """로컬 지오코더 인덱스. 무효화되었거나 SPATIAL_INDEX_TTL(초)이 지나면 다시 만듭니다."""
+    global _locator, _built_at
+    ttl = getattr(settings, 'SPATIAL_INDEX_TTL', 300)
+    if _locator is not None and time.monotonic() - _built_at < ttl:
+        return _locator
+
+    with _lock:
+        if _locator is None or time.monotonic() - _built_at >= ttl:
+            regions = list(
+                Region.objects.filter(latitude__isnull=False, longitude__isnull=False)
+                .select_related('parent')
+            )
+            full_names = dict(
+                LegalCode.objects.filter(code__in=[region.code for region in regions])
+                .values_list('code', 'name')
+            )
+            _locator = RegionLocator(regions, full_names)
+            _built_at = time.monotonic()
+        return _locator
+
+
+def invalidate():
+    global _locator
+    _locator = None
+
+
+def _area(name, region=None):
+    area = {'name': name, 'coords': {'center': {'crs': '', 'x': 0.0, 'y': 0.0}}}
+    if region is not None:
+        area['coords']['center'] = {'crs': 'EPSG:4326', 'x': region.longitude, 'y': region.latitude}
+    return area
+
+
+def reverse_geocode(lat, lng):
+    """
+    좌표의 법정동 정보를 네이버 리버스 지오코딩(orders=legalcode) 응답 형태로 반환합니다.
+    등록된 지역 밖의 좌표이면 None을 반환합니다.
+    """
+    locator = get_locator()
+    max_distance_m = getattr(settings, 'OFFLINE_GEOCODE_MAX_DISTANCE_M', DEFAULT_MAX_DISTANCE_M)
+    region = locator.locate(lat, lng, max_distance_m)
+    if region is None:
+        return None
+
+    # "서울특별시 종로구 청운동" -> area1 / area2 / area3
+    parts = locator.full_name(region).split()
+    if region.level == 0:
+        names = [' '.join(parts), '', '']
+    elif region.level == 1:
+        names = [parts[0], ' '.join(parts[1:]), '']
+    else:
+        names = [parts[0], ' '.join(parts[1:-1]), parts[-1]]
+
+    # 각 단계의 중심 좌표 (상위 지역을 따라 올라가며 채움)
+    ancestors = {}
+    current = region
+    while current is not None:
+        ancestors[current.level] = current
+        current = locator.regions.get(current.parent_id)
+
+    return {
+        'status': {'code': 0, 'name': 'ok', 'message': 'done'},
+        'results': [{
+            'name': 'legalcode',
+            'code': {'id': region.code, 'type': 'L', 'mappingId': region.code[:8]},
+            'region': {
+                'area0': _area('kr'),
+                'area1': _area(names[0], ancestors.get(0)),
+                'area2': _area(names[1], ancestors.get(1)),
+                'area3': _area(names[2], ancestors.get(2)),
+                'area4': _area(''),
+            },
+        }],
+    }
@@ -5,7 +5,9 @@ from .models import (Category, Shelter, Hospital, Salon, Pet, AdoptionStory, Eve
                     CustomUser, PetOwnerProfile, PetSitterProfile, CertificationImage, PetType,
                     ServiceType, UserPet, PetSitterService, PetSitterAvailability, Booking,
                     Payment, WalkingTrack, TrackPoint, WalkingEvent, Review, Message,
-                    CommunityPost, PostImage, Comment, PostLike, Notification,Region)
+                    CommunityPost, PostImage, Comment, PostLike, Notification,Region,
+                    SafeZone)
+from . import support_locations, track_storage, view_counter
 
 class RegionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -27,6 +29,7 @@ class ShelterSerializer(serializers.ModelSerializer):
             'id', 'name', 'description', 'address', 'latitude', 'longitude',
             'phone', 'operating_hours', 'type', 'capacity', 'current_occupancy'
         ]
+        source_columns = {'type': ()}  # ?fields= 적용 시 메서드 필드가 읽는 컬럼 (api.query_plans)
     
     def get_type(self, obj):
         return 'shelter'
@@ -42,6 +45,7 @@ class HospitalSerializer(serializers.ModelSerializer):
             'id', 'name', 'description', 'address', 'latitude', 'longitude',
             'phone', 'operating_hours', 'type', 'is_24h', 'specialties'
         ]
+        source_columns = {'type': (), 'specialties': ()}
     
     def get_type(self, obj):
         return 'hospital'
@@ -77,40 +81,34 @@ class SupportSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Support
-        fields = '__all__'
+        exclude = ['map_latitude', 'map_longitude', 'map_region_name', 'map_region_code']
+        source_columns = {
+            'location': ('map_latitude', 'map_longitude', 'map_region_name', 'map_region_code',
+                         'latitude', 'longitude', 'region'),
+        }
         
     def get_location(self, obj):
-        """지도에 표시하기 위한 위치 정보를 반환합니다."""
-        # 1. 연결된 regions 중 위도/경도 정보가 있는 첫 번째 지역 사용
-        if obj.regions.filter(latitude__isnull=False).exists():
-            region = obj.regions.filter(latitude__isnull=False).first()
-            return {
-                'latitude': region.latitude,
-                'longitude': region.longitude,
-                'region_name': region.name,
-                'region_code': region.code
-            }
-        # 2. 지원 정책 자체에 저장된 위도/경도 정보 사용
-        elif obj.latitude is not None and obj.longitude is not None:
-            return {
-                'latitude': obj.latitude,
-                'longitude': obj.longitude,
-                'region_name': obj.region if obj.region else '서울특별시',
-                'region_code': ''
-            }
-        # 3. 위치 정보가 없는 경우 서울시청 좌표 반환 (기본값)
-        else:
-            return {
-                'latitude': 37.5665, 
-                'longitude': 126.9780,
-                'region_name': '서울특별시',
-                'region_code': ''
-            }
+        """지도에 표시하기 위한 위치 정보를 반환합니다. (저장 시 계산된 map_* 컬럼 사용)"""
+        location = {
+            'map_latitude': obj.map_latitude,
+            'map_longitude': obj.map_longitude,
+            'map_region_name': obj.map_region_name,
+            'map_region_code': obj.map_region_code,
+        }
+        # 아직 계산되지 않은 행 (backfill_support_locations 실행 전)
+        if obj.map_latitude is None:
+            location = support_locations.resolve(obj)
+        return {
+            'latitude': location['map_latitude'],
+            'longitude': location['map_longitude'],
+            'region_name': location['map_region_name'],
+            'region_code': location['map_region_code']
+        }
         
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        # dday 계산 로직 추가
-        if instance.deadline:
+        # dday 계산 로직 추가 (?fields=로 deadline을 뺀 경우 생략)
+        if 'deadline' in self.fields and instance.deadline:
             from django.utils import timezone
             today = timezone.now().date()
             data['dday'] = (instance.deadline - today).days
@@ -126,6 +124,7 @@ class SalonSerializer(serializers.ModelSerializer):
             'id', 'name', 'description', 'address', 'latitude', 'longitude',
             'phone', 'operating_hours', 'type'
         ]
+        source_columns = {'type': ()}
     
     def get_type(self, obj):
         return 'salon'
@@ -178,6 +177,7 @@ class PetSitterProfileSerializer(serializers.ModelSerializer):
         model = PetSitterProfile
         fields = '__all__'
         read_only_fields = ['verification_status', 'average_rating', 'total_reviews', 'response_rate', 'response_time']
+        source_columns = {'price': ('user',)}
     
     def get_price(self, obj):
         # 펫시터의 서비스 중 가장 낮은 가격 반환
@@ -259,6 +259,21 @@ class TrackPointSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class TrackPointsField(serializers.Field):
+    """
+    트랙의 위치 포인트 목록 (TrackPointSerializer 형식).
+    압축 보관된 트랙(packed_points)은 TrackPoint 행이 삭제되어 있으므로 압축을 풀어 같은 형식으로 내보냅니다.
+    (이때 id와 created_at은 None)
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, track):
+        return TrackPointSerializer(track_storage.point_rows(track), many=True).data
+
+
 class WalkingEventSerializer(serializers.ModelSerializer):
     event_type_display = serializers.CharField(source='get_event_type_display', read_only=True)
     
@@ -269,12 +284,58 @@ class WalkingEventSerializer(serializers.ModelSerializer):
 
 class WalkingTrackSerializer(serializers.ModelSerializer):
     booking = BookingSerializer(read_only=True)
-    track_points = TrackPointSerializer(many=True, read_only=True)
+    track_points = TrackPointsField()
     events = WalkingEventSerializer(many=True, read_only=True)
     
     class Meta:
         model = WalkingTrack
+        exclude = ['packed_points']
+        source_columns = {'track_points': ('packed_points',)}
+
+
+class SafeZoneSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SafeZone
         fields = '__all__'
+        read_only_fields = ['owner']
+    
+    def validate_polygon(self, value):
+        if value is None:
+            return value
+        if not isinstance(value, list) or len(value) < 3:
+            raise serializers.ValidationError('다각형은 꼭짓점이 3개 이상이어야 합니다.')
+        vertices = []
+        for vertex in value:
+            try:
+                lat, lng = float(vertex[0]), float(vertex[1])
+            except (TypeError, ValueError, IndexError, KeyError):
+                raise serializers.ValidationError('꼭짓점은 [위도, 경도] 형식이어야 합니다.')
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                raise serializers.ValidationError('꼭짓점의 좌표 범위가 올바르지 않습니다.')
+            vertices.append([lat, lng])
+        return vertices
+    
+    def validate(self, attrs):
+        def value(field):
+            return attrs[field] if field in attrs else getattr(self.instance, field, None)
+        
+        if value('booking') is None and value('pet') is None:
+            raise serializers.ValidationError('예약 또는 반려동물 중 하나는 지정해야 합니다.')
+        
+        user = self.context['request'].user
+        if value('booking') is not None and value('booking').pet_owner_id != user.id:
+            raise serializers.ValidationError({'booking': '본인의 예약에만 안전 구역을 지정할 수 있습니다.'})
+        if value('pet') is not None and value('pet').owner_id != user.id:
+            raise serializers.ValidationError({'pet': '본인의 반려동물에만 안전 구역을 지정할 수 있습니다.'})
+        
+        if value('zone_type') == 'circle':
+            if value('center_latitude') is None or value('center_longitude') is None or not value('radius'):
+                raise serializers.ValidationError('원형 구역은 중심 좌표와 반경이 필요합니다.')
+            if value('radius') < 0:
+                raise serializers.ValidationError({'radius': '반경은 0보다 커야 합니다.'})
+        elif value('polygon') is None:
+            raise serializers.ValidationError({'polygon': '다각형 구역은 꼭짓점 목록이 필요합니다.'})
+        return attrs
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -296,6 +357,122 @@ class MessageSerializer(serializers.ModelSerializer):
         read_only_fields = ['is_read']
 
 
+# 목록용 시리얼라이저 (api.query_plans): 관계는 id와 요약 값만, ?expand=로 요청한 관계만 중첩 객체로 펼침
+class ExpandableFieldsMixin:
+    expandable_fields = {}  # 필드 이름: (중첩 시리얼라이저, 추가 인자)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.context.get('expand', ()):
+            if name in self.expandable_fields:
+                serializer_class, kwargs = self.expandable_fields[name]
+                fields[name] = serializer_class(read_only=True, **kwargs)
+        return fields
+
+
+class BookingListSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    pet_owner_name = serializers.CharField(source='pet_owner.username', read_only=True)
+    pet_sitter_name = serializers.CharField(source='pet_sitter.username', read_only=True)
+    service_name = serializers.CharField(source='service.service_type.name', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    expandable_fields = {
+        'pet_owner': (UserSerializer, {}),
+        'pet_sitter': (UserSerializer, {}),
+        'service': (PetSitterServiceSerializer, {}),
+        'pets': (UserPetSerializer, {'many': True}),
+    }
+
+    class Meta:
+        model = Booking
+        fields = [
+            'id', 'booking_id', 'pet_owner', 'pet_owner_name', 'pet_sitter', 'pet_sitter_name',
+            'service', 'service_name', 'pets', 'status', 'status_display',
+            'start_datetime', 'end_datetime', 'total_price', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class PaymentListSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    pet_owner = serializers.IntegerField(source='booking.pet_owner_id', read_only=True)
+    pet_sitter = serializers.IntegerField(source='booking.pet_sitter_id', read_only=True)
+    payment_method_display = serializers.CharField(source='get_payment_method_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    expandable_fields = {
+        'booking': (BookingSerializer, {}),
+    }
+
+    class Meta:
+        model = Payment
+        fields = [
+            'id', 'payment_id', 'booking', 'pet_owner', 'pet_sitter', 'amount',
+            'payment_method', 'payment_method_display', 'status', 'status_display',
+            'transaction_id', 'payment_date'
+        ]
+        read_only_fields = fields
+
+
+class ReviewListSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    pet_sitter = serializers.IntegerField(source='booking.pet_sitter_id', read_only=True)
+    pet_sitter_name = serializers.CharField(source='booking.pet_sitter.username', read_only=True)
+    pet_owner_name = serializers.SerializerMethodField()
+
+    expandable_fields = {
+        'booking': (BookingSerializer, {}),
+    }
+
+    class Meta:
+        model = Review
+        fields = [
+            'id', 'booking', 'pet_sitter', 'pet_sitter_name', 'pet_owner_name',
+            'rating', 'comment', 'anonymous', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+        source_columns = {'pet_owner_name': ('anonymous', 'booking')}
+
+    def get_pet_owner_name(self, obj):
+        # 익명 리뷰는 작성자 이름을 내보내지 않음
+        return None if obj.anonymous else obj.booking.pet_owner.username
+
+
+class MessageListSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    sender_name = serializers.CharField(source='sender.username', read_only=True)
+    receiver_name = serializers.CharField(source='receiver.username', read_only=True)
+
+    expandable_fields = {
+        'sender': (UserSerializer, {}),
+        'receiver': (UserSerializer, {}),
+        'booking': (BookingSerializer, {}),
+    }
+
+    class Meta:
+        model = Message
+        fields = ['id', 'sender', 'sender_name', 'receiver', 'receiver_name', 'booking', 'content', 'is_read', 'created_at']
+        read_only_fields = fields
+
+
+class WalkingTrackListSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    pet_owner = serializers.IntegerField(source='booking.pet_owner_id', read_only=True)
+    pet_sitter = serializers.IntegerField(source='booking.pet_sitter_id', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    expandable_fields = {
+        'booking': (BookingSerializer, {}),
+        'track_points': (TrackPointsField, {}),
+        'events': (WalkingEventSerializer, {'many': True}),
+    }
+
+    class Meta:
+        model = WalkingTrack
+        fields = [
+            'id', 'booking', 'pet_owner', 'pet_sitter', 'status', 'status_display', 'start_time', 'end_time',
+            'total_distance', 'point_count', 'moving_time', 'max_speed',
+            'last_latitude', 'last_longitude', 'last_point_at', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
 class PostImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = PostImage
@@ -306,15 +483,18 @@ class CommunityPostSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     images = PostImageSerializer(many=True, read_only=True)
     category_display = serializers.CharField(source='get_category_display', read_only=True)
-    comment_count = serializers.SerializerMethodField()
     
     class Meta:
         model = CommunityPost
         fields = '__all__'
         read_only_fields = ['view_count', 'like_count']
     
-    def get_comment_count(self, obj):
-        return obj.comments.count()
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # 아직 DB에 반영되지 않은 조회수 포함 (api.view_counter)
+        if 'view_count' in data:
+            data['view_count'] += view_counter.post_views.pending(instance.pk)
+        return data
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -325,6 +505,7 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = '__all__'
+        source_columns = {'replies': ()}
     
     def get_replies(self, obj):
         if obj.replies.exists():
@@ -332,6 +513,22 @@ class CommentSerializer(serializers.ModelSerializer):
         return []
 
 
+class CommentTreeSerializer(serializers.ModelSerializer):
+    """댓글 트리의 댓글 하나 (게시글/대댓글은 중첩하지 않음, 트리는 api.comment_tree에서 조립)"""
+    author_name = serializers.CharField(source='author.username', read_only=True)
+    
+    class Meta:
+        model = Comment
+        fields = ['id', 'author', 'author_name', 'content', 'is_anonymous', 'parent_comment', 'created_at', 'updated_at']
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # 익명 댓글은 작성자를 내보내지 않음
+        if instance.is_anonymous:
+            data['author'] = data['author_name'] = None
+        return data
+
+
 class PostLikeSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     post = CommunityPostSerializer(read_only=True)
@@ -0,0 +1,150 @@
+# hyper_pets_backend/api/signals.py
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+
+from . import (
+    comment_counts, geofence, live, region_locator, sitter_coverage, spatial_index, support_locations,
+    walk_heatmap,
+)
+from .models import (
+    Shelter, Hospital, Salon, Support, CustomUser, Region, LegalCode, PetSitterProfile,
+    WalkingTrack, WalkingEvent, SafeZone, Booking, Comment,
+)
+
+# 메모리 공간 인덱스를 사용하는 모델 (nearby / 지도 클러스터 조회 대상)
+SPATIAL_INDEX_MODELS = (Shelter, Hospital, Salon, Support)
+
+def invalidate_spatial_index(sender, **kwargs):
+    spatial_index.invalidate(sender)
+
+
+for model in SPATIAL_INDEX_MODELS:
+    post_save.connect(invalidate_spatial_index, sender=model, dispatch_uid=f'spatial_index_save_{model.__name__}')
+    post_delete.connect(invalidate_spatial_index, sender=model, dispatch_uid=f'spatial_index_delete_{model.__name__}')
+
+
+def invalidate_region_locator(sender, **kwargs):
+    region_locator.invalidate()
+
+
+for model in (Region, LegalCode):
+    post_save.connect(invalidate_region_locator, sender=model, dispatch_uid=f'region_locator_save_{model.__name__}')
+    post_delete.connect(invalidate_region_locator, sender=model, dispatch_uid=f'region_locator_delete_{model.__name__}')
+
+
+def refresh_sitter_coverage(sender, instance, **kwargs):
+    # 반경/인증 상태가 바뀐 펫시터만 다시 등록
+    sitter_coverage.refresh_sitters(id=instance.id)
+
+
+def refresh_sitter_coverage_for_user(sender, instance, **kwargs):
+    # 펫시터의 집 좌표가 바뀐 경우
+    if instance.user_type == 'pet_sitter':
+        sitter_coverage.refresh_sitters(user_id=instance.id)
+
+
+def remove_sitter_coverage(sender, instance, **kwargs):
+    sitter_coverage.remove_sitter(instance.id)
+
+
+post_save.connect(refresh_sitter_coverage, sender=PetSitterProfile, dispatch_uid='sitter_coverage_save')
+post_delete.connect(remove_sitter_coverage, sender=PetSitterProfile, dispatch_uid='sitter_coverage_delete')
+post_save.connect(refresh_sitter_coverage_for_user, sender=CustomUser, dispatch_uid='sitter_coverage_user_save')
+
+
+def update_support_location(sender, instance, **kwargs):
+    # 좌표/지역 문자열이 바뀌었을 수 있으므로 저장할 때마다 표시 위치를 다시 계산
+    for field, value in support_locations.resolve(instance).items():
+        setattr(instance, field, value)
+
+
+def refresh_support_locations_on_regions_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        support_locations.refresh(Support.objects.filter(pk=instance.pk))
+    elif action == 'post_clear':
+        # region.supports.clear(): 어떤 지원사업이 빠졌는지 알 수 없으므로 pre_clear에서 저장해둔 목록 사용
+        support_locations.refresh(Support.objects.filter(pk__in=getattr(instance, '_cleared_support_ids', [])))
+    else:
+        support_locations.refresh(Support.objects.filter(pk__in=pk_set))
+
+
+def remember_cleared_supports(sender, instance, action, reverse, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._cleared_support_ids = list(instance.supports.values_list('pk', flat=True))
+
+
+def refresh_support_locations_on_region_save(sender, instance, **kwargs):
+    support_locations.refresh(instance.supports.all())
+
+
+def remember_region_supports(sender, instance, **kwargs):
+    instance._support_ids = list(instance.supports.values_list('pk', flat=True))
+
+
+def refresh_support_locations_on_region_delete(sender, instance, **kwargs):
+    support_locations.refresh(Support.objects.filter(pk__in=getattr(instance, '_support_ids', [])))
+
+
+pre_save.connect(update_support_location, sender=Support, dispatch_uid='support_location_save')
+m2m_changed.connect(remember_cleared_supports, sender=Support.regions.through, dispatch_uid='support_location_pre_clear')
+m2m_changed.connect(refresh_support_locations_on_regions_change, sender=Support.regions.through,
+                    dispatch_uid='support_location_regions')
+post_save.connect(refresh_support_locations_on_region_save, sender=Region, dispatch_uid='support_location_region_save')
+pre_delete.connect(remember_region_supports, sender=Region, dispatch_uid='support_location_region_pre_delete')
+post_delete.connect(refresh_support_locations_on_region_delete, sender=Region,
+                    dispatch_uid='support_location_region_delete')
+
+
+def publish_walking_event(sender, instance, created, **kwargs):
+    if created:
+        live.publish_track_on_commit(instance.walking_track_id, 'event', live.event_delta(instance))
+
+
+def publish_walking_track_status(sender, instance, created, update_fields=None, **kwargs):
+    # 포인트 저장(track_ingest)은 통계 필드만 저장하므로 상태 변경으로 보지 않음
+    if created or (update_fields is not None and 'status' not in update_fields):
+        return
+    live.publish_track_on_commit(instance.pk, 'status', live.status_delta(instance))
+
+
+post_save.connect(publish_walking_event, sender=WalkingEvent, dispatch_uid='live_walking_event')
+post_save.connect(publish_walking_track_status, sender=WalkingTrack, dispatch_uid='live_walking_track_status')
+
+
+def aggregate_completed_walk(sender, instance, created, update_fields=None, **kwargs):
+    # 완료된 산책을 커밋 후 한 번만 히트맵 집계에 반영
+    if instance.status != 'completed' or instance.heatmap_aggregated:
+        return
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    track_id = instance.pk
+    transaction.on_commit(lambda: walk_heatmap.aggregate_track(track_id))
+    # 같은 객체를 다시 save() 해도 반영 전 값(False)으로 덮어쓰거나 다시 예약하지 않도록 표시
+    instance.heatmap_aggregated = True
+
+
+post_save.connect(aggregate_completed_walk, sender=WalkingTrack, dispatch_uid='walk_heatmap_track_completed')
+
+
+def invalidate_geofence(sender, **kwargs):
+    geofence.invalidate()
+
+
+post_save.connect(invalidate_geofence, sender=SafeZone, dispatch_uid='geofence_zone_save')
+post_delete.connect(invalidate_geofence, sender=SafeZone, dispatch_uid='geofence_zone_delete')
+m2m_changed.connect(invalidate_geofence, sender=Booking.pets.through, dispatch_uid='geofence_booking_pets')
+
+
+def count_created_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        comment_counts.adjust(instance.post_id, 1)
+
+
+def count_deleted_comment(sender, instance, **kwargs):
+    comment_counts.adjust(instance.post_id, -1)
+
+
+post_save.connect(count_created_comment, sender=Comment, dispatch_uid='comment_count_create')
+post_delete.connect(count_deleted_comment, sender=Comment, dispatch_uid='comment_count_delete')
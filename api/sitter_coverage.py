@@ -0,0 +1,142 @@
+# hyper_pets_backend/api/sitter_coverage.py
+"""
+승인된 펫시터의 서비스 지역(집 좌표 중심, service_area_radius km 반경 원)을 격자 칸 단위로 보관하는 인덱스.
+
+펫시터마다 서비스 원이 걸치는 모든 칸에 등록해 두므로,
+"이 주소에 방문 가능한 펫시터"는 좌표가 속한 칸 하나를 조회한 뒤 후보만 정확한 거리로 확인하면 됩니다.
+펫시터의 위치, 반경, 인증 상태가 바뀌면 signals에서 해당 펫시터만 다시 등록하고,
+다른 프로세스의 변경은 SPATIAL_INDEX_TTL이 지나 전체를 다시 만들 때 반영됩니다.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+
+from . import geo
+from .models import PetSitterProfile
+
+CELL_SIZE = 0.01  # 격자 한 칸의 크기 (위경도 기준, 약 1km)
+
+
+def _cell_of(lat, lng):
+    return math.floor(lat / CELL_SIZE), math.floor(lng / CELL_SIZE)
+
+
+def covered_cells(lat, lng, radius_m):
+    """(lat, lng) 중심 반경 radius_m 원이 조금이라도 걸치는 격자 칸 목록"""
+    min_lat, min_lng, max_lat, max_lng = geo.radius_bbox(lat, lng, radius_m)
+    row_lo, col_lo = _cell_of(min_lat, min_lng)
+    row_hi, col_hi = _cell_of(max_lat, max_lng)
+
+    rows, cols = np.meshgrid(np.arange(row_lo, row_hi + 1), np.arange(col_lo, col_hi + 1), indexing='ij')
+    rows, cols = rows.ravel(), cols.ravel()
+
+    # 각 칸에서 중심점과 가장 가까운 점까지의 거리로 원과 겹치는지 판단
+    nearest_lats = np.clip(lat, rows * CELL_SIZE, (rows + 1) * CELL_SIZE)
+    nearest_lngs = np.clip(lng, cols * CELL_SIZE, (cols + 1) * CELL_SIZE)
+    inside = geo.haversine_m(lat, lng, nearest_lats, nearest_lngs) <= radius_m
+    return list(zip(rows[inside].tolist(), cols[inside].tolist()))
+
+
+class CoverageIndex:
+    """펫시터 id -> 서비스 원, 격자 칸 -> 그 칸을 서비스하는 펫시터 id 집합"""
+
+    def __init__(self, rows=()):
+        self.cells = defaultdict(set)
+        self.sitters = {}  # id -> (위도, 경도, 반경(m), 등록된 칸 목록)
+        self._lock = threading.Lock()
+        for pk, lat, lng, radius_km, verification_status in rows:
+            self.update(pk, lat, lng, radius_km, verification_status)
+
+    def remove(self, pk):
+        with self._lock:
+            entry = self.sitters.pop(pk, None)
+            if entry is None:
+                return
+            for cell in entry[3]:
+                members = self.cells.get(cell)
+                if members is not None:
+                    members.discard(pk)
+                    if not members:
+                        del self.cells[cell]
+
+    def update(self, pk, lat, lng, radius_km, verification_status):
+        """펫시터 한 명을 다시 등록합니다. 승인되지 않았거나 좌표가 없으면 인덱스에서 뺍니다."""
+        if verification_status != 'approved' or lat is None or lng is None or not radius_km:
+            self.remove(pk)
+            return
+
+        radius_m = radius_km * 1000.0
+        entry = self.sitters.get(pk)
+        if entry is not None and entry[:3] == (lat, lng, radius_m):
+            return
+
+        cells = covered_cells(lat, lng, radius_m)
+        self.remove(pk)
+        with self._lock:
+            self.sitters[pk] = (lat, lng, radius_m, cells)
+            for cell in cells:
+                self.cells[cell].add(pk)
+
+    def serving(self, lat, lng):
+        """
+        (lat, lng)가 서비스 지역 안에 있는 펫시터들의 (id, 거리(m)) 목록 (가까운 순)
+        """
+        with self._lock:
+            candidates = [(pk, *self.sitters[pk][:3]) for pk in self.cells.get(_cell_of(lat, lng), ())]
+        if not candidates:
+            return []
+
+        coords = np.array([(c[1], c[2]) for c in candidates], dtype=float)
+        radii = np.array([c[3] for c in candidates], dtype=float)
+        distances = geo.haversine_m(lat, lng, coords[:, 0], coords[:, 1])
+
+        order = np.argsort(distances, kind='stable')
+        return [(candidates[i][0], float(distances[i])) for i in order if distances[i] <= radii[i]]
+
+
+_index = None
+_built_at = 0.0
+_build_lock = threading.Lock()
+
+
+def _profile_rows(queryset):
+    return queryset.values_list(
+        'id', 'user__latitude', 'user__longitude', 'service_area_radius', 'verification_status'
+    )
+
+
+def get_index():
+    """펫시터 서비스 지역 인덱스. 없거나 SPATIAL_INDEX_TTL(초)이 지나면 다시 만듭니다."""
+    global _index, _built_at
+    ttl = getattr(settings, 'SPATIAL_INDEX_TTL', 300)
+    if _index is not None and time.monotonic() - _built_at < ttl:
+        return _index
+
+    with _build_lock:
+        if _index is None or time.monotonic() - _built_at >= ttl:
+            _index = CoverageIndex(_profile_rows(PetSitterProfile.objects.filter(verification_status='approved')))
+            _built_at = time.monotonic()
+        return _index
+
+
+def refresh_sitters(**filters):
+    """조건에 맞는 펫시터만 DB에서 다시 읽어 인덱스를 갱신합니다. (인덱스가 아직 없으면 건너뜀)"""
+    index = _index
+    if index is None:
+        return
+    for row in _profile_rows(PetSitterProfile.objects.filter(**filters)):
+        index.update(*row)
+
+
+def remove_sitter(profile_id):
+    if _index is not None:
+        _index.remove(profile_id)
+
+
+def sitters_serving(lat, lng):
+    """(lat, lng)를 서비스 지역으로 하는 승인된 펫시터의 (프로필 id, 거리(m)) 목록 (가까운 순)"""
+    return get_index().serving(lat, lng)
@@ -0,0 +1,243 @@
+# hyper_pets_backend/api/spatial_index.py
+"""
+보호소/병원/미용실 좌표를 프로세스 메모리에 격자(grid) 형태로 보관하는 공간 인덱스.
+
+nearby 조회 시 바운딩 박스 안의 모든 행을 DB에서 읽어 정렬하는 대신,
+인덱스에서 가까운 id만 골라낸 뒤 해당 id만 DB에서 가져오기 위해 사용합니다.
+인덱스는 처음 조회될 때 (id, 위도, 경도) 튜플로 만들어지고,
+행이 저장/삭제되면 signals에서 무효화되어 다음 조회 때 다시 만들어집니다.
+지원사업(Support)은 지도에 표시하는 위치(map_latitude/map_longitude, api.support_locations)로 인덱스를 만듭니다.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import geo
+
+CELL_SIZE = 0.01  # 격자 한 칸의 크기 (위경도 기준, 약 1km)
+
+# 모델별 인덱스 좌표 컬럼 (없으면 latitude, longitude)
+LOCATION_FIELDS = {
+    'api.Support': ('map_latitude', 'map_longitude'),
+}
+
+
+def location_fields(model):
+    """인덱스에 사용하는 모델의 (위도 컬럼, 경도 컬럼)"""
+    return LOCATION_FIELDS.get(model._meta.label, ('latitude', 'longitude'))
+
+
+class GridIndex:
+    """(id, 위도, 경도) 목록을 격자 칸별로 나눠 담은 읽기 전용 인덱스"""
+
+    def __init__(self, rows, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.locations = {}  # id -> (위도, 경도)
+        self.size = 0
+
+        for pk, lat, lng in rows:
+            if lat is None or lng is None:
+                continue
+            self.cells[self.cell_of(lat, lng)].append((pk, lat, lng))
+            self.locations[pk] = (lat, lng)
+            self.size += 1
+
+        if self.cells:
+            cell_rows = [row for row, _ in self.cells]
+            cell_cols = [col for _, col in self.cells]
+            self.bounds = (min(cell_rows), min(cell_cols), max(cell_rows), max(cell_cols))
+        else:
+            self.bounds = None
+
+    def cell_of(self, lat, lng):
+        return math.floor(lat / self.cell_size), math.floor(lng / self.cell_size)
+
+    def _cell_range(self, bbox):
+        """바운딩 박스가 걸치는 격자 범위를 실제 데이터가 있는 범위로 잘라 반환합니다."""
+        if self.bounds is None:
+            return None
+
+        row_lo, col_lo, row_hi, col_hi = self.bounds
+        if bbox is not None:
+            min_lat, min_lng, max_lat, max_lng = bbox
+            box_row_lo, box_col_lo = self.cell_of(min_lat, min_lng)
+            box_row_hi, box_col_hi = self.cell_of(max_lat, max_lng)
+            row_lo, col_lo = max(row_lo, box_row_lo), max(col_lo, box_col_lo)
+            row_hi, col_hi = min(row_hi, box_row_hi), min(col_hi, box_col_hi)
+
+        if row_lo > row_hi or col_lo > col_hi:
+            return None
+        return row_lo, col_lo, row_hi, col_hi
+
+    def _iter_cells(self, cell_range):
+        """격자 범위 안의 채워진 칸들을 순회합니다."""
+        row_lo, col_lo, row_hi, col_hi = cell_range
+        area = (row_hi - row_lo + 1) * (col_hi - col_lo + 1)
+
+        # 범위가 채워진 칸 수보다 훨씬 넓으면 채워진 칸만 훑는 편이 빠름
+        if area > len(self.cells):
+            for (row, col), points in self.cells.items():
+                if row_lo <= row <= row_hi and col_lo <= col <= col_hi:
+                    yield points
+        else:
+            for row in range(row_lo, row_hi + 1):
+                for col in range(col_lo, col_hi + 1):
+                    points = self.cells.get((row, col))
+                    if points:
+                        yield points
+
+    def _points_in(self, cell_range, bbox):
+        points = (point for points in self._iter_cells(cell_range) for point in points)
+        if bbox is None:
+            return list(points)
+        min_lat, min_lng, max_lat, max_lng = bbox
+        return [point for point in points if min_lat <= point[1] <= max_lat and min_lng <= point[2] <= max_lng]
+
+    def within_bbox(self, bbox):
+        """바운딩 박스 (min_lat, min_lng, max_lat, max_lng) 안의 (id, 위도, 경도) 목록"""
+        cell_range = self._cell_range(bbox)
+        if cell_range is None:
+            return []
+        return self._points_in(cell_range, bbox)
+
+    def _ring(self, center, radius, cell_range):
+        """center 칸에서 radius 칸 떨어진 테두리 중 cell_range 안에 있는 칸들"""
+        row0, col0 = center
+        row_lo, col_lo, row_hi, col_hi = cell_range
+        if radius == 0:
+            yield row0, col0
+            return
+
+        first_col, last_col = max(col0 - radius, col_lo), min(col0 + radius, col_hi)
+        for row in (row0 - radius, row0 + radius):
+            if row_lo <= row <= row_hi:
+                for col in range(first_col, last_col + 1):
+                    yield row, col
+
+        first_row, last_row = max(row0 - radius + 1, row_lo), min(row0 + radius - 1, row_hi)
+        for col in (col0 - radius, col0 + radius):
+            if col_lo <= col <= col_hi:
+                for row in range(first_row, last_row + 1):
+                    yield row, col
+
+    def nearest(self, lat, lng, k, bbox=None, radius_m=None):
+        """
+        (lat, lng)에서 가까운 순서로 최대 k개의 (id, 거리(m))를 반환합니다.
+        bbox가 주어지면 그 안의 점만, radius_m가 주어지면 그 반경 안의 점만 대상으로 합니다.
+        """
+        cell_range = self._cell_range(bbox)
+        if cell_range is None or k <= 0:
+            return []
+
+        row_lo, col_lo, row_hi, col_hi = cell_range
+        center = self.cell_of(lat, lng)
+        area = (row_hi - row_lo + 1) * (col_hi - col_lo + 1)
+
+        # 검색 범위가 채워진 칸 수보다 넓으면 링 탐색 대신 전체를 한 번에 계산
+        if area > 4 * len(self.cells):
+            return geo.rank_by_distance(lat, lng, self._points_in(cell_range, bbox), k, radius_m)
+
+        first_ring = max(0, row_lo - center[0], center[0] - row_hi, col_lo - center[1], center[1] - col_hi)
+        last_ring = max(center[0] - row_lo, row_hi - center[0], center[1] - col_lo, col_hi - center[1])
+
+        # 1) 후보가 k개 모일 때까지 중심 칸에서 바깥쪽으로 링을 넓혀감
+        candidates = []
+        ring = first_ring
+        while ring <= last_ring and len(candidates) < k:
+            for cell in self._ring(center, ring, cell_range):
+                candidates.extend(self.cells.get(cell, ()))
+            ring += 1
+        if bbox is not None:
+            min_lat, min_lng, max_lat, max_lng = bbox
+            candidates = [p for p in candidates if min_lat <= p[1] <= max_lat and min_lng <= p[2] <= max_lng]
+
+        ranked = geo.rank_by_distance(lat, lng, candidates, k)
+        if len(ranked) < k:
+            # 범위 안의 점을 모두 확인했거나 박스 밖 점이 섞여 부족한 경우
+            if ring > last_ring:
+                return [item for item in ranked if radius_m is None or item[1] <= radius_m]
+            return geo.rank_by_distance(lat, lng, self._points_in(cell_range, bbox), k, radius_m)
+
+        # 2) k번째 거리 안에 걸치는 칸을 모두 포함해야 정확한 순위가 보장됨
+        reach = ranked[-1][1] if radius_m is None else min(ranked[-1][1], radius_m)
+        reach_lat = reach / geo.METERS_PER_DEGREE
+        lng_scale = max(math.cos(math.radians(min(abs(lat) + reach_lat + self.cell_size, 89.0))), 1e-6)
+        reach_rows = math.ceil(reach_lat / self.cell_size)
+        reach_cols = math.ceil(reach / (geo.METERS_PER_DEGREE * lng_scale) / self.cell_size)
+
+        if max(reach_rows, reach_cols) < ring:
+            return [item for item in ranked if radius_m is None or item[1] <= radius_m]
+
+        reach_range = (
+            max(row_lo, center[0] - reach_rows), max(col_lo, center[1] - reach_cols),
+            min(row_hi, center[0] + reach_rows), min(col_hi, center[1] + reach_cols),
+        )
+        return geo.rank_by_distance(lat, lng, self._points_in(reach_range, bbox), k, radius_m)
+
+
+_indexes = {}
+_generations = defaultdict(int)
+_lock = threading.Lock()
+
+
+def get_index(model):
+    """
+    모델의 공간 인덱스를 반환합니다.
+    무효화되었거나 데이터 버전(data_version)이 바뀌었거나 SPATIAL_INDEX_TTL(초)이 지난 인덱스는 다시 만듭니다.
+    (다른 프로세스에서 일어난 변경은 공유 캐시의 버전으로 알 수 있고, 공유 캐시가 없으면 TTL로 따라잡습니다.)
+    """
+    key = model._meta.label
+    ttl = getattr(settings, 'SPATIAL_INDEX_TTL', 300)
+    version = data_version(model)
+
+    entry = _indexes.get(key)
+    if entry is not None and entry[2] == version and time.monotonic() - entry[1] < ttl:
+        return entry[0]
+
+    with _lock:
+        entry = _indexes.get(key)
+        if entry is not None and entry[2] == version and time.monotonic() - entry[1] < ttl:
+            return entry[0]
+
+        generation = _generations[key]
+        rows = model._default_manager.values_list('id', *location_fields(model))
+        index = GridIndex(rows)
+        # 만드는 도중 무효화되었다면 다음 조회 때 다시 만들도록 저장하지 않음
+        if generation == _generations[key]:
+            _indexes[key] = (index, time.monotonic(), version)
+        return index
+
+
+def _version_key(model):
+    return f'spatial_index:version:{model._meta.label}'
+
+
+def data_version(model):
+    """
+    모델 좌표 데이터의 버전. 행이 저장/삭제될 때마다 바뀌므로
+    인덱스로 계산한 결과를 캐시할 때 키에 포함합니다.
+    """
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # 캐시에서 밀려났다가 다시 만들어져도 예전 값과 겹치지 않도록 현재 시각에서 시작
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(model):
+    """모델의 인덱스를 버려 다음 조회 때 다시 만들어지게 합니다."""
+    key = model._meta.label
+    _generations[key] += 1
+    _indexes.pop(key, None)
+
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        data_version(model)
@@ -0,0 +1,84 @@
+# hyper_pets_backend/api/support_locations.py
+"""
+지원사업(Support)을 지도에 표시할 위치(map_* 컬럼) 계산.
+
+표시 위치는 아래 순서로 정해지며, 조회할 때마다 계산하지 않도록
+Support 저장, regions 변경, Region 좌표 변경 시점에 계산해 컬럼에 저장합니다.
+1. 연결된 regions 중 위도/경도가 있는 첫 번째 지역 (코드 순)
+2. 지원사업 자체의 위도/경도
+3. 서울시청 좌표 (기본값)
+"""
+from django.db.models import Prefetch
+
+from . import spatial_index
+from .models import Support, Region
+
+DEFAULT_LOCATION = {
+    'map_latitude': 37.5665,
+    'map_longitude': 126.9780,
+    'map_region_name': '서울특별시',
+    'map_region_code': '',
+}
+MAP_FIELDS = tuple(DEFAULT_LOCATION)
+
+
+def located_regions(support):
+    """위도/경도가 있는 연결 지역 (코드 순). located_regions로 prefetch 되어 있으면 그 값을 사용"""
+    if hasattr(support, 'located_regions'):
+        return support.located_regions
+    return list(support.regions.filter(latitude__isnull=False).order_by('code'))
+
+
+def resolve(support, regions=None):
+    """지원사업의 지도 표시 위치를 map_* 필드 dict로 반환합니다."""
+    if regions is None:
+        regions = located_regions(support) if support.pk else []
+
+    if regions:
+        region = regions[0]
+        return {
+            'map_latitude': region.latitude,
+            'map_longitude': region.longitude,
+            'map_region_name': region.name,
+            'map_region_code': region.code,
+        }
+    if support.latitude is not None and support.longitude is not None:
+        return {
+            'map_latitude': support.latitude,
+            'map_longitude': support.longitude,
+            'map_region_name': support.region if support.region else '서울특별시',
+            'map_region_code': '',
+        }
+    return dict(DEFAULT_LOCATION)
+
+
+def with_located_regions(queryset):
+    return queryset.prefetch_related(Prefetch(
+        'regions',
+        queryset=Region.objects.filter(latitude__isnull=False).order_by('code'),
+        to_attr='located_regions'
+    ))
+
+
+def refresh(queryset, batch_size=500):
+    """queryset의 지원사업들의 표시 위치를 다시 계산해 바뀐 행만 저장합니다. 반환값: 저장한 행 수"""
+    changed = []
+    updated = 0
+    for support in with_located_regions(queryset).iterator(chunk_size=batch_size):
+        location = resolve(support)
+        if all(getattr(support, field) == value for field, value in location.items()):
+            continue
+        for field, value in location.items():
+            setattr(support, field, value)
+        changed.append(support)
+        if len(changed) >= batch_size:
+            Support.objects.bulk_update(changed, MAP_FIELDS)
+            updated += len(changed)
+            changed = []
+    if changed:
+        Support.objects.bulk_update(changed, MAP_FIELDS)
+        updated += len(changed)
+    if updated:
+        # bulk_update는 post_save를 보내지 않으므로 map_* 좌표로 만든 공간 인덱스를 직접 무효화
+        spatial_index.invalidate(Support)
+    return updated
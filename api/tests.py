@@ -1,3 +1,897 @@
-from django.test import TestCase
+import asyncio
+import sys
+from types import SimpleNamespace
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+import numpy as np
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from . import (
+    checks, comment_counts, comment_tree, geo, geofence, inactivity, live, partitions, places, spatial_index,
+    tile_cache, track_filter, track_geometry, track_ingest, track_storage, view_counter, walk_heatmap,
+)
+from .models import (
+    Shelter, CustomUser, ServiceType, PetSitterService, Booking, WalkingTrack, TrackPoint, SafeZone,
+    Notification, WalkHeatmapCell, PetType, UserPet, CommunityPost, Comment, Region, Support,
+)
+from .geocoding import LRUCache
+from .pet_worker_views import live_views
+from .pet_worker_views.booking_views import BookingViewSet
+from .pet_worker_views.tracking_views import WalkingTrackViewSet
+from .serializers import BookingListSerializer, ShelterSerializer
+from .views import ShelterViewSet
+
+
+class GridIndexTests(TestCase):
+    def setUp(self):
+        self.rows = [
+            (1, 37.5665, 126.9780),  # 서울시청
+            (2, 37.5700, 126.9830),
+            (3, 37.5512, 126.9882),  # 남산
+            (4, 37.4979, 127.0276),  # 강남역
+            (5, 35.1796, 129.0756),  # 부산
+            (6, None, 127.0),  # 좌표 없는 행은 제외
+        ]
+        self.index = spatial_index.GridIndex(self.rows)
+
+    def brute_force(self, lat, lng, k, radius_m=None):
+        points = [row for row in self.rows if row[1] is not None]
+        return geo.rank_by_distance(lat, lng, points, k, radius_m)
+
+    def test_nearest_matches_brute_force(self):
+        for lat, lng in [(37.5665, 126.9780), (37.52, 127.0), (36.0, 128.0), (33.0, 126.5)]:
+            for k in (1, 3, 10):
+                self.assertEqual(self.index.nearest(lat, lng, k), self.brute_force(lat, lng, k))
+
+    def test_nearest_respects_radius_and_bbox(self):
+        ids = [pk for pk, _ in self.index.nearest(37.5665, 126.9780, 10, radius_m=2000)]
+        self.assertEqual(ids, [1, 2, 3])
+
+        bbox = (37.49, 127.0, 37.6, 127.1)
+        self.assertEqual([pk for pk, _ in self.index.nearest(37.5665, 126.9780, 10, bbox=bbox)], [4])
+
+    def test_empty_index(self):
+        self.assertEqual(spatial_index.GridIndex([]).nearest(37.5, 127.0, 5), [])
+        self.assertEqual(self.index.nearest(37.5, 127.0, 0), [])
+
+
+@mock.patch('api.tile_cache.shared_cache', return_value=True)
+class TileCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        spatial_index._indexes.clear()
+        self.shelter = Shelter.objects.create(name='서울 보호소', address='서울', latitude=37.5665, longitude=126.9780)
+
+    def serialized(self, ids):
+        return tile_cache.get_serialized(Shelter.objects.all(), ShelterSerializer, ids)
+
+    def test_save_invalidates_cached_tile(self, _shared):
+        self.assertEqual(self.serialized([self.shelter.id])[0]['name'], '서울 보호소')
+
+        self.shelter.name = '새 이름'
+        self.shelter.save()
+        self.assertEqual(self.serialized([self.shelter.id])[0]['name'], '새 이름')
+
+    def test_version_change_from_other_process_rebuilds_index(self, _shared):
+        self.serialized([self.shelter.id])
+        # 다른 워커에서 좌표를 바꾼 경우: 이 프로세스의 인덱스는 그대로이고 공유 캐시의 버전만 바뀜
+        Shelter.objects.filter(pk=self.shelter.pk).update(latitude=37.4979, longitude=127.0276)
+        cache.incr(spatial_index._version_key(Shelter))
+
+        self.assertEqual(spatial_index.get_index(Shelter).locations[self.shelter.id], (37.4979, 127.0276))
+        self.assertEqual(self.serialized([self.shelter.id])[0]['latitude'], 37.4979)
+
+    def test_missing_id_reserializes_tile(self, _shared):
+        self.serialized([self.shelter.id])
+        # signal 없이 같은 타일에 추가된 행이 인덱스 재생성 후 요청되는 경우
+        Shelter.objects.bulk_create([Shelter(name='옆 보호소', address='서울', latitude=37.5666, longitude=126.9781)])
+        other = Shelter.objects.get(name='옆 보호소')
+        spatial_index._indexes.clear()
+
+        names = [item['name'] for item in self.serialized([other.id, self.shelter.id])]
+        self.assertEqual(names, ['옆 보호소', '서울 보호소'])
+
+    def test_process_local_cache_is_not_used(self, shared):
+        shared.return_value = False
+        self.serialized([self.shelter.id])
+        Shelter.objects.filter(pk=self.shelter.pk).update(name='새 이름')
+        self.assertEqual(self.serialized([self.shelter.id])[0]['name'], '새 이름')
+
+
+class PlacesNearbyTests(TestCase):
+    url = '/api/places/nearby/'
+
+    def setUp(self):
+        spatial_index._indexes.clear()
+        for i in range(3):
+            Shelter.objects.create(name=f'보호소 {i}', address='서울', latitude=37.5 + i * 0.001, longitude=127.0)
+
+    def test_limit_is_clamped(self):
+        for limit, expected in (('2', 2), ('0', 1), ('-5', 1), ('1000', 3)):
+            response = self.client.get(self.url, {'lat': 37.5, 'lng': 127.0, 'types': 'shelter', 'limit': limit})
+            self.assertEqual(response.status_code, 200, limit)
+            self.assertEqual(len(response.data), expected, limit)
+        self.assertEqual(places.parse_limit('1000'), places.MAX_NEARBY_LIMIT)
+
+    def test_invalid_limit_is_rejected(self):
+        response = self.client.get(self.url, {'lat': 37.5, 'lng': 127.0, 'limit': 'ten'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'limit은 정수여야 합니다.')
+
+
+class SupportLocationIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        spatial_index._indexes.clear()
+        self.region = Region.objects.create(code='11680', name='강남구', level=2, latitude=37.5172, longitude=127.0473)
+        # 자체 좌표 없이 연결 지역으로만 위치가 정해지는 지원사업
+        self.support = Support.objects.create(
+            title='반려동물 의료비 지원', description='', requirements='', target='', benefit='', how_to_apply='',
+            organization='강남구청',
+        )
+        self.support.regions.add(self.region)
+
+    def test_nearby_and_clusters_use_map_location(self):
+        params = {'lat': 37.5172, 'lng': 127.0473, 'radius': 1000}
+        [place] = self.client.get('/api/places/nearby/', {**params, 'types': 'support'}).data
+        self.assertEqual((place['id'], place['latitude'], place['longitude']), (self.support.id, 37.5172, 127.0473))
+
+        [support] = self.client.get('/api/supports/nearby/', params).data
+        self.assertEqual(support['location']['latitude'], 37.5172)
+        self.assertEqual(support['distance_m'], 0)
+
+        response = self.client.get('/api/places/clusters/', {
+            'startX': 127.04, 'startY': 37.51, 'endX': 127.05, 'endY': 37.52, 'zoom': 16, 'types': 'support',
+        })
+        self.assertEqual([cluster['id'] for cluster in response.data['clusters']], [self.support.id])
+
+    def test_region_change_moves_support_in_index(self):
+        self.assertIn(self.support.id, spatial_index.get_index(Support).locations)
+        Region.objects.filter(pk=self.region.pk).update(latitude=35.1796, longitude=129.0756)
+        self.region.refresh_from_db()
+        self.region.save()  # 지역 좌표 변경 -> map_* 다시 계산 (bulk_update)
+
+        self.assertEqual(spatial_index.get_index(Support).locations[self.support.id], (35.1796, 129.0756))
+
+
+class WalkFixtureMixin:
+    """진행 중인 산책 하나와 펫시터/보호자 클라이언트"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = CustomUser.objects.create(username='owner', user_type='pet_owner')
+        self.sitter = CustomUser.objects.create(username='sitter', user_type='pet_sitter')
+        service = PetSitterService.objects.create(
+            pet_sitter=self.sitter, service_type=ServiceType.objects.create(name='산책', description='산책'),
+            price=10000, duration=60,
+        )
+        self.start = (timezone.now() - timedelta(minutes=30)).replace(microsecond=0)
+        self.booking = Booking.objects.create(
+            pet_owner=self.owner, pet_sitter=self.sitter, service=service, status='in_progress',
+            start_datetime=self.start, end_datetime=self.start + timedelta(hours=1), total_price=10000,
+        )
+        self.track = WalkingTrack.objects.create(booking=self.booking, start_time=self.start)
+        self.client = APIClient()
+        self.client.force_authenticate(self.sitter)
+        self.base_url = f'/api/pet-worker/walking-tracks/{self.track.id}/'
+
+    def walk_points(self, n, start=None, step_s=5, step_deg=0.0001, lat=37.5, lng=127.0):
+        """북쪽으로 걷는 포인트 n개 (5초마다 약 11m)"""
+        start = start or self.start
+        return [{
+            'latitude': lat + i * step_deg, 'longitude': lng,
+            'timestamp': (start + timedelta(seconds=i * step_s)).isoformat(), 'accuracy': 5,
+        } for i in range(n)]
+
+
+@override_settings(TRACK_FILTER_ENABLED=False)
+class TrackIngestTests(WalkFixtureMixin, TestCase):
+    def test_batch_accumulates_stats_and_skips_resent_points(self):
+        points = self.walk_points(10)
+        response = self.client.post(self.base_url + 'points:batch/', {'points': points}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['accepted'], 10)
+
+        response = self.client.post(self.base_url + 'points:batch/', {'points': points[5:]}, format='json')
+        self.assertEqual((response.data['accepted'], response.data['duplicates']), (0, 5))
+
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.point_count, 10)
+        self.assertAlmostEqual(self.track.total_distance, 9 * 0.0001 * geo.METERS_PER_DEGREE, delta=1)
+
+    def test_one_point_per_call(self):
+        for point in self.walk_points(20):
+            response = self.client.post('/api/pet-worker/track-points/', {'walking_track': self.track.id, **point},
+                                        format='json')
+            self.assertEqual(response.status_code, 201)
+
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.point_count, 20)
+        self.assertEqual(self.track.track_points.count(), 20)
+
+    def test_future_timestamp_is_rejected(self):
+        future = self.walk_points(1, start=timezone.now() + timedelta(hours=1))
+        response = self.client.post(self.base_url + 'points:batch/', {'points': future}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        # 미래 포인트가 high-water mark를 밀지 않았으므로 이후 포인트는 정상 저장
+        response = self.client.post(self.base_url + 'points:batch/', {'points': self.walk_points(3)}, format='json')
+        self.assertEqual(response.data['accepted'], 3)
+
+    def test_timestamp_before_start_is_rejected(self):
+        early = self.walk_points(1, start=self.start - timedelta(days=40))
+        response = self.client.post(self.base_url + 'points:batch/', {'points': early}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.track.track_points.exists())
+
+    def test_small_clock_skew_is_allowed(self):
+        points = track_ingest.parse_points(
+            self.walk_points(1, start=timezone.now() + timedelta(seconds=30)), start_time=self.start)
+        self.assertEqual(len(points), 1)
+
+
+class WalkStatsTests(WalkFixtureMixin, TestCase):
+    def test_incremental_stats_match_recompute(self):
+        points = [(self.start + timedelta(seconds=5 * i), 37.5 + 0.0001 * i, 127.0) for i in range(30)]
+        stats = track_ingest.WalkStats()
+        for start in range(0, 30, 7):
+            stats.add(points[start:start + 7])
+
+        TrackPoint.objects.bulk_create([
+            TrackPoint(walking_track=self.track, timestamp=ts, latitude=lat, longitude=lng) for ts, lat, lng in points
+        ])
+        recomputed = track_ingest.recompute_stats(self.track)
+        self.assertAlmostEqual(stats.total_distance, recomputed.total_distance)
+        self.assertEqual((stats.point_count, stats.moving_time), (recomputed.point_count, recomputed.moving_time))
+        self.assertEqual(stats.moving_time, 29 * 5)
+
+    def test_long_gap_is_not_moving_time(self):
+        stats = track_ingest.WalkStats()
+        stats.add([
+            (self.start, 37.5, 127.0),
+            (self.start + timedelta(seconds=10), 37.5001, 127.0),
+            (self.start + timedelta(seconds=10 + track_ingest.MAX_MOVING_GAP + 1), 37.51, 127.0),
+        ])
+        self.assertEqual(stats.moving_time, 10)
+        self.assertAlmostEqual(stats.max_speed, 0.0001 * geo.METERS_PER_DEGREE / 10, delta=0.05)
+
+    @override_settings(TRACK_FILTER_ENABLED=False)
+    def test_statistics_endpoint_uses_stored_stats(self):
+        self.client.post(self.base_url + 'points:batch/', {'points': self.walk_points(5)}, format='json')
+        response = self.client.get(self.base_url + 'statistics/')
+        self.assertEqual(response.data['points_count'], 5)
+        self.assertEqual(response.data['last_point']['latitude'], 37.5004)
+
+    @override_settings(TRACK_FILTER_ENABLED=False)
+    def test_status_changes_keep_stats(self):
+        # 상태 변경 요청이 트랙을 읽은 뒤 다른 요청의 포인트 저장이 끝난 경우
+        stale = WalkingTrack.objects.get(pk=self.track.pk)
+        self.client.post(self.base_url + 'points:batch/', {'points': self.walk_points(5)}, format='json')
+        with mock.patch.object(WalkingTrackViewSet, 'get_object', return_value=stale):
+            for action in ('pause', 'resume', 'complete'):
+                self.assertEqual(self.client.post(self.base_url + f'{action}/', format='json').status_code, 200)
+
+        self.track.refresh_from_db()
+        self.assertEqual((self.track.status, self.track.point_count), ('completed', 5))
+        self.assertEqual(self.track.last_point_at, self.start + timedelta(seconds=20))
+        self.assertAlmostEqual(self.track.total_distance, 4 * 0.0001 * geo.METERS_PER_DEGREE, delta=1)
+
+
+class TrackGeometryTests(TestCase):
+    def test_encode_polyline_reference_example(self):
+        # 구글 폴리라인 문서의 예시
+        lats, lngs = [38.5, 40.7, 43.252], [-120.2, -120.95, -126.453]
+        self.assertEqual(track_geometry.encode_polyline(lats, lngs), '_p~iF~ps|U_ulLnnqC_mqNvxq`@')
+
+    def test_simplify_drops_collinear_points(self):
+        lats = [37.5 + 0.0001 * i for i in range(50)]
+        lngs = [127.0] * 50
+        self.assertEqual(list(track_geometry.simplify(lats, lngs, 1.0)), [0, 49])
+
+    def test_simplify_keeps_corners_beyond_tolerance(self):
+        # 북쪽으로 약 110m, 동쪽으로 꺾어 약 90m
+        lats = [37.5 + 0.0001 * i for i in range(11)] + [37.501] * 10
+        lngs = [127.0] * 11 + [127.0 + 0.0001 * (i + 1) for i in range(10)]
+        kept = list(track_geometry.simplify(lats, lngs, 1.0))
+        self.assertEqual(kept, [0, 10, 20])
+        # 허용 오차가 꺾인 정도보다 크면 양 끝점만 남음
+        self.assertEqual(list(track_geometry.simplify(lats, lngs, 100.0)), [0, 20])
+
+    def test_build_geometry_time_offsets(self):
+        start = timezone.now()
+        points = [(start + timedelta(seconds=10 * i), 37.5 + 0.0001 * i, 127.0) for i in range(5)]
+        geometry = track_geometry.build_geometry(points, 1.0)
+        self.assertEqual((geometry['point_count'], geometry['simplified_count']), (5, 2))
+        self.assertEqual(geometry['time_offsets'], [0, 40])
+        self.assertEqual(track_geometry.build_geometry([], 1.0)['polyline'], '')
+
+
+class TrackStorageTests(WalkFixtureMixin, TestCase):
+    def test_pack_unpack_round_trip(self):
+        start = timezone.now().replace(microsecond=123000)
+        points = [
+            (start + timedelta(milliseconds=1500 * i), 37.5 + 0.0000123 * i, 127.0 - 0.0000456 * i)
+            for i in range(500)
+        ]
+        restored = track_storage.unpack(track_storage.pack(points))
+        self.assertEqual(len(restored), 500)
+        for (ts, lat, lng), (ts2, lat2, lng2) in zip(points, restored):
+            self.assertEqual(ts, ts2)
+            self.assertAlmostEqual(lat, lat2, places=7)
+            self.assertAlmostEqual(lng, lng2, places=7)
+        self.assertEqual(track_storage.unpack(track_storage.pack([])), [])
+
+    @override_settings(TRACK_FILTER_ENABLED=False)
+    def test_compacted_track_still_serves_points(self):
+        self.client.post(self.base_url + 'points:batch/', {'points': self.walk_points(20)}, format='json')
+        before = self.client.get('/api/pet-worker/track-points/', {'walking_track': self.track.id}).data
+        WalkingTrack.objects.filter(pk=self.track.pk).update(
+            status='completed', end_time=timezone.now() - timedelta(days=2))
+
+        call_command('compact_walking_tracks', stdout=StringIO())
+        self.assertFalse(TrackPoint.objects.filter(walking_track=self.track).exists())
+
+        def coordinates(items):
+            return [(item['latitude'], item['longitude'], item['timestamp']) for item in items]
+
+        # 압축은 시각을 ms 단위로 보관하므로 초 단위 시각의 포인트는 그대로 복원됨
+        detail = self.client.get(self.base_url).data
+        self.assertEqual(len(detail['track_points']), 20)
+        self.assertEqual(coordinates(detail['track_points'][:10]), coordinates(before['results']))
+
+        after = self.client.get('/api/pet-worker/track-points/', {'walking_track': self.track.id}).data
+        self.assertEqual(after['count'], 20)
+        self.assertEqual(coordinates(after['results']), coordinates(before['results']))
+
+        listed = self.client.get('/api/pet-worker/walking-tracks/', {'expand': 'track_points'}).data
+        self.assertEqual(len(listed['results'][0]['track_points']), 20)
+
+
+class LiveStreamTests(WalkFixtureMixin, TestCase):
+    async def test_stream_delivers_points_published_from_another_thread(self):
+        stream = live_views._event_stream(self.track.id, None)
+        self.assertTrue((await anext(stream)).startswith(b'retry'))
+        self.assertIn(b'event: snapshot', await anext(stream))
+        channel = live.track_channel(self.track.id)
+        self.assertEqual(live.get_backend().subscriber_count(channel), 1)
+
+        at = timezone.now()
+        await asyncio.to_thread(live.publish_track, self.track.id, 'points', live.points_delta([(at, 37.5, 127.0)]))
+        message = await asyncio.wait_for(anext(stream), 5)
+        self.assertIn(b'event: points', message)
+        self.assertIn(f'id: {live.epoch_ms(at)}'.encode(), message)
+
+        await stream.aclose()
+        self.assertEqual(live.get_backend().subscriber_count(channel), 0)
+
+    @override_settings(REDIS_URL='redis://redis:6379/0', LIVE_REDIS_TIMEOUT=0.5)
+    def test_redis_publish_failure_does_not_fail_request(self):
+        redis = SimpleNamespace(
+            Redis=mock.Mock(), RedisError=type('RedisError', (Exception,), {}), asyncio=SimpleNamespace())
+        client = redis.Redis.from_url.return_value
+        client.publish.side_effect = redis.RedisError('timeout')
+        with mock.patch.dict(sys.modules, {'redis': redis, 'redis.asyncio': redis.asyncio}), \
+                mock.patch.object(live, '_backend', live.RedisBackend()):
+            redis.Redis.from_url.assert_called_once_with(
+                'redis://redis:6379/0', socket_timeout=0.5, socket_connect_timeout=0.5)
+            with self.assertLogs('api.live', 'WARNING'), self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.base_url + 'points:batch/', {'points': self.walk_points(3)},
+                                            format='json')
+        self.assertEqual(response.status_code, 201)
+        client.publish.assert_called()
+
+    def test_deploy_check_requires_cross_process_backend(self):
+        with override_settings(LIVE_BACKEND='api.live.InProcessBackend'):
+            self.assertEqual([w.id for w in checks.check_live_backend(None)], ['api.W002'])
+        with override_settings(LIVE_BACKEND='api.live.RedisBackend'):
+            self.assertEqual(checks.check_live_backend(None), [])
+
+
+class GeofenceTests(WalkFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        geofence.invalidate()
+
+    def test_circle_and_polygon_contains(self):
+        circle = geofence.Zone(SafeZone(
+            id=1, name='원', zone_type='circle', center_latitude=37.5, center_longitude=127.0, radius=100))
+        self.assertEqual(list(circle.contains(np.array([37.5, 37.5008, 37.5012]), np.array([127.0] * 3))),
+                         [True, True, False])
+
+        # ㄱ자 다각형: 오목한 부분은 바깥
+        polygon = geofence.Zone(SafeZone(id=2, name='다각형', zone_type='polygon', polygon=[
+            [37.50, 127.00], [37.52, 127.00], [37.52, 127.02], [37.51, 127.02], [37.51, 127.01], [37.50, 127.01],
+        ]))
+        lats = np.array([37.505, 37.515, 37.505, 37.53])
+        lngs = np.array([127.005, 127.015, 127.015, 127.005])
+        self.assertEqual(list(polygon.contains(lats, lngs)), [True, True, False, False])
+
+    def test_exit_is_reported_once_after_debounce(self):
+        SafeZone.objects.create(owner=self.owner, booking=self.booking, name='집 근처', zone_type='circle',
+                                center_latitude=37.5, center_longitude=127.0, radius=50)
+        outside = [(self.start + timedelta(seconds=10 * i), 37.51, 127.0) for i in range(6)]
+
+        exits = geofence.check(self.track, outside[:3])
+        self.assertEqual(exits, [])  # 20초: 아직 유예 시간 안
+        exits = geofence.check(self.track, outside[3:])
+        self.assertEqual(exits, [outside[3]])
+
+        geofence.check(self.track, [(self.start + timedelta(minutes=2), 37.5, 127.0)])
+        self.assertIsNone(self.track.zone_exit_since)
+        self.assertFalse(self.track.zone_alerted)
+
+    def test_zone_cache_is_bounded(self):
+        with mock.patch.object(geofence, '_zones', LRUCache(2)):
+            for booking_id in range(5):
+                geofence.zones_for_booking(booking_id)
+            self.assertEqual(len(geofence._zones._items), 2)
+
+
+class InactivityTests(WalkFixtureMixin, TestCase):
+    @override_settings(TRACK_FILTER_ENABLED=False)
+    def test_sweep_alerts_once_per_gap(self):
+        now = timezone.now()
+        self.assertEqual(inactivity.sweep(now), 1)  # 시작 후 30분 동안 포인트 없음
+        self.assertEqual(inactivity.sweep(now), 0)
+        self.assertEqual(Notification.objects.filter(user=self.owner, title='장시간 비활동').count(), 1)
+
+        # 포인트가 들어오면 새 공백으로 보고 기준 시간이 지나면 다시 알림
+        self.client.post(self.base_url + 'points:batch/', {'points': self.walk_points(1, start=now)}, format='json')
+        self.assertEqual(inactivity.sweep(now + timedelta(minutes=5)), 0)
+        self.assertEqual(inactivity.sweep(now + inactivity.threshold() + timedelta(minutes=1)), 1)
+
+    def test_completed_and_recent_walks_are_skipped(self):
+        WalkingTrack.objects.filter(pk=self.track.pk).update(last_point_at=timezone.now())
+        self.assertEqual(inactivity.sweep(), 0)
+        WalkingTrack.objects.filter(pk=self.track.pk).update(status='completed', last_point_at=self.start)
+        self.assertEqual(inactivity.sweep(), 0)
+
+
+class TrackFilterTests(WalkFixtureMixin, TestCase):
+    def parsed(self, items):
+        return track_ingest.parse_points(items, start_time=self.start)
+
+    def test_drops_inaccurate_spikes_and_jitter(self):
+        t = self.start
+        points = [
+            (t, 37.5, 127.0, 5),
+            (t + timedelta(seconds=5), 37.5, 127.0, 80),  # 정확도 나쁨
+            (t + timedelta(seconds=10), 37.51, 127.0, 5),  # 5초에 1km: 튀는 좌표
+            (t + timedelta(seconds=15), 37.50001, 127.00001, 5),  # 제자리 흔들림
+            (t + timedelta(seconds=20 + track_filter.MAX_INTERVAL), 37.50002, 127.0, 5),  # 제자리지만 간격 경과
+        ]
+        point_filter = track_filter.TrackFilter()
+        kept = point_filter.run(points)
+        self.assertEqual(kept, [(t, 37.5, 127.0), (points[4][0], 37.5, 127.0)])
+        self.assertEqual(point_filter.dropped, 3)
+
+    def test_one_point_per_call_matches_batch(self):
+        items = self.walk_points(60)
+        expected = track_filter.TrackFilter().run(self.parsed(items))
+        self.assertGreater(len(expected), 20)
+
+        for item in items:
+            response = self.client.post('/api/pet-worker/track-points/', {'walking_track': self.track.id, **item},
+                                        format='json')
+            self.assertIn(response.status_code, (200, 201))
+
+        self.track.refresh_from_db()
+        stored = list(self.track.track_points.order_by('timestamp').values_list('timestamp', 'latitude', 'longitude'))
+        self.assertEqual(stored, expected)
+        self.assertEqual(self.track.dropped_point_count, 60 - len(expected))
+
+    def test_state_survives_between_batches(self):
+        items = self.walk_points(40)
+        expected = track_filter.TrackFilter().run(self.parsed(items))
+        for start in range(0, 40, 3):
+            self.client.post(self.base_url + 'points:batch/', {'points': items[start:start + 3]}, format='json')
+
+        self.track.refresh_from_db()
+        self.assertEqual(self.track.point_count, len(expected))
+
+
+@override_settings(TRACK_FILTER_ENABLED=False)
+class WalkHeatmapTests(WalkFixtureMixin, TestCase):
+    def complete(self):
+        self.client.post(self.base_url + 'points:batch/', {'points': self.walk_points(10)}, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.base_url + 'complete/', format='json')
+        self.assertEqual(response.status_code, 200)
+        self.track.refresh_from_db()
+
+    def test_completed_walk_is_aggregated_once(self):
+        self.complete()
+        self.assertTrue(self.track.heatmap_aggregated)
+        cells = WalkHeatmapCell.objects.filter(pet_sitter=self.sitter)
+        self.assertEqual(sum(cell.point_count for cell in cells), 10)
+        self.assertEqual({cell.track_count for cell in cells}, {1})
+
+        self.assertEqual(walk_heatmap.aggregate_track(self.track.id), 0)
+        self.assertEqual(sum(cell.point_count for cell in cells.all()), 10)
+
+        self.assertTrue(self.track.events.filter(event_type='end').exists())
+        self.assertTrue(Notification.objects.filter(user=self.owner, related_booking=self.booking).exists())
+
+    def test_pause_and_resume(self):
+        for action, expected in (('pause', 'paused'), ('resume', 'in_progress')):
+            response = self.client.post(self.base_url + f'{action}/', format='json')
+            self.assertEqual(response.status_code, 200)
+            self.track.refresh_from_db()
+            self.assertEqual(self.track.status, expected)
+        self.assertEqual(list(self.track.events.values_list('event_type', flat=True)), ['pause', 'resume'])
+
+    def test_integrity_error_leaves_track_for_rollup(self):
+        with mock.patch.object(walk_heatmap, '_apply', side_effect=IntegrityError), \
+                self.assertLogs('api.walk_heatmap', 'ERROR'):
+            self.complete()
+        self.assertFalse(self.track.heatmap_aggregated)
+
+        call_command('rollup_walk_heatmap', stdout=StringIO())
+        self.track.refresh_from_db()
+        self.assertTrue(self.track.heatmap_aggregated)
+
+
+class QueryPlanTests(WalkFixtureMixin, TestCase):
+    url = '/api/pet-worker/bookings/?ordering=created_at'
+
+    def add_bookings(self, n):
+        pet_type = PetType.objects.create(name='강아지')
+        for i in range(n):
+            booking = Booking.objects.create(
+                pet_owner=self.owner, pet_sitter=self.sitter, service=self.booking.service, status='confirmed',
+                start_datetime=self.start, end_datetime=self.start + timedelta(hours=1), total_price=10000,
+            )
+            booking.pets.add(UserPet.objects.create(
+                owner=self.owner, name=f'초코{i}', pet_type=pet_type, breed='푸들', age=3, gender='M', weight=4,
+            ))
+
+    def count_queries(self, params=''):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url + params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        for params in ('', '&expand=pets,service'):
+            self.add_bookings(1)
+            few = self.count_queries(params)
+            self.add_bookings(5)
+            self.assertEqual(self.count_queries(params), few, params)
+
+    def test_list_returns_ids_unless_expanded(self):
+        self.add_bookings(1)
+        booking = self.client.get(self.url).data['results'][0]
+        self.assertIsInstance(booking['pet_owner'], int)
+        self.assertEqual(booking['pet_sitter_name'], 'sitter')
+
+        booking = self.client.get(self.url + '&expand=pet_owner').data['results'][0]
+        self.assertEqual(booking['pet_owner']['username'], 'owner')
+        self.assertIsInstance(booking['pet_sitter'], int)
+
+    def test_unknown_expand_is_rejected(self):
+        self.assertEqual(self.client.get(self.url + '&expand=payments').status_code, 400)
+
+
+class SparseFieldsTests(TestCase):
+    url = '/api/shelters/'
+
+    def setUp(self):
+        Shelter.objects.create(name='서울 보호소', description='긴 설명' * 100, address='서울', latitude=37.5, longitude=127.0)
+
+    def sparse_view(self, viewset, params):
+        request = Request(APIRequestFactory().get('/', params))
+        return viewset(action='list', request=request, format_kwarg=None)
+
+    def test_fields_selects_only_needed_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'id,name,type'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [{'id': mock.ANY, 'name': '서울 보호소', 'type': 'shelter'}])
+        self.assertNotIn('description', queries[-1]['sql'])
+
+    def test_omit_drops_fields(self):
+        shelter = self.client.get(self.url, {'omit': 'description,operating_hours'}).data['results'][0]
+        self.assertNotIn('description', shelter)
+        self.assertNotIn('operating_hours', shelter)
+        self.assertEqual(shelter['address'], '서울')
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(self.url, {'fields': 'name,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.data['error'])
+
+    def test_sparse_columns(self):
+        view = self.sparse_view(ShelterViewSet, {'fields': 'name,type'})
+        self.assertEqual(view.get_sparse_columns(Shelter.objects.all(), ShelterSerializer()), {'id', 'name'})
+
+        # get_X_display는 X 컬럼, select_related로 읽는 관계는 외래키 컬럼을 남김
+        view = self.sparse_view(BookingViewSet, {'fields': 'status_display'})
+        queryset = Booking.objects.select_related('pet_owner')
+        self.assertEqual(view.get_sparse_columns(queryset, BookingListSerializer()), {'id', 'status', 'pet_owner'})
+
+    def test_method_field_without_source_columns_keeps_all_columns(self):
+        view = self.sparse_view(ShelterViewSet, {'fields': 'name,type'})
+        with mock.patch.object(ShelterSerializer.Meta, 'source_columns', {}):
+            self.assertIsNone(view.get_sparse_columns(Shelter.objects.all(), ShelterSerializer()))
+
+
+class CommentTreeTests(TestCase):
+    def setUp(self):
+        self.author = CustomUser.objects.create(username='author')
+        self.post = CommunityPost.objects.create(author=self.author, title='산책 코스', content='추천', category='free')
+        self.url = f'/api/pet-worker/community-posts/{self.post.id}/comments/'
+
+    def comment(self, parent=None, **kwargs):
+        return Comment.objects.create(post=self.post, author=self.author, content='댓글', parent_comment=parent, **kwargs)
+
+    def test_build_tree(self):
+        nodes = [
+            {'id': 1, 'parent_comment': None},
+            {'id': 2, 'parent_comment': 1},
+            {'id': 3, 'parent_comment': 2},
+            {'id': 4, 'parent_comment': 99},  # 부모가 목록에 없음
+            {'id': 5, 'parent_comment': 1},
+        ]
+        roots = comment_tree.build_tree(nodes)
+        self.assertEqual([node['id'] for node in roots], [1, 4])
+        self.assertEqual([node['id'] for node in roots[0]['replies']], [2, 5])
+        self.assertEqual([node['id'] for node in roots[0]['replies'][0]['replies']], [3])
+        self.assertEqual(roots[1]['replies'], [])
+
+    def test_endpoint_returns_tree_and_hides_anonymous_author(self):
+        top = self.comment()
+        reply = self.comment(parent=top, is_anonymous=True)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        [root] = response.data['results']
+        self.assertEqual((root['id'], root['author_name']), (top.id, 'author'))
+        self.assertEqual([(node['id'], node['author']) for node in root['replies']], [(reply.id, None)])
+
+    def test_query_count_does_not_grow_with_comments(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url)
+            return len(queries)
+
+        self.comment(parent=self.comment())
+        few = count_queries()
+        for _ in range(10):
+            self.comment(parent=self.comment(parent=self.comment()))
+        self.assertEqual(count_queries(), few)
+
+
+class CommentCountTests(TestCase):
+    def setUp(self):
+        self.author = CustomUser.objects.create(username='author')
+        self.post = CommunityPost.objects.create(author=self.author, title='산책 코스', content='추천', category='free')
+
+    def comment(self, parent=None):
+        return Comment.objects.create(post=self.post, author=self.author, content='댓글', parent_comment=parent)
+
+    def stored(self):
+        return CommunityPost.objects.values_list('comment_count', flat=True).get(pk=self.post.pk)
+
+    def test_signals_count_comments_and_replies(self):
+        top = self.comment()
+        self.comment(parent=top)
+        self.comment()
+        self.assertEqual(self.stored(), 3)
+
+        top.delete()  # 대댓글도 함께 삭제
+        self.assertEqual(self.stored(), 1)
+
+    def test_adjust_does_not_go_below_zero(self):
+        comment_counts.adjust(self.post.pk, -1)
+        self.assertEqual(self.stored(), 0)
+
+    def test_reconcile_fixes_drift(self):
+        self.comment()
+        Comment.objects.bulk_create([Comment(post=self.post, author=self.author, content='신호 없이')])
+        other = CommunityPost.objects.create(author=self.author, title='다른 글', content='', category='free')
+        self.assertEqual(comment_counts.mismatched(), [(self.post.pk, 1, 2)])
+
+        out = StringIO()
+        call_command('reconcile_comment_counts', '--dry-run', stdout=out)
+        self.assertIn(f'게시글 {self.post.pk}: 1 -> 2', out.getvalue())
+        self.assertEqual(self.stored(), 1)
+
+        self.assertEqual(comment_counts.reconcile([other.pk]), 0)
+        self.assertEqual(comment_counts.reconcile(), 1)
+        self.assertEqual(self.stored(), 2)
+        self.assertEqual(comment_counts.mismatched(), [])
+
+
+@mock.patch.object(view_counter.threading, 'Thread')
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        author = CustomUser.objects.create(username='author')
+        self.posts = [
+            CommunityPost.objects.create(author=author, title=f'글 {i}', content='', category='free') for i in range(2)
+        ]
+        self.counter = view_counter.ViewCounter(CommunityPost, 'view_count')
+
+    def stored(self):
+        return list(CommunityPost.objects.order_by('pk').values_list('view_count', flat=True))
+
+    def test_views_are_buffered_until_flush(self, thread):
+        for _ in range(3):
+            self.counter.record(self.posts[0].pk)
+        self.counter.record(self.posts[1].pk)
+        thread.assert_called_once()
+        self.assertEqual(self.counter.pending(self.posts[0].pk), 3)
+        self.assertEqual(self.stored(), [0, 0])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.counter.flush(), 2)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self.stored(), [3, 1])
+        self.assertEqual(self.counter.pending(self.posts[0].pk), 0)
+        self.assertEqual(self.counter.flush(), 0)
+
+    @mock.patch.object(view_counter, 'FLUSH_BATCH_SIZE', 1)
+    def test_flush_updates_in_batches(self, thread):
+        for post in self.posts:
+            self.counter.record(post.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.counter.flush(), 2)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(self.stored(), [1, 1])
+
+    @mock.patch.object(view_counter, 'FLUSH_BATCH_SIZE', 1)
+    def test_failed_batch_is_requeued(self, thread):
+        for post in self.posts:
+            self.counter.record(post.pk, 2)
+        # 첫 묶음은 반영된 것으로 두고 두 번째 묶음에서 실패
+        update = mock.patch.object(QuerySet, 'update', side_effect=[1, DatabaseError('잠금 대기 시간 초과')])
+        with update, self.assertLogs('api.view_counter', 'ERROR'):
+            self.assertEqual(self.counter.flush(), 1)
+        self.assertEqual(self.counter.pending(self.posts[0].pk), 0)
+        self.assertEqual(self.counter.pending(self.posts[1].pk), 2)
+
+        self.assertEqual(self.counter.flush(), 1)
+        self.assertEqual(self.stored(), [0, 2])
+
+    def test_overlapping_flushes_keep_in_flight_views_pending(self, thread):
+        pk = self.posts[0].pk
+        update = QuerySet.update
+        seen = []
+
+        def update_with_overlap(queryset, **kwargs):
+            if not seen:
+                # 첫 flush의 UPDATE가 끝나기 전에 다른 요청이 조회를 기록하고 바로 반영
+                seen.append(self.counter.pending(pk))
+                self.counter.record(pk)
+                self.counter.flush()
+                seen.append(self.counter.pending(pk))
+            return update(queryset, **kwargs)
+
+        self.counter.record(pk)
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=update_with_overlap):
+            self.counter.flush()
+        self.assertEqual(seen, [1, 1])
+        self.assertEqual(self.counter.pending(pk), 0)
+        self.assertEqual(self.stored(), [2, 0])
+
+    @override_settings(VIEW_COUNT_FLUSH_SECONDS=0)
+    def test_zero_interval_writes_immediately(self, thread):
+        self.counter.record(self.posts[0].pk)
+        thread.assert_not_called()
+        self.assertEqual(self.stored(), [1, 0])
+
+    def test_detail_includes_pending_views(self, thread):
+        post = self.posts[0]
+        with mock.patch.object(view_counter, 'post_views', self.counter):
+            self.client.get(f'/api/pet-worker/community-posts/{post.pk}/')
+            response = self.client.get(f'/api/pet-worker/community-posts/{post.pk}/')
+        self.assertEqual(response.data['view_count'], 2)
+        self.assertEqual(self.stored()[0], 0)
+
+
+class FakePartitionCursor:
+    """partitions 모듈이 보내는 SQL을 기록하는 커서 (기본 파티션에 rows_in_default 달의 행이 있다고 응답)"""
+
+    def __init__(self, partitions, rows_in_default):
+        self.partitions = partitions
+        self.rows_in_default = rows_in_default
+        self.statements = []
+        self.result = None
+        self.rowcount = -1
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        if 'FROM pg_inherits' in sql:
+            self.result = self.partitions
+        elif sql.startswith('SELECT EXISTS'):
+            self.result = [(any(f">= '{month}" in sql for month in self.rows_in_default),)]
+        elif sql.startswith('INSERT INTO'):
+            self.rowcount = 3
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+
+class PartitionTests(WalkFixtureMixin, TestCase):
+    now = timezone.datetime(2026, 10, 17, tzinfo=timezone.utc)
+    existing = [
+        ('api_trackpoint_default', 'DEFAULT'),
+        ('api_trackpoint_legacy', "FOR VALUES FROM (MINVALUE) TO ('2026-10-01 00:00:00+00')"),
+        ('api_trackpoint_p202610', "FOR VALUES FROM ('2026-10-01 00:00:00+00') TO ('2026-11-01 00:00:00+00')"),
+    ]
+
+    def test_creates_missing_months_only(self):
+        cursor = FakePartitionCursor(self.existing, rows_in_default=[])
+        created = partitions.ensure_partitions(cursor, 'api_trackpoint', self.now, 2)
+        self.assertEqual(created, [('api_trackpoint_p202611', 0), ('api_trackpoint_p202612', 0)])
+        self.assertFalse(any('DETACH' in sql for sql in cursor.statements))
+
+    def test_rows_in_default_partition_are_moved(self):
+        cursor = FakePartitionCursor(self.existing, rows_in_default=['2026-12-01'])
+        created = partitions.ensure_partitions(cursor, 'api_trackpoint', self.now, 2)
+        self.assertEqual(created, [('api_trackpoint_p202611', 0), ('api_trackpoint_p202612', 3)])
+
+        in_december = "\"timestamp\" >= '2026-12-01 00:00:00+00' AND \"timestamp\" < '2027-01-01 00:00:00+00'"
+        statements = [sql.split(' (')[0] for sql in cursor.statements if not sql.startswith('SELECT')]
+        self.assertEqual(statements[1:], [
+            'ALTER TABLE "api_trackpoint" DETACH PARTITION "api_trackpoint_default"',
+            'CREATE TABLE "api_trackpoint_p202612" PARTITION OF "api_trackpoint" FOR VALUES FROM',
+            'INSERT INTO "api_trackpoint" SELECT * FROM "api_trackpoint_default" WHERE ' + in_december,
+            'DELETE FROM "api_trackpoint_default" WHERE ' + in_december,
+            'ALTER TABLE "api_trackpoint" ATTACH PARTITION "api_trackpoint_default" DEFAULT',
+        ])
+
+    @skipUnless(connection.vendor == 'postgresql', '파티션은 PostgreSQL에서만 사용')
+    def test_default_rows_move_on_postgresql(self):
+        # 아직 파티션이 없는 먼 달의 포인트는 기본 파티션에 들어감
+        month = partitions.add_months(partitions.month_start(timezone.now()), 24)
+        TrackPoint.objects.create(walking_track=self.track, latitude=37.5, longitude=127.0, timestamp=month)
+
+        with connection.cursor() as cursor:
+            created = partitions.ensure_partitions(cursor, 'api_trackpoint', month, 0)
+            self.assertEqual(created, [(partitions.partition_name('api_trackpoint', month), 1)])
+            cursor.execute('SELECT count(*) FROM api_trackpoint_default')
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(TrackPoint.objects.filter(timestamp=month).count(), 1)
+
+    @skipUnless(connection.vendor == 'postgresql', '파티션은 PostgreSQL에서만 사용')
+    def test_convert_populated_table_on_postgresql(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE scratch_points (id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, '
+                '"timestamp" timestamptz NOT NULL, walking_track_id bigint NOT NULL REFERENCES api_walkingtrack (id))'
+            )
+            cursor.execute('CREATE INDEX scratch_points_track ON scratch_points (walking_track_id, "timestamp")')
+            cursor.execute(
+                "INSERT INTO scratch_points (\"timestamp\", walking_track_id) "
+                "SELECT now() - g * interval '1 hour', %s FROM generate_series(1, 500) g", [self.track.id]
+            )
+
+            partitions.convert_to_partitioned(cursor, 'scratch_points', 'timestamp', timezone.now())
+            self.assertTrue(partitions.is_partitioned(cursor, 'scratch_points'))
+            cursor.execute(
+                "SELECT pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = 'scratch_points'::regclass "
+                "AND contype = 'p'"
+            )
+            self.assertEqual(cursor.fetchone()[0], 'PRIMARY KEY (id, "timestamp")')
+
+            # 새 행은 기존 id 다음 번호로 이번 달 이후 파티션(또는 legacy)에 저장
+            cursor.execute(
+                'INSERT INTO scratch_points ("timestamp", walking_track_id) VALUES (now(), %s) RETURNING id',
+                [self.track.id]
+            )
+            self.assertEqual(cursor.fetchone()[0], 501)
+            cursor.execute('SELECT count(*) FROM scratch_points_legacy')
+            self.assertEqual(cursor.fetchone()[0], 501)
@@ -0,0 +1,110 @@
+# hyper_pets_backend/api/tile_cache.py
+"""
+지도 조회(nearby) 응답에 들어가는 장소 직렬화 결과를 지도 타일 단위로 캐시합니다.
+
+nearby에서 선택된 장소들을 PLACE_TILE_CACHE_ZOOM 레벨의 타일로 나눠 (모델, 타일)마다
+직렬화 결과를 저장하므로, 비슷한 영역을 다시 조회할 때는 DB를 거치지 않습니다.
+캐시 키에는 spatial_index.data_version()이 들어가 있어 행이 저장/삭제되거나
+좌표 갱신 명령이 실행되면 (spatial_index.invalidate) 해당 모델의 타일이 모두 새로 만들어집니다.
+버전 키와 타일은 모든 워커가 같은 캐시(REDIS_URL)를 써야 무효화가 전달되므로,
+프로세스별 캐시(LocMem 등)에서는 타일 캐시를 사용하지 않고 매번 DB에서 직렬화합니다.
+"""
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from . import geo, spatial_index
+
+_stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+_stats_lock = threading.Lock()
+
+
+def record(name, hits, misses):
+    """캐시 적중/실패 횟수를 누적합니다. (프로세스별 값)"""
+    with _stats_lock:
+        _stats[name]['hits'] += hits
+        _stats[name]['misses'] += misses
+
+
+def stats():
+    """캐시 이름별 적중/실패 횟수와 적중률"""
+    with _stats_lock:
+        result = {}
+        for name, counts in _stats.items():
+            total = counts['hits'] + counts['misses']
+            result[name] = {**counts, 'hit_rate': round(counts['hits'] / total, 3) if total else None}
+        return result
+
+
+def shared_cache():
+    """기본 캐시가 모든 워커에서 공유되는 캐시인지 여부"""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def enabled():
+    """지도 타일/클러스터 캐시 사용 여부"""
+    return getattr(settings, 'PLACE_TILE_CACHE_ENABLED', True) and shared_cache()
+
+
+def _tile_key(model, version, zoom, tile):
+    return f'place_tile:{model._meta.label}:{version}:{zoom}:{tile[0]}:{tile[1]}'
+
+
+def get_serialized(queryset, serializer_class, ids):
+    """
+    ids 순서대로 직렬화된 장소 목록을 반환합니다.
+    캐시에 없는 타일은 그 타일에 속한 행 전체를 한 번의 쿼리로 읽어 직렬화한 뒤 저장합니다.
+    """
+    if not enabled():
+        objects = {item['id']: dict(item) for item in serializer_class(queryset.filter(id__in=ids), many=True).data}
+        return [objects[pk] for pk in ids if pk in objects]
+
+    model = queryset.model
+    index = spatial_index.get_index(model)
+    zoom = getattr(settings, 'PLACE_TILE_CACHE_ZOOM', 15)
+    version = spatial_index.data_version(model)
+
+    tile_of_id = {}
+    for pk in ids:
+        location = index.locations.get(pk)
+        if location is not None:
+            tile_of_id[pk] = geo.tile_of(location[0], location[1], zoom)
+
+    keys = {_tile_key(model, version, zoom, tile): tile for tile in set(tile_of_id.values())}
+    cached = cache.get_many(keys.keys())
+    payloads = {keys[key]: payload for key, payload in cached.items()}
+
+    # 캐시된 타일에 요청한 id가 없으면 (타일을 만든 뒤 인덱스가 다시 만들어진 경우) 그 타일도 새로 직렬화
+    stale = {tile for pk, tile in tile_of_id.items() if tile in payloads and pk not in payloads[tile]}
+    missing = [tile for tile in keys.values() if tile not in payloads or tile in stale]
+    if missing:
+        # 빠진 타일들에 속한 id를 인덱스에서 모아 한 번에 조회
+        tile_ids = {}
+        for tile in missing:
+            for pk, lat, lng in index.within_bbox(geo.tile_bbox(tile[0], tile[1], zoom)):
+                if geo.tile_of(lat, lng, zoom) == tile:
+                    tile_ids[pk] = tile
+
+        fresh = {tile: {} for tile in missing}
+        objects = queryset.filter(id__in=list(tile_ids))
+        for item in serializer_class(objects, many=True).data:
+            fresh[tile_ids[item['id']]][item['id']] = dict(item)
+
+        cache.set_many(
+            {_tile_key(model, version, zoom, tile): payload for tile, payload in fresh.items()},
+            getattr(settings, 'PLACE_TILE_CACHE_TIMEOUT', 3600)
+        )
+        payloads.update(fresh)
+
+    record(f'{model._meta.model_name}_tiles', len(keys) - len(missing), len(missing))
+
+    results = []
+    for pk in ids:
+        item = payloads.get(tile_of_id.get(pk), {}).get(pk)
+        if item is not None:
+            results.append(dict(item))
+    return results
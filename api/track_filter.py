@@ -0,0 +1,131 @@
+# hyper_pets_backend/api/track_filter.py
+"""
+산책 GPS 포인트 저장 전 필터.
+
+포인트를 시간순으로 하나씩 마지막으로 저장한 포인트와 비교해 아래 포인트는 저장하지 않습니다.
+- 정확도(accuracy, m)가 MAX_ACCURACY_M보다 나쁜 포인트
+- 마지막 포인트에서 MAX_SPEED보다 빠르게 이동해야 도달할 수 있는 포인트 (튀는 좌표)
+- 제자리 묶음(마지막 포인트 이후 흔들린 좌표들의 평균 위치)에서 MIN_DISTANCE_M(또는 정확도) 안쪽인 포인트
+  단, 제자리에 있어도 MAX_INTERVAL초마다 마지막 위치에 포인트를 하나 남겨 위치 업데이트 시각은 계속 갱신합니다.
+- 묶음 밖의 포인트도 바로 다음 포인트까지 묶음 밖일 때만 이동으로 보고 그 다음 포인트를 저장합니다.
+  (흔들림으로 한 번 튀어나간 좌표가 거리에 더해지지 않도록)
+TRACK_FILTER_SMOOTHING이 켜져 있으면 저장할 포인트의 좌표를 간단한 칼만 필터로 보정합니다.
+필터 상태(보정 분산, 버린 포인트 수, 제자리 묶음, 확인을 기다리는 포인트 여부)는 WalkingTrack에 저장되어
+다음 저장 요청에서 이어서 사용하므로, 포인트를 한 번에 하나씩 보내도 일괄 저장과 같은 결과가 나옵니다.
+"""
+import math
+
+from . import geo
+
+MAX_ACCURACY_M = 50.0
+MAX_SPEED = 12.0  # m/s, 달리기보다 빠른 이동은 튀는 좌표로 봄
+MIN_DISTANCE_M = 5.0
+MAX_INTERVAL = 60  # 초
+DEFAULT_ACCURACY_M = 10.0  # 앱이 정확도를 보내지 않은 경우
+PROCESS_NOISE = 3.0  # m/s, 칼만 필터의 위치 변화 불확실성
+
+STATE_FIELDS = (
+    'dropped_point_count', 'filter_variance', 'last_received_at',
+    'filter_centroid_latitude', 'filter_centroid_longitude', 'filter_cluster_size', 'filter_pending',
+)
+
+
+def _distance_m(lat1, lng1, lat2, lng2):
+    """짧은 거리용 평면 근사 거리 (m)"""
+    dy = (lat2 - lat1) * geo.METERS_PER_DEGREE
+    dx = (lng2 - lng1) * geo.METERS_PER_DEGREE * math.cos(math.radians((lat1 + lat2) / 2))
+    return math.hypot(dx, dy)
+
+
+class TrackFilter:
+    def __init__(self, last=None, variance=None, dropped=0, smoothing=False):
+        self.last = last  # 마지막으로 저장한 포인트 (시각, 위도, 경도)
+        self.variance = variance  # 칼만 필터의 위치 분산 (m^2)
+        self.dropped = dropped
+        self.smoothing = smoothing
+        # 제자리 묶음의 평균 위치와 좌표 수, 이동 확인을 기다리는 묶음 밖 포인트가 있는지 여부
+        self.centroid = last[1:] if last is not None else None
+        self.cluster_size = 1
+        self.pending = False
+
+    @classmethod
+    def from_track(cls, track, smoothing=False):
+        last = None
+        if track.last_point_at is not None:
+            last = (track.last_point_at, track.last_latitude, track.last_longitude)
+        point_filter = cls(last, track.filter_variance, track.dropped_point_count, smoothing)
+        if last is not None and track.filter_centroid_latitude is not None:
+            point_filter.centroid = (track.filter_centroid_latitude, track.filter_centroid_longitude)
+            point_filter.cluster_size = track.filter_cluster_size
+            point_filter.pending = track.filter_pending
+        return point_filter
+
+    def _smooth(self, lat, lng, accuracy, seconds):
+        if self.variance is None or self.last is None:
+            self.variance = accuracy * accuracy
+            return lat, lng
+        variance = self.variance + max(seconds, 0) * PROCESS_NOISE * PROCESS_NOISE
+        gain = variance / (variance + accuracy * accuracy)
+        self.variance = (1 - gain) * variance
+        return self.last[1] + gain * (lat - self.last[1]), self.last[2] + gain * (lng - self.last[2])
+
+    def _keep(self, point):
+        self.last = point
+        self.centroid = point[1:]
+        self.cluster_size = 1
+        self.pending = False
+        return point
+
+    def feed(self, timestamp, lat, lng, accuracy=None):
+        """포인트 하나를 판정합니다. 저장할 (시각, 위도, 경도) 또는 버릴 경우 None"""
+        if accuracy is not None and accuracy > MAX_ACCURACY_M:
+            return None
+        accuracy = accuracy if accuracy is not None else DEFAULT_ACCURACY_M
+
+        if self.last is None:
+            if self.smoothing:
+                lat, lng = self._smooth(lat, lng, accuracy, 0)
+            return self._keep((timestamp, lat, lng))
+
+        seconds = (timestamp - self.last[0]).total_seconds()
+        distance = _distance_m(self.last[1], self.last[2], lat, lng)
+        if seconds > 0 and distance > accuracy and distance / seconds > MAX_SPEED:
+            return None
+
+        if _distance_m(self.centroid[0], self.centroid[1], lat, lng) < max(MIN_DISTANCE_M, accuracy):
+            # 제자리에서 흔들린 좌표: 묶음 평균에 합침
+            self.pending = False
+            self.cluster_size += 1
+            self.centroid = (
+                self.centroid[0] + (lat - self.centroid[0]) / self.cluster_size,
+                self.centroid[1] + (lng - self.centroid[1]) / self.cluster_size,
+            )
+            if seconds < MAX_INTERVAL:
+                return None
+            # 마지막 위치에 시각만 갱신한 포인트를 남김 (이동 거리 0)
+            return self._keep((timestamp, self.last[1], self.last[2]))
+
+        if not self.pending:
+            self.pending = True
+            return None
+
+        if self.smoothing:
+            lat, lng = self._smooth(lat, lng, accuracy, seconds)
+        return self._keep((timestamp, lat, lng))
+
+    def run(self, points):
+        """시간순 (시각, 위도, 경도, 정확도) 목록에서 저장할 (시각, 위도, 경도) 목록을 반환합니다."""
+        kept = []
+        for timestamp, lat, lng, accuracy in points:
+            point = self.feed(timestamp, lat, lng, accuracy)
+            if point is not None:
+                kept.append(point)
+        self.dropped += len(points) - len(kept)
+        return kept
+
+    def apply(self, track):
+        track.dropped_point_count = self.dropped
+        track.filter_variance = self.variance
+        track.filter_centroid_latitude, track.filter_centroid_longitude = self.centroid or (None, None)
+        track.filter_cluster_size = self.cluster_size
+        track.filter_pending = self.pending
@@ -0,0 +1,125 @@
+# hyper_pets_backend/api/track_geometry.py
+"""
+산책 경로 다시보기용 경로 데이터.
+
+저장된 위치 포인트를 지도 줌 레벨에 맞는 허용 오차(화면 1픽셀 크기)로 더글러스-포이커 단순화한 뒤
+구글 폴리라인 문자열로 인코딩합니다. 완료된 트랙은 경로가 더 바뀌지 않으므로
+(트랙, 허용 오차)별 결과를 캐시에 저장해 다시 계산하지 않습니다.
+"""
+import math
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from . import geo, track_storage
+
+DEFAULT_ZOOM = 16
+MAX_ZOOM = 21
+METERS_PER_PIXEL_AT_EQUATOR = 2 * math.pi * geo.EARTH_RADIUS_M / 256  # 줌 0, 256px 타일 기준
+
+
+def tolerance_for_zoom(zoom, lat):
+    """줌 레벨에서 화면 1픽셀이 나타내는 거리(m)"""
+    return METERS_PER_PIXEL_AT_EQUATOR * math.cos(math.radians(lat)) / 2 ** zoom
+
+
+def simplify(lats, lngs, tolerance_m):
+    """더글러스-포이커 알고리즘으로 남길 포인트의 인덱스 배열을 반환합니다."""
+    n = len(lats)
+    if n <= 2:
+        return np.arange(n)
+
+    # 경로 시작점 기준의 평면 좌표(m)로 변환
+    lat0 = math.radians(lats[0])
+    ys = (np.asarray(lats, dtype=float) - lats[0]) * geo.METERS_PER_DEGREE
+    xs = (np.asarray(lngs, dtype=float) - lngs[0]) * geo.METERS_PER_DEGREE * math.cos(lat0)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        # 구간 안의 점들과 양 끝점을 잇는 선분 사이의 거리
+        px, py = xs[first + 1:last], ys[first + 1:last]
+        ax, ay, bx, by = xs[first], ys[first], xs[last], ys[last]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        if length_sq == 0:
+            distances = np.hypot(px - ax, py - ay)
+        else:
+            t = np.clip(((px - ax) * dx + (py - ay) * dy) / length_sq, 0.0, 1.0)
+            distances = np.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance_m:
+            split = first + 1 + i
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return np.flatnonzero(keep)
+
+
+def encode_polyline(lats, lngs, precision=5):
+    """구글 폴리라인 알고리즘으로 좌표 목록을 문자열로 인코딩합니다."""
+    factor = 10 ** precision
+    result = []
+    prev_lat = prev_lng = 0
+    for lat, lng in zip(lats, lngs):
+        lat_i, lng_i = int(round(lat * factor)), int(round(lng * factor))
+        for delta in (lat_i - prev_lat, lng_i - prev_lng):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                result.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            result.append(chr(value + 63))
+        prev_lat, prev_lng = lat_i, lng_i
+    return ''.join(result)
+
+
+def _cache_key(track_id, tolerance_m):
+    return f'track_geometry:{track_id}:{tolerance_m:.2f}'
+
+
+def build_geometry(points, tolerance_m):
+    """(시각, 위도, 경도) 목록으로 단순화된 경로 데이터를 만듭니다."""
+    if not points:
+        return {'point_count': 0, 'simplified_count': 0, 'polyline': '', 'start_time': None, 'time_offsets': []}
+
+    lats = [point[1] for point in points]
+    lngs = [point[2] for point in points]
+    kept = simplify(lats, lngs, tolerance_m)
+
+    start_time = points[0][0]
+    return {
+        'point_count': len(points),
+        'simplified_count': len(kept),
+        'polyline': encode_polyline([lats[i] for i in kept], [lngs[i] for i in kept]),
+        'start_time': start_time,
+        # 남은 포인트 각각의 시작 시각 기준 경과 시간 (초)
+        'time_offsets': [round((points[i][0] - start_time).total_seconds()) for i in kept],
+    }
+
+
+def get_geometry(track, zoom=DEFAULT_ZOOM):
+    """트랙의 단순화된 경로 데이터. 완료된 트랙은 (트랙, 허용 오차)별로 캐시합니다."""
+    lat = track.last_latitude if track.last_latitude is not None else 37.5
+    tolerance_m = round(tolerance_for_zoom(zoom, lat), 2)
+
+    cacheable = track.status == 'completed'
+    key = _cache_key(track.id, tolerance_m)
+    if cacheable:
+        geometry = cache.get(key)
+        if geometry is not None:
+            return geometry
+
+    points = track_storage.load_points(track)
+    geometry = {'zoom': zoom, 'tolerance_m': tolerance_m, **build_geometry(points, tolerance_m)}
+
+    if cacheable:
+        cache.set(key, geometry, getattr(settings, 'TRACK_GEOMETRY_CACHE_TIMEOUT', 60 * 60 * 24))
+    return geometry
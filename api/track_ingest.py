@@ -0,0 +1,214 @@
+# hyper_pets_backend/api/track_ingest.py
+"""
+산책 GPS 포인트(TrackPoint) 저장과 산책 통계 누적.
+
+앱은 포인트를 모아 두었다가 15~30초마다 한 번에 보내고, 서버는 트랙 권한을 한 번만 확인한 뒤
+bulk_create로 저장합니다. 포인트의 시각은 앱이 측정한 시각을 그대로 사용하며,
+이미 받은 마지막 시각(high-water mark) 이전의 포인트는 재전송으로 보고 버립니다.
+앱 시각이 틀려 high-water mark를 미래로 밀거나 파티션 범위를 벗어나지 않도록, 산책 시작 전
+(TRACK_POINT_START_SLACK_SECONDS 이상) 또는 서버 시각보다 미래(TRACK_POINT_MAX_CLOCK_SKEW_SECONDS 이상)인
+포인트가 있으면 요청 전체를 거부합니다.
+새 포인트는 track_filter로 정확도/속도/제자리 흔들림을 걸러 남은 포인트만 저장합니다.
+저장할 때 이동 거리, 이동 시간, 최고 속도, 포인트 수, 마지막 위치를 WalkingTrack에 누적하므로
+통계 조회는 포인트를 다시 읽지 않습니다.
+같은 시점에 예약의 안전 구역 이탈 여부도 확인하며(geofence), 구역 목록은 프로세스 메모리에 캐시되어 있습니다.
+저장된 포인트는 커밋 후 live 채널로 발행되어 실시간 중계 중인 보호자에게 전달됩니다.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+import numpy as np
+
+from . import geo, geofence, live, track_filter, track_storage
+from .models import WalkingTrack, TrackPoint
+
+DEFAULT_MAX_BATCH_SIZE = 1000
+DEFAULT_START_SLACK_SECONDS = 300
+DEFAULT_MAX_CLOCK_SKEW_SECONDS = 120
+
+MOVING_SPEED_THRESHOLD = 0.5  # 이 속도(m/s) 이상인 구간만 이동 중으로 봄
+MAX_MOVING_GAP = 60  # 이보다 긴 간격(초)의 구간은 이동 시간/최고 속도에서 제외 (신호 끊김, 일시정지)
+
+STAT_FIELDS = (
+    'total_distance', 'point_count', 'moving_time', 'max_speed',
+    'last_latitude', 'last_longitude', 'last_point_at',
+)
+
+# accepted: 저장된 포인트 수, dropped: 필터로 버린 포인트 수, high_water: 지금까지 받은 마지막 포인트 시각
+IngestResult = namedtuple('IngestResult', ['accepted', 'dropped', 'high_water'])
+
+
+class WalkStats:
+    """시간순 포인트를 이어 받아 산책 통계를 누적합니다."""
+
+    def __init__(self, total_distance=0.0, point_count=0, moving_time=0.0, max_speed=0.0, last=None):
+        self.total_distance = total_distance
+        self.point_count = point_count
+        self.moving_time = moving_time
+        self.max_speed = max_speed
+        self.last = last  # 마지막 포인트 (시각, 위도, 경도)
+
+    @classmethod
+    def from_track(cls, track):
+        last = None
+        if track.last_point_at is not None:
+            last = (track.last_point_at, track.last_latitude, track.last_longitude)
+        return cls(track.total_distance, track.point_count, track.moving_time, track.max_speed, last)
+
+    def add(self, points):
+        """시각순으로 정렬된 (시각, 위도, 경도) 목록을 누적합니다."""
+        if not points:
+            return
+        path = [self.last, *points] if self.last is not None else list(points)
+
+        if len(path) >= 2:
+            distances = geo.segment_lengths_m([p[1] for p in path], [p[2] for p in path])
+            seconds = np.array([(b[0] - a[0]).total_seconds() for a, b in zip(path, path[1:])])
+
+            speeds = np.divide(distances, seconds, out=np.zeros_like(distances), where=seconds > 0)
+            moving = (seconds > 0) & (seconds <= MAX_MOVING_GAP) & (speeds >= MOVING_SPEED_THRESHOLD)
+
+            self.total_distance += float(distances.sum())
+            self.moving_time += float(seconds[moving].sum())
+            if moving.any():
+                self.max_speed = max(self.max_speed, float(speeds[moving].max()))
+
+        self.point_count += len(points)
+        self.last = points[-1]
+
+    def apply(self, track):
+        track.total_distance = self.total_distance
+        track.point_count = self.point_count
+        track.moving_time = self.moving_time
+        track.max_speed = self.max_speed
+        if self.last is not None:
+            track.last_point_at, track.last_latitude, track.last_longitude = self.last
+        else:
+            track.last_point_at = track.last_latitude = track.last_longitude = None
+
+
+def parse_timestamp(value):
+    """ISO 8601 문자열 또는 epoch 밀리초 숫자를 aware datetime으로 변환합니다."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value / 1000.0, tz=dt_timezone.utc)
+    if isinstance(value, str):
+        parsed = parse_datetime(value)
+        if parsed is not None:
+            if timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed)
+            return parsed
+    raise ValueError(f'잘못된 시각 형식입니다: {value!r}')
+
+
+def parse_points(items, start_time=None):
+    """
+    요청 본문의 포인트 목록을 검증해 (시각, 위도, 경도, 정확도) 목록으로 반환합니다.
+    정확도(accuracy, m)는 선택 항목이며 없으면 None입니다. 잘못된 항목이 있으면 ValueError가 발생합니다.
+    시각은 산책 시작 시각(start_time)보다 너무 이르거나 서버 시각보다 너무 늦으면 잘못된 항목으로 봅니다.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError('points는 비어 있지 않은 목록이어야 합니다.')
+
+    max_size = getattr(settings, 'TRACK_POINT_BATCH_MAX_SIZE', DEFAULT_MAX_BATCH_SIZE)
+    if len(items) > max_size:
+        raise ValueError(f'한 번에 최대 {max_size}개의 포인트만 보낼 수 있습니다.')
+
+    latest = timezone.now() + timedelta(
+        seconds=getattr(settings, 'TRACK_POINT_MAX_CLOCK_SKEW_SECONDS', DEFAULT_MAX_CLOCK_SKEW_SECONDS))
+    earliest = None
+    if start_time is not None:
+        earliest = start_time - timedelta(
+            seconds=getattr(settings, 'TRACK_POINT_START_SLACK_SECONDS', DEFAULT_START_SLACK_SECONDS))
+
+    points = []
+    for i, item in enumerate(items):
+        try:
+            lat = float(item['latitude'])
+            lng = float(item['longitude'])
+            timestamp = parse_timestamp(item['timestamp'])
+            accuracy = float(item['accuracy']) if item.get('accuracy') not in (None, '') else None
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f'{i}번째 포인트가 올바르지 않습니다: {e}')
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError(f'{i}번째 포인트의 좌표 범위가 올바르지 않습니다.')
+        if timestamp > latest:
+            raise ValueError(f'{i}번째 포인트의 시각이 서버 시각보다 미래입니다.')
+        if earliest is not None and timestamp < earliest:
+            raise ValueError(f'{i}번째 포인트의 시각이 산책 시작 시각보다 이전입니다.')
+        points.append((timestamp, lat, lng, accuracy))
+    return points
+
+
+def ingest_points(track, points):
+    """
+    트랙에 포인트를 저장합니다. (권한/상태 확인은 호출하는 쪽에서 수행)
+    points: parse_points()의 (시각, 위도, 경도, 정확도) 목록. 반환값: IngestResult
+    """
+    points = sorted(points, key=lambda point: point[0])
+
+    with transaction.atomic():
+        # 같은 트랙에 대한 동시 요청이 같은 high-water mark를 보지 않도록 트랙 행을 잠그고 최신 통계를 읽음
+        locked = WalkingTrack.objects.select_for_update().get(pk=track.pk)
+        high_water = locked.last_received_at or locked.last_point_at
+        if high_water is None and locked.point_count == 0:
+            # 통계 컬럼이 생기기 전에 저장된 포인트가 있으면 먼저 전체를 다시 계산
+            high_water = locked.track_points.aggregate(last=Max('timestamp'))['last']
+            if high_water is not None:
+                recompute_stats(locked)
+
+        fresh = []
+        for point in points:
+            if high_water is not None and point[0] <= high_water:
+                continue
+            fresh.append(point)
+            high_water = point[0]
+
+        if not fresh:
+            return IngestResult(0, 0, high_water)
+
+        if getattr(settings, 'TRACK_FILTER_ENABLED', True):
+            point_filter = track_filter.TrackFilter.from_track(
+                locked, smoothing=getattr(settings, 'TRACK_FILTER_SMOOTHING', False))
+            accepted = point_filter.run(fresh)
+            point_filter.apply(locked)
+        else:
+            accepted = [point[:3] for point in fresh]
+
+        if accepted:
+            TrackPoint.objects.bulk_create([
+                TrackPoint(walking_track=locked, latitude=lat, longitude=lng, timestamp=timestamp)
+                for timestamp, lat, lng in accepted
+            ])
+
+        stats = WalkStats.from_track(locked)
+        stats.add(accepted)
+        stats.apply(locked)
+        locked.last_received_at = high_water
+        exits = geofence.check(locked, accepted)
+        locked.save(update_fields=[*STAT_FIELDS, *geofence.STATE_FIELDS, *track_filter.STATE_FIELDS, 'updated_at'])
+        for point in exits:
+            geofence.record_exit(locked, point)
+
+        # 호출한 쪽의 객체도 최신 통계로 맞춤
+        for field in (*STAT_FIELDS, *geofence.STATE_FIELDS, *track_filter.STATE_FIELDS):
+            setattr(track, field, getattr(locked, field))
+
+        if accepted:
+            live.publish_track_on_commit(locked.pk, 'points', live.points_delta(accepted, locked))
+
+    return IngestResult(len(accepted), len(fresh) - len(accepted), high_water)
+
+
+def recompute_stats(track, chunk_size=2000):
+    """저장된 포인트를 시간순으로 한 번 훑어 트랙 통계를 다시 계산합니다. (저장은 호출하는 쪽에서)"""
+    stats = WalkStats()
+    for chunk in track_storage.iter_point_chunks(track, chunk_size):
+        stats.add(chunk)
+    stats.apply(track)
+    return stats
@@ -0,0 +1,96 @@
+# hyper_pets_backend/api/track_storage.py
+"""
+완료된 산책 트랙의 위치 포인트 보관.
+
+완료 후 더 이상 바뀌지 않는 트랙은 compact_walking_tracks 명령으로 TrackPoint 행들을
+WalkingTrack.packed_points 한 컬럼에 압축해 넣고 원본 행은 삭제합니다.
+형식: 헤더(버전, 포인트 수, 첫 포인트의 시각/위도/경도) 뒤에 위도, 경도, 시각의
+이전 포인트 대비 차이값을 각각 int32 배열로 이어 붙인 뒤 zlib으로 압축 (좌표 1e-7도, 시각 ms 단위)
+포인트를 읽는 쪽은 load_points()(또는 API 응답용 point_rows())를 사용하면 저장 형태와 상관없이 같은 결과를 받습니다.
+"""
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+
+from .models import TrackPoint
+
+FORMAT_VERSION = 1
+COORDINATE_SCALE = 10 ** 7  # 1e-7도 ≒ 1cm
+_HEADER = struct.Struct('<BIqii')  # 버전, 포인트 수, 첫 시각(epoch ms), 첫 위도, 첫 경도
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def pack(points):
+    """시간순 (시각, 위도, 경도) 목록을 압축된 bytes로 변환합니다."""
+    if not points:
+        return zlib.compress(_HEADER.pack(FORMAT_VERSION, 0, 0, 0, 0))
+
+    times = np.array([round((point[0] - _EPOCH).total_seconds() * 1000) for point in points], dtype=np.int64)
+    lats = np.round(np.array([point[1] for point in points], dtype=float) * COORDINATE_SCALE).astype(np.int64)
+    lngs = np.round(np.array([point[2] for point in points], dtype=float) * COORDINATE_SCALE).astype(np.int64)
+
+    header = _HEADER.pack(FORMAT_VERSION, len(points), int(times[0]), int(lats[0]), int(lngs[0]))
+    columns = b''.join(np.diff(column).astype('<i4').tobytes() for column in (lats, lngs, times))
+    return zlib.compress(header + columns, 9)
+
+
+def unpack(data):
+    """pack()으로 만든 bytes를 (시각, 위도, 경도) 목록으로 되돌립니다."""
+    raw = zlib.decompress(bytes(data))
+    version, count, first_time, first_lat, first_lng = _HEADER.unpack_from(raw)
+    if version != FORMAT_VERSION:
+        raise ValueError(f'지원하지 않는 포인트 저장 형식입니다: {version}')
+    if count == 0:
+        return []
+
+    deltas = np.frombuffer(raw, dtype='<i4', offset=_HEADER.size).astype(np.int64).reshape(3, count - 1)
+    lats = np.concatenate(([first_lat], first_lat + np.cumsum(deltas[0]))) / COORDINATE_SCALE
+    lngs = np.concatenate(([first_lng], first_lng + np.cumsum(deltas[1]))) / COORDINATE_SCALE
+    times = np.concatenate(([first_time], first_time + np.cumsum(deltas[2])))
+
+    return [
+        (_EPOCH + timedelta(milliseconds=int(ms)), float(lat), float(lng))
+        for ms, lat, lng in zip(times, lats, lngs)
+    ]
+
+
+def iter_point_chunks(track, chunk_size=2000):
+    """트랙의 포인트를 시간순으로 chunk_size개씩 나눠 돌려줍니다. (압축 보관된 트랙도 동일)"""
+    if track.packed_points is not None:
+        points = unpack(track.packed_points)
+        for i in range(0, len(points), chunk_size):
+            yield points[i:i + chunk_size]
+        return
+
+    chunk = []
+    for point in track.track_points.order_by('timestamp', 'id').values_list(
+            'timestamp', 'latitude', 'longitude').iterator(chunk_size=chunk_size):
+        chunk.append(point)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_points(track):
+    """트랙의 모든 포인트를 시간순 (시각, 위도, 경도) 목록으로 반환합니다."""
+    if track.packed_points is not None:
+        return unpack(track.packed_points)
+    return list(track.track_points.order_by('timestamp', 'id').values_list('timestamp', 'latitude', 'longitude'))
+
+
+def point_rows(track):
+    """
+    트랙의 포인트를 TrackPoint 객체 목록으로 반환합니다. (미리 읽은 track_points가 있으면 사용)
+    압축 보관된 트랙은 압축을 푼 저장되지 않은 객체(id 없음)를 돌려줍니다.
+    """
+    rows = list(track.track_points.all())
+    if rows or track.packed_points is None:
+        return rows
+    return [
+        TrackPoint(walking_track_id=track.pk, timestamp=timestamp, latitude=lat, longitude=lng)
+        for timestamp, lat, lng in unpack(track.packed_points)
+    ]
@@ -6,7 +6,7 @@ from .views import (
     PetViewSet, AdoptionStoryViewSet, EventViewSet, SupportViewSet,
     UserViewSet, # Added UserViewSet import
 )
-from .views import reverse_geocode
+from .views import reverse_geocode, places_nearby, place_clusters, place_cache_stats
 from .auth_views import social_login
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -24,8 +24,10 @@ from .pet_worker_views.booking_views import (
     BookingViewSet, PaymentViewSet
 )
 from .pet_worker_views.tracking_views import (
-    WalkingTrackViewSet, TrackPointViewSet, WalkingEventViewSet, SafetyAlertViewSet
+    WalkingTrackViewSet, TrackPointViewSet, WalkingEventViewSet, SafetyAlertViewSet, SafeZoneViewSet,
+    MyWalkHeatmapView
 )
+from .pet_worker_views.live_views import walking_track_live
 from .pet_worker_views.community_views import (
     ReviewViewSet, MessageViewSet, CommunityPostViewSet, 
     PostImageViewSet, CommentViewSet, PostLikeViewSet
@@ -36,7 +38,8 @@ from .pet_worker_views.ai_matching_views import (
 )
 # 관리자 보고서 뷰 임포트
 from .pet_worker_views.admin_report_views import (
-    MonthlyStatsView, ServiceStatsView, LocationStatsView, PetTypeStatsView, SummaryStatsView
+    MonthlyStatsView, ServiceStatsView, LocationStatsView, PetTypeStatsView, SummaryStatsView,
+    WalkHeatmapView
 )
 
 # 기존 라우터
@@ -72,6 +75,7 @@ pet_worker_router.register(r'walking-tracks', WalkingTrackViewSet)
 pet_worker_router.register(r'track-points', TrackPointViewSet)
 pet_worker_router.register(r'walking-events', WalkingEventViewSet)
 pet_worker_router.register(r'safety-alerts', SafetyAlertViewSet, basename='safety-alerts')
+pet_worker_router.register(r'safe-zones', SafeZoneViewSet)
 # 커뮤니티 관련
 pet_worker_router.register(r'reviews', ReviewViewSet)
 pet_worker_router.register(r'messages', MessageViewSet)
@@ -93,11 +97,16 @@ urlpatterns = [
     path('hospitals/nearby/', HospitalViewSet.as_view({'get': 'nearby'}), name='hospital-nearby'),
     path('salons/nearby/', SalonViewSet.as_view({'get': 'nearby'}), name='salon-nearby'),
     path('supports/nearby/', SupportViewSet.as_view({'get': 'nearby'}), name='support-nearby'),
+    path('places/nearby/', places_nearby, name='places-nearby'),
+    path('places/clusters/', place_clusters, name='place-clusters'),
+    path('places/cache-stats/', place_cache_stats, name='place-cache-stats'),
     
     # 인증 관련 URL 패턴
     path('auth/social-login/', social_login, name='social-login'),
     
     # 펫워커 서비스 URL 패턴
+    path('pet-worker/walking-tracks/<int:pk>/live/', walking_track_live, name='walking-track-live'),
+    path('pet-worker/walk-heatmap/', MyWalkHeatmapView.as_view(), name='my-walk-heatmap'),
     path('pet-worker/', include(pet_worker_router.urls)),
     
     # AI 매칭 관련 URL 패턴
@@ -115,6 +124,7 @@ urlpatterns = [
     path('admin/reports/location-stats/', LocationStatsView.as_view(), name='admin-location-stats'),
     path('admin/reports/pet-type-stats/', PetTypeStatsView.as_view(), name='admin-pet-type-stats'),
     path('admin/reports/summary-stats/', SummaryStatsView.as_view(), name='admin-summary-stats'),
+    path('admin/reports/walk-heatmap/', WalkHeatmapView.as_view(), name='admin-walk-heatmap'),
     
     path('reverse-geocode/', reverse_geocode, name='reverse-geocode'),
 ]
@@ -0,0 +1,107 @@
+# hyper_pets_backend/api/view_counter.py
+"""
+게시글 조회수 버퍼.
+
+게시글 상세 조회마다 행을 UPDATE하지 않고 프로세스 메모리에 게시글별 증가분만 쌓아 두었다가,
+백그라운드 스레드가 VIEW_COUNT_FLUSH_SECONDS초마다 모아서 한 번에 반영합니다.
+(UPDATE ... SET view_count = view_count + CASE id WHEN .. THEN .. END, FLUSH_BATCH_SIZE개씩)
+인기 게시글에 조회가 몰려도 한 행의 잠금을 두고 요청들이 기다리지 않습니다.
+- 응답의 조회수는 DB 값에 이 프로세스에서 아직 반영하지 않은 증가분(pending)을 더해 보여 줍니다.
+- 버퍼는 프로세스별이므로 다른 워커의 미반영 증가분은 최대 한 주기만큼 늦게 보입니다.
+- 프로세스 종료 시 남은 증가분을 반영하며, 강제 종료되면 마지막 주기의 증가분은 잃을 수 있습니다.
+- VIEW_COUNT_FLUSH_SECONDS가 0이면 버퍼 없이 조회마다 바로 반영합니다.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import CommunityPost
+
+DEFAULT_FLUSH_SECONDS = 5
+FLUSH_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._flushing = {}  # 반영 중인 증가분 합계 (동시에 여러 flush가 돌 수 있음, UPDATE가 끝날 때까지 pending에 포함)
+        self._pid = None
+
+    def record(self, pk, count=1):
+        interval = getattr(settings, 'VIEW_COUNT_FLUSH_SECONDS', DEFAULT_FLUSH_SECONDS)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._start(interval)
+            self._pending[pk] = self._pending.get(pk, 0) + count
+        if interval <= 0:
+            self.flush()
+
+    def pending(self, pk):
+        """아직 DB에 반영되지 않은 증가분"""
+        with self._lock:
+            return self._pending.get(pk, 0) + self._flushing.get(pk, 0)
+
+    def flush(self):
+        """쌓인 증가분을 DB에 반영합니다. 반환값: 반영한 행 수"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            for pk, count in batch.items():
+                self._flushing[pk] = self._flushing.get(pk, 0) + count
+        if not batch:
+            return 0
+
+        items = list(batch.items())
+        done = 0
+        try:
+            for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                chunk = items[start:start + FLUSH_BATCH_SIZE]
+                delta = Case(
+                    *[When(pk=pk, then=Value(count)) for pk, count in chunk],
+                    default=Value(0), output_field=IntegerField()
+                )
+                self.model.objects.filter(pk__in=[pk for pk, _ in chunk]).update(**{self.field: F(self.field) + delta})
+                done = start + len(chunk)
+        except DatabaseError:
+            logger.exception('조회수 반영 실패, 다음 주기에 다시 시도합니다.')
+            with self._lock:
+                for pk, count in items[done:]:
+                    self._pending[pk] = self._pending.get(pk, 0) + count
+        finally:
+            # 이 flush가 맡은 몫만 뺌 (실패해 pending으로 되돌린 증가분 포함)
+            with self._lock:
+                for pk, count in items:
+                    remaining = self._flushing.get(pk, 0) - count
+                    if remaining > 0:
+                        self._flushing[pk] = remaining
+                    else:
+                        self._flushing.pop(pk, None)
+        return done
+
+    def _start(self, interval):
+        # 처음 기록할 때, 또는 fork된 자식 프로세스에서 처음 기록할 때 (부모의 미반영 증가분은 부모가 반영)
+        self._pid = os.getpid()
+        self._pending = {}
+        self._flushing = {}
+        if interval > 0:
+            threading.Thread(target=self._run, args=(interval,), name='view-counter-flush', daemon=True).start()
+
+    def _run(self, interval):
+        while True:
+            time.sleep(interval)
+            self.flush()
+            close_old_connections()
+
+
+post_views = ViewCounter(CommunityPost, 'view_count')
+atexit.register(post_views.flush)
@@ -1,19 +1,19 @@
 # hyper_pets_backend/api/views.py
-import math,os
-import requests
 from django.utils import timezone
 from django.http import JsonResponse
 from rest_framework import viewsets, status, permissions
 from rest_framework.response import Response
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, permission_classes
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from . import geo, geocoding, places, region_locator, spatial_index, tile_cache
 from .models import (
     Category, Shelter, Hospital, Salon, Pet, AdoptionStory, Event, Support,
     CustomUser
 )
 
+from .query_plans import SparseFieldsMixin
 from .serializers import (
     CategorySerializer, ShelterSerializer, HospitalSerializer, SalonSerializer,
     PetSerializer, AdoptionStorySerializer, EventSerializer, SupportSerializer,
@@ -22,119 +22,39 @@ from .serializers import (
 
 User = get_user_model()
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
-class ShelterViewSet(viewsets.ModelViewSet):
-    queryset = Shelter.objects.all().order_by('name')
-    serializer_class = ShelterSerializer
+class NearbyPlaceMixin:
+    """
+    메모리 공간 인덱스(api.spatial_index)로 가까운 장소를 찾는 nearby 액션.
+    선택된 장소의 직렬화 결과는 지도 타일 단위 캐시(api.tile_cache)에서 가져오고,
+    각 결과에 거리(distance_m)를 붙여 반환합니다.
+    """
+    nearby_limit = geo.DEFAULT_LIMIT  # 가까운 30개만 반환
 
     @action(detail=False, methods=['GET'])
     def nearby(self, request):
-        # Check if bounding box parameters are provided
-        if all(param in request.query_params for param in ['startX', 'startY', 'endX', 'endY']):
-            # Bounding box approach (similar to Hogangnono)
-            start_x = float(request.query_params.get('startX'))
-            start_y = float(request.query_params.get('startY'))
-            end_x = float(request.query_params.get('endX'))
-            end_y = float(request.query_params.get('endY'))
-            
-            # Get locations within the bounding box
-            queryset = self.get_queryset().filter(
-                latitude__range=(min(start_y, end_y), max(start_y, end_y)),
-                longitude__range=(min(start_x, end_x), max(start_x, end_x))
-            )
-            
-            # Get center point for distance calculation
-            lat = float(request.query_params.get('lat', (start_y + end_y) / 2))
-            lng = float(request.query_params.get('lng', (start_x + end_x) / 2))
-            
-        else:
-            # Fallback to radius-based search
-            lat = float(request.query_params.get('lat', 0))
-            lng = float(request.query_params.get('lng', 0))
-            radius = float(request.query_params.get('radius', 5000)) / 1000  # Convert meters to km
-            
-            # 위도 1도 = 약 111km, 경도 1도는 위도에 따라 달라짐
-            lat_km = 111.0
-            lng_km = lat_km * abs(math.cos(math.radians(lat)))
-            
-            lat_range = radius / lat_km
-            lng_range = radius / lng_km
-            
-            queryset = self.get_queryset().filter(
-                latitude__range=(lat - lat_range, lat + lat_range),
-                longitude__range=(lng - lng_range, lng + lng_range)
-            )
-        
-        # 실제 거리 계산 및 정렬
-        queryset = sorted(
-            queryset,
-            key=lambda x: (
-                (x.latitude - lat) ** 2 + 
-                (x.longitude - lng) ** 2
-            ) ** 0.5
-        )[:30]  # 가까운 30개만 반환 (증가)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        lat, lng, bbox, radius_m = geo.get_nearby_area(request.query_params)
+
+        index = spatial_index.get_index(self.queryset.model)
+        nearest = index.nearest(lat, lng, self.nearby_limit, bbox=bbox, radius_m=radius_m)
+        ids = [pk for pk, _ in nearest]
+
+        # 캐시에 없는 타일의 장소만 DB에서 읽어 직렬화 (거리 순서 유지)
+        data = tile_cache.get_serialized(self.get_queryset(), self.get_serializer_class(), ids)
+        return Response(geo.attach_distances(data, dict(nearest)))
 
-class HospitalViewSet(viewsets.ModelViewSet):
+class ShelterViewSet(SparseFieldsMixin, NearbyPlaceMixin, viewsets.ModelViewSet):
+    queryset = Shelter.objects.all().order_by('name')
+    serializer_class = ShelterSerializer
+
+class HospitalViewSet(SparseFieldsMixin, NearbyPlaceMixin, viewsets.ModelViewSet):
     queryset = Hospital.objects.all().order_by('name')
     serializer_class = HospitalSerializer
 
-    @action(detail=False, methods=['GET'])
-    def nearby(self, request):
-        # Check if bounding box parameters are provided
-        if all(param in request.query_params for param in ['startX', 'startY', 'endX', 'endY']):
-            # Bounding box approach (similar to Hogangnono)
-            start_x = float(request.query_params.get('startX'))
-            start_y = float(request.query_params.get('startY'))
-            end_x = float(request.query_params.get('endX'))
-            end_y = float(request.query_params.get('endY'))
-            
-            # Get locations within the bounding box
-            queryset = self.get_queryset().filter(
-                latitude__range=(min(start_y, end_y), max(start_y, end_y)),
-                longitude__range=(min(start_x, end_x), max(start_x, end_x))
-            )
-            
-            # Get center point for distance calculation
-            lat = float(request.query_params.get('lat', (start_y + end_y) / 2))
-            lng = float(request.query_params.get('lng', (start_x + end_x) / 2))
-            
-        else:
-            # Fallback to radius-based search
-            lat = float(request.query_params.get('lat', 0))
-            lng = float(request.query_params.get('lng', 0))
-            radius = float(request.query_params.get('radius', 5000)) / 1000  # Convert meters to km
-            
-            # 위도 1도 = 약 111km, 경도 1도는 위도에 따라 달라짐
-            lat_km = 111.0
-            lng_km = lat_km * abs(math.cos(math.radians(lat)))
-            
-            lat_range = radius / lat_km
-            lng_range = radius / lng_km
-            
-            queryset = self.get_queryset().filter(
-                latitude__range=(lat - lat_range, lat + lat_range),
-                longitude__range=(lng - lng_range, lng + lng_range)
-            )
-        
-        # 실제 거리 계산 및 정렬
-        queryset = sorted(
-            queryset,
-            key=lambda x: (
-                (x.latitude - lat) ** 2 + 
-                (x.longitude - lng) ** 2
-            ) ** 0.5
-        )[:30]  # 가까운 30개만 반환 (증가)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
-
-class PetViewSet(viewsets.ModelViewSet):
+class PetViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Pet.objects.all()
     serializer_class = PetSerializer
 
@@ -153,11 +73,11 @@ class PetViewSet(viewsets.ModelViewSet):
 
         return queryset
 
-class AdoptionStoryViewSet(viewsets.ModelViewSet):
+class AdoptionStoryViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = AdoptionStory.objects.all().order_by('-created_at')
     serializer_class = AdoptionStorySerializer
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all().order_by('date')
     serializer_class = EventSerializer
 
@@ -171,8 +91,8 @@ class EventViewSet(viewsets.ModelViewSet):
         
         return queryset
 
-class SupportViewSet(viewsets.ModelViewSet):
-    queryset = Support.objects.all()
+class SupportViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = Support.objects.prefetch_related('regions')
     serializer_class = SupportSerializer
     
     def get_queryset(self):
@@ -193,115 +113,29 @@ class SupportViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['GET'])
     def nearby(self, request):
         """위치 기반으로 주변 지원 정책을 검색합니다."""
-        # 위치 정보가 있는 지원 정책만 필터링
-        base_queryset = self.get_queryset().filter(
-            latitude__isnull=False,
-            longitude__isnull=False
-        )
+        # 지도 표시 위치(map_*, 연결 지역 좌표 포함)가 계산된 지원 정책만 필터링 (places/클러스터와 같은 좌표)
+        lat_field, lng_field = spatial_index.location_fields(Support)
+        base_queryset = self.get_queryset().filter(**{
+            f'{lat_field}__isnull': False,
+            f'{lng_field}__isnull': False,
+        })
         
-        # 바운딩 박스 파라미터 확인
-        if all(param in request.query_params for param in ['startX', 'startY', 'endX', 'endY']):
-            # 바운딩 박스 접근법
-            start_x = float(request.query_params.get('startX'))
-            start_y = float(request.query_params.get('startY'))
-            end_x = float(request.query_params.get('endX'))
-            end_y = float(request.query_params.get('endY'))
-            
-            # 바운딩 박스 내의 지원 정책 필터링
-            queryset = base_queryset.filter(
-                latitude__range=(min(start_y, end_y), max(start_y, end_y)),
-                longitude__range=(min(start_x, end_x), max(start_x, end_x))
-            )
-            
-            # 거리 계산을 위한 중심점
-            lat = float(request.query_params.get('lat', (start_y + end_y) / 2))
-            lng = float(request.query_params.get('lng', (start_x + end_x) / 2))
-            
-        else:
-            # 반경 기반 검색 (대체 방법)
-            lat = float(request.query_params.get('lat', 0))
-            lng = float(request.query_params.get('lng', 0))
-            radius = float(request.query_params.get('radius', 5000)) / 1000  # 미터에서 km로 변환
-            
-            # 위도 1도 = 약 111km, 경도 1도는 위도에 따라 달라짐
-            lat_km = 111.0
-            lng_km = lat_km * abs(math.cos(math.radians(lat)))
-            
-            lat_range = radius / lat_km
-            lng_range = radius / lng_km
-            
-            queryset = base_queryset.filter(
-                latitude__range=(lat - lat_range, lat + lat_range),
-                longitude__range=(lng - lng_range, lng + lng_range)
-            )
+        lat, lng, bbox, radius_m = geo.get_nearby_area(request.query_params)
+        queryset = geo.bbox_filter(base_queryset, bbox, lat_field=lat_field, lng_field=lng_field)
         
-        # 실제 거리 계산 및 정렬
-        queryset = sorted(
-            queryset,
-            key=lambda x: (
-                (x.latitude - lat) ** 2 + 
-                (x.longitude - lng) ** 2
-            ) ** 0.5
-        )[:30]  # 가까운 30개만 반환
+        # 실제 거리(하버사인) 계산 및 정렬, 가까운 30개만 반환
+        supports, distances = geo.nearest_in_queryset(
+            queryset, lat, lng, radius_m=radius_m, lat_field=lat_field, lng_field=lng_field
+        )
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        serializer = self.get_serializer(supports, many=True)
+        return Response(geo.attach_distances(serializer.data, distances))
 
-class SalonViewSet(viewsets.ModelViewSet):
+class SalonViewSet(SparseFieldsMixin, NearbyPlaceMixin, viewsets.ModelViewSet):
     queryset = Salon.objects.all().order_by('name')
     serializer_class = SalonSerializer
 
-    @action(detail=False, methods=['GET'])
-    def nearby(self, request):
-        # Check if bounding box parameters are provided
-        if all(param in request.query_params for param in ['startX', 'startY', 'endX', 'endY']):
-            # Bounding box approach (similar to Hogangnono)
-            start_x = float(request.query_params.get('startX'))
-            start_y = float(request.query_params.get('startY'))
-            end_x = float(request.query_params.get('endX'))
-            end_y = float(request.query_params.get('endY'))
-            
-            # Get locations within the bounding box
-            queryset = self.get_queryset().filter(
-                latitude__range=(min(start_y, end_y), max(start_y, end_y)),
-                longitude__range=(min(start_x, end_x), max(start_x, end_x))
-            )
-            
-            # Get center point for distance calculation
-            lat = float(request.query_params.get('lat', (start_y + end_y) / 2))
-            lng = float(request.query_params.get('lng', (start_x + end_x) / 2))
-            
-        else:
-            # Fallback to radius-based search
-            lat = float(request.query_params.get('lat', 0))
-            lng = float(request.query_params.get('lng', 0))
-            radius = float(request.query_params.get('radius', 5000)) / 1000  # Convert meters to km
-            
-            # 위도 1도 = 약 111km, 경도 1도는 위도에 따라 달라짐
-            lat_km = 111.0
-            lng_km = lat_km * abs(math.cos(math.radians(lat)))
-            
-            lat_range = radius / lat_km
-            lng_range = radius / lng_km
-            
-            queryset = self.get_queryset().filter(
-                latitude__range=(lat - lat_range, lat + lat_range),
-                longitude__range=(lng - lng_range, lng + lng_range)
-            )
-        
-        # 실제 거리 계산 및 정렬
-        queryset = sorted(
-            queryset,
-            key=lambda x: (
-                (x.latitude - lat) ** 2 + 
-                (x.longitude - lng) ** 2
-            ) ** 0.5
-        )[:30]  # 가까운 30개만 반환 (증가)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
-
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
 
@@ -408,6 +242,58 @@ class UserViewSet(viewsets.ModelViewSet):
                 return Response(serializer.data)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['GET'])
+def places_nearby(request):
+    """
+    보호소/병원/미용실/지원사업을 한 번에 검색해 거리순으로 합친 목록을 반환합니다.
+    types(예: shelter,hospital,salon,support)와 limit(기본 30, 최대 100) 파라미터를 받으며,
+    위치 파라미터는 각 nearby 액션과 같습니다.
+    """
+    try:
+        lat, lng, bbox, radius_m = geo.get_nearby_area(request.query_params)
+        place_types = places.parse_place_types(request.query_params.get('types'))
+        limit = places.parse_limit(request.query_params.get('limit'))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(places.get_nearby(lat, lng, bbox, radius_m, place_types, limit))
+
+@api_view(['GET'])
+def place_clusters(request):
+    """
+    지도 영역(startX/startY/endX/endY)과 줌 레벨(zoom)에 맞춰
+    보호소/병원/미용실/지원사업 마커를 타일 단위 클러스터로 묶어 반환합니다.
+    types 파라미터(예: shelter,hospital)로 종류를 제한할 수 있습니다.
+    """
+    params = request.query_params
+    if not all(param in params for param in ['startX', 'startY', 'endX', 'endY', 'zoom']):
+        return Response({'error': 'startX, startY, endX, endY, zoom 파라미터는 필수 항목입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        start_x, start_y = float(params['startX']), float(params['startY'])
+        end_x, end_y = float(params['endX']), float(params['endY'])
+        zoom = int(params['zoom'])
+        place_types = places.parse_place_types(params.get('types'))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not 0 <= zoom <= places.MAX_ZOOM:
+        return Response({'error': f'zoom은 0에서 {places.MAX_ZOOM} 사이여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    bbox = (min(start_y, end_y), min(start_x, end_x), max(start_y, end_y), max(start_x, end_x))
+    try:
+        clusters = places.get_clusters(bbox, zoom, place_types)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({'zoom': zoom, 'clusters': clusters})
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def place_cache_stats(request):
+    """지도 조회 캐시(타일별 장소 목록, 클러스터)의 적중/실패 횟수 (현재 프로세스 기준)"""
+    return Response(tile_cache.stats())
+
 @api_view(['GET'])
 def reverse_geocode(request):
     lat = request.GET.get('lat')
@@ -416,19 +302,20 @@ def reverse_geocode(request):
     if not lat or not lng:
         return JsonResponse({'error': 'Missing lat or lng'}, status=400)
 
-    NAVER_API_URL = 'https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc'
-    headers = {
-        'X-NCP-APIGW-API-KEY-ID': os.getenv('NAVER_CLIENT_ID'),
-        'X-NCP-APIGW-API-KEY': os.getenv('NAVER_CLIENT_SECRET'),
-    }
-    params = {
-        'coords': f'{lng},{lat}',
-        'output': 'json',
-        'orders': 'legalcode,admcode',
-    }
+    try:
+        lat, lng = float(lat), float(lng)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid lat or lng'}, status=400)
+
+    # 구/동 정보는 Region 데이터로 바로 응답하고, 도로명 주소가 필요하거나 등록된 지역 밖이면 네이버 API 사용
+    road = request.GET.get('detail') == 'road'
+    if not road:
+        data = region_locator.reverse_geocode(lat, lng)
+        if data is not None:
+            return JsonResponse(data)
 
     try:
-        res = requests.get(NAVER_API_URL, headers=headers, params=params)
-        return JsonResponse(res.json(), status=res.status_code)
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
+        data, status_code = geocoding.reverse_geocode(lat, lng, road=road)
+    except geocoding.GeocodingError as e:
+        return JsonResponse({'error': str(e)}, status=500)
+    return JsonResponse(data, status=status_code)
\ No newline at end of file
@@ -0,0 +1,161 @@
+# hyper_pets_backend/api/walk_heatmap.py
+"""
+산책 히트맵 집계.
+
+산책이 완료되면(signals) 트랙의 포인트를 한 번 읽어 고정 격자(CELL_SIZE) 칸별로 포인트 수와 머문 시간을 구해
+WalkHeatmapCell(날짜, 펫시터, 칸)에 더하고 WalkingTrack.heatmap_aggregated를 켭니다.
+조회는 이 집계 테이블에서 지도 영역과 기간에 해당하는 칸만 읽으므로 TrackPoint를 읽지 않습니다.
+반영에 실패했거나 누락된 트랙은 heatmap_aggregated가 꺼진 채로 남으며 rollup_walk_heatmap 명령으로 다시 반영합니다.
+"""
+import logging
+import math
+
+import numpy as np
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from . import track_storage
+from .models import WalkingTrack, WalkHeatmapCell, Booking
+from .track_ingest import MAX_MOVING_GAP
+
+CELL_SIZE = 0.001  # 약 100m
+MAX_RESPONSE_CELLS = 5000  # 응답 칸 수가 이보다 많으면 여러 칸을 묶어 반환
+
+logger = logging.getLogger(__name__)
+
+
+def bin_points(points):
+    """
+    시간순 (시각, 위도, 경도) 목록을 격자 칸별로 모읍니다.
+    반환값: [(row, col, 포인트 수, 머문 시간(초)), ...]
+    머문 시간은 각 구간의 시간을 시작 포인트의 칸에 더하며, MAX_MOVING_GAP보다 긴 구간은 제외합니다.
+    """
+    if not points:
+        return []
+
+    lats = np.array([point[1] for point in points], dtype=float)
+    lngs = np.array([point[2] for point in points], dtype=float)
+    seconds = np.array([(point[0] - points[0][0]).total_seconds() for point in points])
+
+    gaps = np.diff(seconds)
+    durations = np.append(np.where(gaps <= MAX_MOVING_GAP, gaps, 0.0), 0.0)
+
+    cells = np.stack([np.floor(lats / CELL_SIZE), np.floor(lngs / CELL_SIZE)], axis=1).astype(np.int64)
+    unique_cells, inverse = np.unique(cells, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    counts = np.bincount(inverse)
+    totals = np.bincount(inverse, weights=durations)
+
+    return [
+        (int(row), int(col), int(count), float(total))
+        for (row, col), count, total in zip(unique_cells, counts, totals)
+    ]
+
+
+def _apply(track_id):
+    track = WalkingTrack.objects.select_for_update().get(pk=track_id)
+    if track.heatmap_aggregated or track.status != 'completed':
+        return 0
+
+    points = track_storage.load_points(track)
+    binned = bin_points(points)
+    if binned:
+        day = timezone.localdate(track.start_time or points[0][0])
+        pet_sitter_id = Booking.objects.values_list('pet_sitter_id', flat=True).get(pk=track.booking_id)
+
+        rows = {cell[0] for cell in binned}
+        cols = {cell[1] for cell in binned}
+        existing = {
+            (cell.row, cell.col): cell
+            for cell in WalkHeatmapCell.objects.select_for_update().filter(
+                date=day, pet_sitter_id=pet_sitter_id, row__in=rows, col__in=cols
+            )
+        }
+
+        created, updated = [], []
+        for row, col, count, duration in binned:
+            cell = existing.get((row, col))
+            if cell is None:
+                created.append(WalkHeatmapCell(
+                    date=day, pet_sitter_id=pet_sitter_id, row=row, col=col,
+                    point_count=count, track_count=1, duration=duration
+                ))
+            else:
+                cell.point_count += count
+                cell.track_count += 1
+                cell.duration += duration
+                updated.append(cell)
+        WalkHeatmapCell.objects.bulk_create(created)
+        WalkHeatmapCell.objects.bulk_update(updated, ['point_count', 'track_count', 'duration'])
+
+    track.heatmap_aggregated = True
+    track.save(update_fields=['heatmap_aggregated', 'updated_at'])
+    return len(binned)
+
+
+def aggregate_track(track_id):
+    """
+    완료된 트랙을 히트맵 집계에 한 번 반영합니다. 반환값: 반영한 칸 수 (이미 반영됐거나 완료 전이면 0)
+    산책 완료 커밋 후(on_commit)에 호출되므로 실패해도 예외를 올리지 않고, 트랙은 반영 전 상태로 남겨
+    rollup_walk_heatmap 명령이 다시 반영하게 합니다.
+    """
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                return _apply(track_id)
+        except IntegrityError:
+            # 같은 날 같은 펫시터의 다른 트랙이 동시에 새 칸을 만든 경우: 한 번 더 시도
+            if attempt:
+                logger.exception('산책 히트맵 반영 실패 (트랙 %s), rollup_walk_heatmap으로 다시 반영합니다.', track_id)
+    return 0
+
+
+def query(bbox, start_date, end_date, pet_sitter_id=None):
+    """
+    지도 영역(min_lat, min_lng, max_lat, max_lng)과 기간의 히트맵 칸 목록.
+    칸이 MAX_RESPONSE_CELLS보다 많으면 인접한 칸을 묶어 반환합니다.
+    """
+    min_lat, min_lng, max_lat, max_lng = bbox
+    row_lo, row_hi = math.floor(min_lat / CELL_SIZE), math.floor(max_lat / CELL_SIZE)
+    col_lo, col_hi = math.floor(min_lng / CELL_SIZE), math.floor(max_lng / CELL_SIZE)
+
+    queryset = WalkHeatmapCell.objects.filter(
+        date__gte=start_date, date__lte=end_date,
+        row__gte=row_lo, row__lte=row_hi, col__gte=col_lo, col__lte=col_hi
+    )
+    if pet_sitter_id is not None:
+        queryset = queryset.filter(pet_sitter_id=pet_sitter_id)
+
+    rows = list(queryset.values_list('row', 'col').annotate(
+        points=Sum('point_count'), tracks=Sum('track_count'), seconds=Sum('duration')
+    ).order_by())
+    if not rows:
+        return {'cell_size': CELL_SIZE, 'cells': []}
+
+    data = np.array(rows, dtype=float)
+    factor = max(1, math.ceil(math.sqrt(len(rows) / MAX_RESPONSE_CELLS)))
+    if factor > 1:
+        # factor x factor 칸씩 묶어 합계
+        cells = np.floor_divide(data[:, :2], factor).astype(np.int64)
+        unique_cells, inverse = np.unique(cells, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        data = np.column_stack([
+            unique_cells,
+            *(np.bincount(inverse, weights=data[:, i]) for i in (2, 3, 4)),
+        ])
+
+    size = CELL_SIZE * factor
+    return {
+        'cell_size': size,
+        'cells': [
+            {
+                'latitude': round((row + 0.5) * size, 6),
+                'longitude': round((col + 0.5) * size, 6),
+                'point_count': int(points),
+                'track_count': int(tracks),
+                'duration': round(seconds, 1),
+            }
+            for row, col, points, tracks, seconds in data.tolist()
+        ],
+    }
@@ -5,6 +5,9 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
+
+산책 실시간 중계(api/pet_worker_views/live_views.py)는 비동기 뷰이므로 ASGI 서버로 실행합니다.
+    uvicorn hyper_pets_backend.asgi:application --host 0.0.0.0 --port 8000
 """
 
 import os
@@ -0,0 +1,14 @@
+"""
+ASGI config for hyper_pets_backend project in production.
+
+산책 실시간 중계(SSE)는 비동기 뷰이므로 WSGI(uwsgi, runserver)가 아닌 이 ASGI 앱으로 실행합니다.
+    uvicorn hyper_pets_backend.production.asgi:application --host 0.0.0.0 --port 8000
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hyper_pets_backend.production.settings')
+
+application = get_asgi_application()
@@ -14,6 +14,61 @@ DEBUG = os.getenv('DEBUG', 'True') == 'True'
 # Naver Maps API Settings
 NAVER_CLIENT_ID = os.getenv('NAVER_CLIENT_ID')
 NAVER_CLIENT_SECRET = os.getenv('NAVER_CLIENT_SECRET')
+# 네이버 API 연결/응답 대기 시간 (초)
+NAVER_API_CONNECT_TIMEOUT = float(os.getenv('NAVER_API_CONNECT_TIMEOUT', '1.0'))
+NAVER_API_READ_TIMEOUT = float(os.getenv('NAVER_API_READ_TIMEOUT', '3.0'))
+# 리버스 지오코딩 결과 캐시 유지 시간 (초)과 프로세스 메모리 캐시 크기
+REVERSE_GEOCODE_CACHE_TTL = int(os.getenv('REVERSE_GEOCODE_CACHE_TTL', str(60 * 60 * 24 * 7)))
+REVERSE_GEOCODE_MEMORY_CACHE_SIZE = int(os.getenv('REVERSE_GEOCODE_MEMORY_CACHE_SIZE', '10000'))
+# 로컬(Region 중심점) 리버스 지오코딩을 사용할 최대 거리 (m, 더 멀면 네이버 API 사용)
+OFFLINE_GEOCODE_MAX_DISTANCE_M = float(os.getenv('OFFLINE_GEOCODE_MAX_DISTANCE_M', '15000'))
+
+# 캐시 서버 주소 (지정하면 모든 워커가 같은 Redis 캐시를 공유, 없으면 프로세스별 메모리 캐시)
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL}}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# 보호소/병원/미용실 nearby 조회용 메모리 공간 인덱스 재생성 주기 (초)
+SPATIAL_INDEX_TTL = int(os.getenv('SPATIAL_INDEX_TTL', '300'))
+# 지도 클러스터 타일 캐시 유지 시간 (초, 좌표가 바뀌면 그 전에 자동 갱신)
+PLACE_CLUSTER_CACHE_TIMEOUT = int(os.getenv('PLACE_CLUSTER_CACHE_TIMEOUT', '3600'))
+# nearby 응답용 장소 직렬화 결과를 캐시하는 타일의 줌 레벨과 유지 시간 (초)
+PLACE_TILE_CACHE_ZOOM = int(os.getenv('PLACE_TILE_CACHE_ZOOM', '15'))
+PLACE_TILE_CACHE_TIMEOUT = int(os.getenv('PLACE_TILE_CACHE_TIMEOUT', '3600'))
+# 지도 타일/클러스터 캐시 사용 여부 (공유 캐시(REDIS_URL)가 없으면 설정과 관계없이 사용하지 않음)
+PLACE_TILE_CACHE_ENABLED = os.getenv('PLACE_TILE_CACHE_ENABLED', 'True') == 'True'
+# 산책 위치 포인트 일괄 저장 시 한 번에 받을 수 있는 최대 포인트 수
+TRACK_POINT_BATCH_MAX_SIZE = int(os.getenv('TRACK_POINT_BATCH_MAX_SIZE', '1000'))
+# 위치 포인트 시각 허용 범위: 산책 시작 시각보다 이른 정도와 서버 시각보다 늦은 정도 (초, 벗어나면 400)
+TRACK_POINT_START_SLACK_SECONDS = int(os.getenv('TRACK_POINT_START_SLACK_SECONDS', '300'))
+TRACK_POINT_MAX_CLOCK_SKEW_SECONDS = int(os.getenv('TRACK_POINT_MAX_CLOCK_SKEW_SECONDS', '120'))
+# 산책 위치 포인트/이벤트 월 단위 파티션을 미리 만들 개월 수와 보관 기간 (개월, 0이면 삭제하지 않음)
+TRACK_PARTITION_MONTHS_AHEAD = int(os.getenv('TRACK_PARTITION_MONTHS_AHEAD', '3'))
+TRACK_POINT_RETENTION_MONTHS = int(os.getenv('TRACK_POINT_RETENTION_MONTHS', '6'))
+WALKING_EVENT_RETENTION_MONTHS = int(os.getenv('WALKING_EVENT_RETENTION_MONTHS', '0'))
+# 저장 전 GPS 필터 사용 여부와 칼만 필터 좌표 보정 사용 여부 (api.track_filter)
+TRACK_FILTER_ENABLED = os.getenv('TRACK_FILTER_ENABLED', 'True') == 'True'
+TRACK_FILTER_SMOOTHING = os.getenv('TRACK_FILTER_SMOOTHING', 'False') == 'True'
+# 완료된 산책의 단순화 경로(geometry) 캐시 유지 시간 (초)
+TRACK_GEOMETRY_CACHE_TIMEOUT = int(os.getenv('TRACK_GEOMETRY_CACHE_TIMEOUT', str(60 * 60 * 24)))
+# 산책 실시간 중계 발행/구독 백엔드 (REDIS_URL이 있으면 워커 간 전달, 없으면 같은 프로세스 안에서만 전달)와 구독자별 대기 메시지 수
+LIVE_BACKEND = os.getenv('LIVE_BACKEND', 'api.live.RedisBackend' if REDIS_URL else 'api.live.InProcessBackend')
+LIVE_QUEUE_SIZE = int(os.getenv('LIVE_QUEUE_SIZE', '256'))
+# RedisBackend 발행 시 Redis 응답을 기다리는 최대 시간(초): 넘으면 중계만 건너뛰고 요청은 그대로 성공
+LIVE_REDIS_TIMEOUT = float(os.getenv('LIVE_REDIS_TIMEOUT', '1'))
+# 실시간 중계 연결 유지용 ping 간격과 연결 최대 유지 시간 (초, 지나면 클라이언트가 재연결)
+LIVE_HEARTBEAT_SECONDS = int(os.getenv('LIVE_HEARTBEAT_SECONDS', '15'))
+LIVE_STREAM_MAX_SECONDS = int(os.getenv('LIVE_STREAM_MAX_SECONDS', '3600'))
+# 안전 구역을 이 시간(초) 이상 계속 벗어나 있으면 이탈로 알림, 프로세스별 안전 구역 캐시 유지 시간 (초)과 최대 예약 수
+GEOFENCE_EXIT_DEBOUNCE_SECONDS = int(os.getenv('GEOFENCE_EXIT_DEBOUNCE_SECONDS', '30'))
+GEOFENCE_CACHE_TTL = int(os.getenv('GEOFENCE_CACHE_TTL', '60'))
+GEOFENCE_CACHE_SIZE = int(os.getenv('GEOFENCE_CACHE_SIZE', '1000'))
+# 진행 중인 산책에서 이 시간(분) 이상 위치 업데이트가 없으면 비활동 알림 (sweep_inactive_walks)
+WALK_INACTIVITY_MINUTES = int(os.getenv('WALK_INACTIVITY_MINUTES', '15'))
+# 게시글 조회수 버퍼를 DB에 반영하는 간격 (초, 0이면 조회마다 바로 반영) (api.view_counter)
+VIEW_COUNT_FLUSH_SECONDS = int(os.getenv('VIEW_COUNT_FLUSH_SECONDS', '5'))
 
 ALLOWED_HOSTS = ['*']
 